@@ -0,0 +1,90 @@
+# app/adapters/http/diagnostics.py
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.executors import get_password_executor
+from app.core.internal_access import require_internal_access
+from app.core.metrics import metrics
+from app.core.profiling import get_profiler
+from app.db.base import get_pool_status
+from app.db.replicas import get_replica_status
+from app.modules.users.infrastructure.cached_repository import get_user_cache
+from app.modules.users.infrastructure.reference_cache import get_reference_cache
+from app.modules.users.infrastructure.singleflight_repository import get_user_flights
+from app.services.email_service import get_email_service
+
+# Topología, tráfico y volcados de pila: nada de esto es público
+router = APIRouter(
+    prefix="/diagnostics",
+    tags=["diagnostics"],
+    dependencies=[Depends(require_internal_access)],
+)
+
+
+@router.get("/db-pool")
+async def read_db_pool_status():
+    """Conexiones en uso, espera por checkout y uso del overflow del pool."""
+    return get_pool_status()
+
+
+@router.get("/db-replicas")
+async def read_db_replica_status():
+    """Estado, lecturas servidas y pool de cada réplica; null si no hay réplicas."""
+    return get_replica_status()
+
+
+@router.get("/user-cache")
+async def read_user_cache_stats():
+    """Aciertos, fallos y desalojos de la caché de usuarios."""
+    return get_user_cache().stats()
+
+
+@router.get("/user-single-flight")
+async def read_user_single_flight_stats():
+    """Búsquedas de usuarios ejecutadas, deduplicadas y en curso."""
+    return get_user_flights().stats()
+
+
+@router.get("/reference-cache")
+async def read_reference_cache_stats():
+    """Roles y áreas cargados y número de recargas de la caché de referencia."""
+    return get_reference_cache().stats()
+
+
+@router.get("/password-hashing")
+async def read_password_hashing_stats():
+    """Hilos ocupados, cola y rechazos del pool de hashing de contraseñas."""
+    return get_password_executor().stats()
+
+
+@router.get("/email")
+async def read_email_stats():
+    """Cola, envíos, reintentos y conexiones SMTP del servicio de correo."""
+    return get_email_service().stats()
+
+
+@router.get("/latency")
+async def read_latency_percentiles():
+    """p50/p95/p99 por ruta y clase de estado, estimados desde los histogramas."""
+    return metrics.latency_summary()
+
+
+@router.get("/profiles")
+async def read_profiles():
+    """Perfiles retenidos: tiempo total, en base, en Python y resto por solicitud."""
+    return get_profiler().summaries()
+
+
+@router.get("/profiles/collapsed", response_class=PlainTextResponse)
+async def read_profiles_collapsed():
+    """Pilas de todos los perfiles retenidos en formato collapsed."""
+    return get_profiler().collapsed()
+
+
+@router.get("/profiles/{request_id}", response_class=PlainTextResponse)
+async def read_profile(request_id: str):
+    """Pilas de una solicitud en formato collapsed."""
+    profile = get_profiler().get(request_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return profile.collapsed()
@@ -0,0 +1,31 @@
+# app/adapters/http/metrics.py
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.internal_access import require_internal_access
+from app.core.metrics import metrics
+from app.db.base import get_pool_status
+
+# Prometheus se autentica con la clave interna (authorization.credentials del scrape)
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_internal_access)])
+
+# Valores del pool que se exponen como gauges en /metrics
+_POOL_GAUGES = {
+    "db_pool_size": "pool_size",
+    "db_pool_checked_out": "checked_out",
+    "db_pool_checked_in": "checked_in",
+    "db_pool_overflow": "overflow",
+    "db_pool_max_connections": "max_connections",
+    "db_pool_checkout_timeouts": "timeouts",
+    "db_pool_checkout_wait_max_ms": "wait_time_max_ms",
+}
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    """Histogramas y gauges en formato de exposición de texto de Prometheus."""
+    pool = get_pool_status()
+    gauges = {name: pool[key] for name, key in _POOL_GAUGES.items()}
+    return PlainTextResponse(
+        metrics.render(gauges), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,310 @@
+# app/adapters/smtp/client.py
+"""
+Cliente SMTP asíncrono mínimo y pool de conexiones reutilizables.
+
+``SmtpConnection`` habla SMTP sobre streams de asyncio: saludo, EHLO,
+STARTTLS y AUTH PLAIN opcionales, y envío de lotes de mensajes. Si el
+servidor anuncia PIPELINING (RFC 2920) los comandos del sobre
+(MAIL/RCPT/DATA) viajan juntos, y el final de cada mensaje va en el mismo
+paquete que el sobre del siguiente: un lote de N mensajes cuesta unas N+1
+idas y vueltas en lugar de 4 por mensaje.
+
+``SmtpConnectionPool`` reparte un número acotado de conexiones abiertas
+entre los envíos y las reutiliza mientras no pasen ``max_idle`` segundos
+sin uso; así no se paga el saludo, EHLO, TLS y AUTH en cada mensaje.
+"""
+
+import asyncio
+import base64
+import logging
+import socket
+import ssl
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SmtpError(Exception):
+    """Respuesta de error del servidor; los códigos 4xx son transitorios."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+    @property
+    def transient(self) -> bool:
+        return 400 <= self.code < 500
+
+
+class SmtpConnectionError(SmtpError):
+    """La conexión se cortó o no respondió a tiempo; el envío se puede reintentar."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(421, message)
+
+
+@dataclass(slots=True)
+class Envelope:
+    sender: str
+    recipient: str
+    data: bytes  # mensaje completo (cabeceras y cuerpo) con CRLF
+
+
+class SmtpConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, timeout: float) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.extensions: Dict[str, str] = {}
+        self.closed = False
+        self.last_used = time.monotonic()
+        self.messages_sent = 0
+        self._pending: List[bytes] = []  # comandos del sobre cuya respuesta falta leer
+
+    @classmethod
+    async def open(
+        cls,
+        host: str,
+        port: int,
+        timeout: float = 10.0,
+        starttls: bool = False,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        local_hostname: Optional[str] = None,
+    ) -> "SmtpConnection":
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise SmtpConnectionError(f"No se pudo conectar a {host}:{port}: {exc}")
+        connection = cls(reader, writer, timeout)
+        try:
+            await connection._expect(220)
+            await connection._ehlo(local_hostname or socket.gethostname())
+            if starttls:
+                await connection._command(b"STARTTLS", 220)
+                await asyncio.wait_for(
+                    writer.start_tls(ssl.create_default_context(), server_hostname=host), timeout
+                )
+                await connection._ehlo(local_hostname or socket.gethostname())
+            if username is not None:
+                token = base64.b64encode(f"\0{username}\0{password or ''}".encode()).decode()
+                await connection._command(f"AUTH PLAIN {token}".encode(), 235)
+        except BaseException:
+            connection._abort()
+            raise
+        return connection
+
+    @property
+    def pipelining(self) -> bool:
+        return "PIPELINING" in self.extensions
+
+    # ──────── Envío ─────────────────────────────────────────────────
+    async def send_many(self, envelopes: List[Envelope]) -> List[Optional[SmtpError]]:
+        """
+        Envía los mensajes en orden por esta conexión. Devuelve, por mensaje,
+        None si el servidor lo aceptó o el error. Si la conexión se pierde,
+        ese mensaje y los siguientes reciben ``SmtpConnectionError`` y la
+        conexión queda cerrada.
+        """
+        results: List[Optional[SmtpError]] = []
+        needs_reset = False
+        envelope_written = False
+        try:
+            for index, envelope in enumerate(envelopes):
+                if not envelope_written:
+                    self._write_envelope(envelope, needs_reset)
+                error = await self._read_envelope_replies(needs_reset)
+                needs_reset = False
+                if error is not None:
+                    # La transacción pudo quedar abierta a medias: RSET antes de la siguiente
+                    results.append(error)
+                    needs_reset = True
+                    envelope_written = False
+                    continue
+
+                self.writer.write(_dot_stuff(envelope.data))
+                following = envelopes[index + 1] if index + 1 < len(envelopes) else None
+                envelope_written = following is not None and self.pipelining
+                if envelope_written:
+                    self._write_envelope(following, reset=False)
+                code, message = await self._read_reply()
+                if code == 250:
+                    self.messages_sent += 1
+                    results.append(None)
+                else:
+                    results.append(SmtpError(code, message))
+        except SmtpConnectionError as exc:
+            self._abort()
+            results.extend(exc for _ in range(len(envelopes) - len(results)))
+        self.last_used = time.monotonic()
+        return results
+
+    def _write_envelope(self, envelope: Envelope, reset: bool) -> None:
+        commands = [b"RSET"] if reset else []
+        commands += [
+            f"MAIL FROM:<{envelope.sender}>".encode(),
+            f"RCPT TO:<{envelope.recipient}>".encode(),
+            b"DATA",
+        ]
+        self._pending = commands
+        if self.pipelining:
+            self.writer.write(b"".join(command + b"\r\n" for command in commands))
+
+    async def _read_envelope_replies(self, reset: bool) -> Optional[SmtpError]:
+        commands, self._pending = self._pending, []
+        replies: List[Tuple[int, str]] = []
+        for command in commands:
+            if not self.pipelining:
+                self.writer.write(command + b"\r\n")
+            reply = await self._read_reply()
+            replies.append(reply)
+            if not self.pipelining and reply[0] >= 400:
+                break
+
+        if reset:
+            replies = replies[1:]
+        mail, rcpt, data = (replies + [(0, "")] * 3)[:3]
+        if data[0] == 354 and (mail[0] != 250 or rcpt[0] not in (250, 251)):
+            # Servidor no conforme que acepta DATA sin destinatarios: mensaje vacío
+            self.writer.write(b".\r\n")
+            await self._read_reply()
+        for code, message in (mail, rcpt, data):
+            if code == 0:
+                break
+            if code >= 400:
+                return SmtpError(code, message)
+        if data[0] != 354:
+            return SmtpError(data[0] or 554, data[1] or "DATA rechazado")
+        return None
+
+    # ──────── Protocolo ─────────────────────────────────────────────
+    async def _ehlo(self, hostname: str) -> None:
+        self.writer.write(f"EHLO {hostname}\r\n".encode())
+        code, message = await self._read_reply()
+        if code != 250:
+            raise SmtpError(code, message)
+        self.extensions = {}
+        for line in message.splitlines()[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.upper()] = params
+
+    async def _command(self, command: bytes, expected: int) -> str:
+        self.writer.write(command + b"\r\n")
+        return await self._expect(expected)
+
+    async def _expect(self, expected: int) -> str:
+        code, message = await self._read_reply()
+        if code != expected:
+            raise SmtpError(code, message)
+        return message
+
+    async def _read_reply(self) -> Tuple[int, str]:
+        lines: List[str] = []
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.timeout)
+            while True:
+                line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+                if not line.endswith(b"\n") or len(line) < 4:
+                    raise SmtpConnectionError("Respuesta SMTP incompleta")
+                lines.append(line[4:].rstrip(b"\r\n").decode("utf-8", "replace"))
+                if line[3:4] != b"-":
+                    return int(line[:3]), "\n".join(lines)
+        except (OSError, asyncio.TimeoutError, ValueError) as exc:
+            raise SmtpConnectionError(f"Conexión SMTP perdida: {exc!r}")
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            await self._command(b"QUIT", 221)
+        except SmtpError:
+            pass
+        self._abort()
+
+    def _abort(self) -> None:
+        self.closed = True
+        self.writer.close()
+
+
+def _dot_stuff(data: bytes) -> bytes:
+    """Cuerpo de DATA: duplica los puntos a principio de línea y añade el final."""
+    if data.startswith(b"."):
+        data = b"." + data
+    data = data.replace(b"\r\n.", b"\r\n..")
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return data + b".\r\n"
+
+
+class SmtpConnectionPool:
+    """Hasta ``size`` conexiones simultáneas; las libres se reutilizan."""
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[SmtpConnection]],
+        size: int,
+        max_idle: float = 30.0,
+    ) -> None:
+        self.connect = connect
+        self.size = size
+        self.max_idle = max_idle
+        self._idle: List[SmtpConnection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Se crea perezosamente para quedar ligado al loop que lo usa
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        return self._slots
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[SmtpConnection]:
+        async with self._get_slots():
+            connection = await self._checkout()
+            try:
+                yield connection
+            except BaseException:
+                connection._abort()
+                raise
+            finally:
+                if connection.closed:
+                    self.closed += 1
+                else:
+                    self._idle.append(connection)
+
+    async def _checkout(self) -> SmtpConnection:
+        now = time.monotonic()
+        while self._idle:
+            connection = self._idle.pop()
+            if now - connection.last_used < self.max_idle:
+                self.reused += 1
+                return connection
+            # El servidor suele cortar antes las conexiones ociosas
+            await connection.close()
+            self.closed += 1
+        connection = await self.connect()
+        self.opened += 1
+        return connection
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await connection.close()
+            self.closed += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "opened": self.opened,
+            "reused": self.reused,
+            "closed": self.closed,
+        }
@@ -0,0 +1,152 @@
+# app/adapters/smtp/sink.py
+"""
+Servidor SMTP en proceso que guarda en memoria los mensajes recibidos.
+
+Sustituye al servidor real en desarrollo (``EMAIL_SMTP_SINK``) y en las
+pruebas de tests/test_email_delivery.py. Anuncia PIPELINING y
+responde a los comandos en orden, como un servidor real. ``reject()``
+hace que un destinatario se rechace las próximas veces, para ejercitar
+los reintentos.
+
+    async with SmtpSink() as sink:
+        host, port = sink.address
+        ...
+        sink.messages  # [ReceivedMessage(sender, recipients, data), ...]
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ReceivedMessage:
+    sender: str
+    recipients: List[str]
+    data: bytes
+
+
+class SmtpSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, pipelining: bool = True) -> None:
+        self.host = host
+        self.port = port
+        self.pipelining = pipelining
+        self.messages: List[ReceivedMessage] = []
+        self.connections = 0
+        self._rejections: Dict[str, List[int]] = {}
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        if self._server is None:
+            raise RuntimeError("El sumidero SMTP no está arrancado")
+        return self._server.sockets[0].getsockname()[:2]
+
+    def reject(self, recipient: str, code: int = 451, times: int = 1) -> None:
+        """Rechaza ``recipient`` con ``code`` en sus próximos ``times`` RCPT."""
+        self._rejections.setdefault(recipient.lower(), []).extend([code] * times)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info("Sumidero SMTP escuchando en %s:%d", *self.address)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Como un servidor que se reinicia: también corta las conexiones abiertas
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "SmtpSink":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        sender: Optional[str] = None
+        recipients: List[str] = []
+
+        def reply(line: str) -> None:
+            writer.write(line.encode() + b"\r\n")
+
+        reply("220 sink ESMTP")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb, _, argument = line.decode("utf-8", "replace").rstrip("\r\n").partition(" ")
+                verb = verb.upper()
+                if verb == "EHLO":
+                    extensions = ["PIPELINING", "8BITMIME"] if self.pipelining else ["8BITMIME"]
+                    for extension in ["sink", *extensions[:-1]]:
+                        reply(f"250-{extension}")
+                    reply(f"250 {extensions[-1]}")
+                elif verb == "HELO":
+                    reply("250 sink")
+                elif verb == "MAIL":
+                    sender, recipients = _address(argument), []
+                    reply("250 OK")
+                elif verb == "RCPT":
+                    recipient = _address(argument)
+                    pending = self._rejections.get(recipient.lower())
+                    if sender is None:
+                        reply("503 MAIL primero")
+                    elif pending:
+                        reply(f"{pending.pop(0)} Destinatario rechazado")
+                    else:
+                        recipients.append(recipient)
+                        reply("250 OK")
+                elif verb == "DATA":
+                    if not recipients:
+                        reply("554 Sin destinatarios válidos")
+                    else:
+                        reply("354 Termina con <CRLF>.<CRLF>")
+                        await writer.drain()
+                        data = await _read_data(reader)
+                        self.messages.append(ReceivedMessage(sender or "", recipients, data))
+                        sender, recipients = None, []
+                        reply("250 OK")
+                elif verb == "RSET":
+                    sender, recipients = None, []
+                    reply("250 OK")
+                elif verb == "NOOP":
+                    reply("250 OK")
+                elif verb == "QUIT":
+                    reply("221 Adiós")
+                    break
+                else:
+                    reply("502 Comando no implementado")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+def _address(argument: str) -> str:
+    # "FROM:<a@b>" / "TO:<a@b>" (con posibles parámetros ESMTP detrás)
+    start, end = argument.find("<"), argument.find(">")
+    return argument[start + 1:end] if 0 <= start < end else argument.partition(":")[2].strip()
+
+
+async def _read_data(reader: asyncio.StreamReader) -> bytes:
+    lines: List[bytes] = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b"".join(lines), None)
+        if line == b".\r\n":
+            return b"".join(lines)
+        lines.append(line[1:] if line.startswith(b"..") else line)
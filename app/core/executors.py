@@ -0,0 +1,115 @@
+# app/core/executors.py
+"""
+Pool de hilos acotado para trabajo CPU (bcrypt) invocado desde handlers async.
+
+El event loop nunca ejecuta el hash: lo delega en ``run()``, que limita el
+trabajo en vuelo a ``max_workers + max_queue``. Si el pool está saturado la
+llamada espera un hueco hasta ``queue_timeout`` y después se rechaza con
+``ExecutorSaturatedError`` (backpressure en lugar de cola infinita).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.settings import get_settings
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """No hubo hueco en el pool dentro del tiempo de espera."""
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float, name: str) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Métricas (active y los tiempos se actualizan desde los hilos del pool)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.run_time_total = 0.0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Se crea perezosamente para quedar ligado al loop que lo usa
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        return self._slots
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        slots = self._get_slots()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ExecutorSaturatedError("Pool de hashing saturado")
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, partial(self._timed, fn, submitted, *args)
+            )
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            slots.release()
+
+    def _timed(self, fn: Callable[..., T], submitted: float, *args: Any) -> T:
+        # Corre en el hilo del pool
+        started = time.perf_counter()
+        with self._lock:
+            self.queue_wait_total += started - submitted
+            self.active += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.run_time_total += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        queued = max(self.in_flight - self.active, 0)
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": queued,
+            "waiting_for_slot": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(self.queue_wait_total * 1000 / self.completed, 3) if self.completed else 0.0,
+            "avg_run_time_ms": round(self.run_time_total * 1000 / self.completed, 3) if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+@lru_cache()
+def get_password_executor() -> BoundedExecutor:
+    """Pool compartido para hash/verificación de contraseñas."""
+    settings = get_settings()
+    return BoundedExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+        max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+        queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+        name="password-hash",
+    )
@@ -0,0 +1,38 @@
+# app/core/internal_access.py
+"""
+Acceso a las superficies internas: /diagnostics, /metrics y el perfilado a
+demanda. Exponen la topología, el tráfico y volcados de pila, así que no
+son públicas: piden ``Authorization: Bearer <INTERNAL_API_KEY>``. Sin clave
+configurada solo se abren con DEBUG (desarrollo local); fuera de DEBUG
+responden 404, como si no existieran.
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.settings import Settings
+
+
+def internal_access_allowed(authorization: Optional[str], settings: Settings) -> bool:
+    """La cabecera Authorization da acceso a lo interno (o no hace falta, en DEBUG sin clave)."""
+    if settings.INTERNAL_API_KEY is None:
+        return settings.DEBUG
+    scheme, _, credentials = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(
+        credentials.strip().encode(), settings.INTERNAL_API_KEY.encode()
+    )
+
+
+async def require_internal_access(request: Request) -> None:
+    """Dependencia de las rutas internas, con los Settings de la app (``create_app``)."""
+    settings: Settings = request.app.state.settings
+    if settings.INTERNAL_API_KEY is None and not settings.DEBUG:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not internal_access_allowed(request.headers.get("authorization"), settings):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Se requiere la clave interna",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,96 @@
+# app/core/logging_config.py
+"""
+Logging estructurado (JSON) con envío en segundo plano.
+
+Los handlers de la aplicación solo encolan el registro; un QueueListener en
+otro hilo lo formatea y lo escribe, de modo que el event loop nunca espera
+por E/S de logs. Si la cola se llena el registro se descarta y se cuenta.
+"""
+
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+
+from app.core.settings import Settings
+from app.middlewares.logging import request_id_var
+
+# Atributos estándar de LogRecord: todo lo demás viene de ``extra``
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """Copia el request_id al registro en el hilo que lo emite."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler con cola acotada que descarta en lugar de bloquear."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # El formateo se hace en el listener; aquí solo se congelan los datos
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(settings: Settings) -> QueueListener:
+    """Instala el QueueHandler en el logger raíz y arranca el listener."""
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s [%(name)s] [request_id=%(request_id)s] %(message)s")
+        )
+
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,170 @@
+# app/core/metrics.py
+"""
+Métricas en proceso: histogramas de latencia por ruta y consultas SQL por
+solicitud, exportables en el formato de texto de Prometheus.
+
+Los histogramas usan límites fijos y una lista de enteros por serie, así que
+registrar una observación no reserva memoria. Las consultas SQL se cuentan
+con eventos del engine y se atribuyen a la solicitud en curso mediante una
+ContextVar que fija el middleware de métricas.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # el último es +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimación por interpolación lineal dentro del bucket (como histogram_quantile)."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+
+class HistogramFamily:
+    """Histogramas con el mismo nombre y límites, uno por combinación de etiquetas."""
+
+    def __init__(self, name: str, help_text: str, bounds: Sequence[float]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.bounds = tuple(bounds)
+        self.series: Dict[Labels, Histogram] = {}
+
+    def labels(self, **labels: str) -> Histogram:
+        key = tuple(sorted(labels.items()))
+        histogram = self.series.get(key)
+        if histogram is None:
+            histogram = self.series[key] = Histogram(self.bounds)
+        return histogram
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, histogram in self.series.items():
+            base = ",".join(f'{k}="{v}"' for k, v in labels)
+            prefix = f"{base}," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.bounds, histogram.counts):
+                cumulative += count
+                yield f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{prefix}le="+Inf"}} {histogram.count}'
+            yield f"{self.name}_sum{{{base}}} {histogram.sum}"
+            yield f"{self.name}_count{{{base}}} {histogram.count}"
+
+
+class RequestDbStats:
+    """Consultas SQL y tiempo en base acumulados por una solicitud."""
+
+    __slots__ = ("queries", "duration")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.duration = 0.0
+
+
+current_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("current_db_stats", default=None)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.request_duration = HistogramFamily(
+            "http_request_duration_seconds", "Latencia de las solicitudes HTTP por ruta.", LATENCY_BUCKETS
+        )
+        self.request_db_queries = HistogramFamily(
+            "http_request_db_queries", "Consultas SQL por solicitud HTTP.", QUERY_COUNT_BUCKETS
+        )
+        self.request_db_duration = HistogramFamily(
+            "http_request_db_duration_seconds", "Tiempo en base de datos por solicitud HTTP.", LATENCY_BUCKETS
+        )
+        self.db_query_duration = HistogramFamily(
+            "db_query_duration_seconds", "Duración de cada sentencia SQL.", LATENCY_BUCKETS
+        )
+
+    def observe_request(
+        self, method: str, route: str, status: int, duration: float, db: RequestDbStats
+    ) -> None:
+        labels = {"method": method, "route": route, "status": f"{status // 100}xx"}
+        self.request_duration.labels(**labels).observe(duration)
+        self.request_db_queries.labels(**labels).observe(db.queries)
+        self.request_db_duration.labels(**labels).observe(db.duration)
+
+    def latency_summary(self) -> List[Dict[str, Any]]:
+        """p50/p95/p99 por ruta en milisegundos."""
+        summary = []
+        for labels, histogram in self.request_duration.series.items():
+            summary.append({
+                **dict(labels),
+                "count": histogram.count,
+                "p50_ms": round(histogram.quantile(0.50) * 1000, 3),
+                "p95_ms": round(histogram.quantile(0.95) * 1000, 3),
+                "p99_ms": round(histogram.quantile(0.99) * 1000, 3),
+            })
+        return summary
+
+    def render(self, gauges: Dict[str, float]) -> str:
+        lines: List[str] = []
+        for family in (
+            self.request_duration,
+            self.request_db_queries,
+            self.request_db_duration,
+            self.db_query_duration,
+        ):
+            lines.extend(family.render())
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def instrument_engine(engine: AsyncEngine, registry: MetricsRegistry = metrics) -> None:
+    """Registra la duración de cada sentencia y la suma a la solicitud en curso."""
+    sync_engine = engine.sync_engine
+    statement_histogram = registry.db_query_duration.labels()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        statement_histogram.observe(elapsed)
+        stats = current_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.duration += elapsed
@@ -0,0 +1,212 @@
+# app/core/profiling.py
+"""
+Perfilador por muestreo para solicitudes en vivo.
+
+Un hilo aparte lee cada ``interval`` la pila del hilo del event loop con
+``sys._current_frames()`` y, si la tarea que corre en ese momento pertenece
+a una solicitud perfilada, suma la pila a su perfil. Así las muestras reflejan
+el tiempo de Python de esa solicitud (validación, conversión a entidades,
+compilación de SQL...) y no el de las demás que comparten el loop.
+
+La solicitud de una tarea viaja en ``current_profile``: ``create_task`` copia
+el contexto, así que las tareas hijas (el despacho de UserLoader, la búsqueda
+de SingleFlight...) heredan el perfil. El hilo de muestreo no puede leer el
+contexto de otra tarea, de modo que la fábrica de tareas del loop anota a
+qué perfil pertenece cada tarea al crearla.
+
+El tiempo en base sale de ``RequestDbStats`` (eventos del engine); lo que no
+es base ni Python es espera por el loop o por la red. Las pilas se guardan en
+formato "collapsed" (``a;b;c N``), el que consumen flamegraph.pl o speedscope.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.metrics import RequestDbStats
+from app.core.settings import get_settings
+
+
+@dataclass
+class RequestProfile:
+    request_id: str
+    method: str
+    path: str
+    db: RequestDbStats
+    started: float = field(default_factory=time.perf_counter)
+    wall_time: float = 0.0
+    python_time: float = 0.0
+    stacks: Counter = field(default_factory=Counter)
+    token: Optional[Token] = field(default=None, repr=False)
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def summary(self) -> Dict[str, Any]:
+        wall_ms = self.wall_time * 1000
+        db_ms = self.db.duration * 1000
+        python_ms = min(self.python_time * 1000, wall_ms)
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "samples": self.samples,
+            "wall_ms": round(wall_ms, 3),
+            "db_ms": round(db_ms, 3),
+            "db_queries": self.db.queries,
+            "python_ms": round(python_ms, 3),
+            "other_ms": round(max(wall_ms - db_ms - python_ms, 0.0), 3),
+        }
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{frame.f_globals.get('__name__', '?')}:{name}"
+
+
+def _collapse(frame: Optional[FrameType]) -> str:
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float, max_profiles: int) -> None:
+        self.interval = interval
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._active: Dict[asyncio.Task, RequestProfile] = {}  # tareas de la solicitud y sus hijas
+        self._requests = 0
+        self._finished: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._has_work = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+
+    # ──────── Ciclo de una solicitud (hilo del event loop) ────────
+
+    def begin(self, request_id: str, method: str, path: str, db: RequestDbStats) -> RequestProfile:
+        task = asyncio.current_task()
+        if self._thread is None:
+            self._start()
+        profile = RequestProfile(request_id=request_id, method=method, path=path, db=db)
+        profile.token = current_profile.set(profile)
+        with self._lock:
+            self._active[task] = profile
+            self._requests += 1
+            self._has_work.set()
+        return profile
+
+    def end(self, profile: RequestProfile) -> None:
+        profile.wall_time = time.perf_counter() - profile.started
+        current_profile.reset(profile.token)
+        profile.token = None
+        with self._lock:
+            self._active.pop(asyncio.current_task(), None)
+            self._requests -= 1
+            if not self._requests:
+                self._has_work.clear()
+            self._finished[profile.request_id] = profile
+            while len(self._finished) > self.max_profiles:
+                self._finished.popitem(last=False)
+
+    # ──────── Consulta ────────
+
+    def get(self, request_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._finished.get(request_id)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            profiles = list(self._finished.values())
+        return [profile.summary() for profile in profiles]
+
+    def collapsed(self) -> str:
+        """Todas las pilas retenidas agregadas, listas para un flame graph."""
+        total: Counter = Counter()
+        with self._lock:
+            for profile in self._finished.values():
+                total.update(profile.stacks)
+        return "".join(f"{stack} {count}\n" for stack, count in total.items())
+
+    # ──────── Hilo de muestreo ────────
+
+    def _start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._loop.set_task_factory(self._task_factory(self._loop.get_task_factory()))
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def _task_factory(self, previous: Optional[Callable[..., asyncio.Task]]) -> Callable[..., asyncio.Task]:
+        """Envuelve la fábrica de tareas del loop (o la de serie) para anotar las hijas."""
+
+        def factory(loop: asyncio.AbstractEventLoop, coro, **kwargs) -> asyncio.Task:
+            if previous is not None:
+                task = previous(loop, coro, **kwargs)
+            else:
+                task = asyncio.Task(coro, loop=loop, **kwargs)
+            context = kwargs.get("context")
+            profile = context.get(current_profile) if context is not None else current_profile.get()
+            if profile is not None and profile.token is not None:
+                with self._lock:
+                    self._active[task] = profile
+                task.add_done_callback(self._forget)
+            return task
+
+        return factory
+
+    def _forget(self, task: asyncio.Task) -> None:
+        with self._lock:
+            self._active.pop(task, None)
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stopped:
+            if not self._has_work.is_set():
+                self._has_work.wait()
+                last = time.perf_counter()
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._loop_thread_id)
+            task = asyncio.current_task(self._loop)
+            # Con el GIL ocupado el hilo despierta tarde (sys.getswitchinterval()),
+            # así que cada muestra vale el tiempo real desde la anterior
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            with self._lock:
+                profile = self._active.get(task)
+            # Una hija que sobrevive a su solicitud ya no suma a un perfil cerrado
+            if profile is not None and profile.token is not None and frame is not None:
+                profile.stacks[_collapse(frame)] += 1
+                profile.python_time += elapsed
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._has_work.set()
+
+
+@lru_cache()
+def get_profiler() -> SamplingProfiler:
+    settings = get_settings()
+    return SamplingProfiler(
+        interval=settings.PROFILING_INTERVAL_MS / 1000,
+        max_profiles=settings.PROFILING_MAX_PROFILES,
+    )
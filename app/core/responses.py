@@ -0,0 +1,61 @@
+# app/core/responses.py
+"""
+Respuestas JSON rápidas.
+
+``FastJSONResponse`` serializa con ``pydantic_core.to_json`` (Rust) en lugar
+de ``json.dumps`` y es la clase por defecto de la app. ``JsonSerializer``
+va un paso más allá: compila una vez el serializador de un tipo (p. ej. la
+dataclass ``User``) y convierte el valor directamente a bytes, sin pasar por
+el modelo de respuesta ni por ``jsonable_encoder``. El ``response_model``
+solo se valida en DEBUG para detectar desviaciones del contrato.
+"""
+
+from typing import Any, Generic, Optional, Type, TypeVar
+
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_json
+
+from app.core.settings import get_settings
+
+T = TypeVar("T")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class JsonSerializer(Generic[T]):
+    """
+    Serializador precompilado de ``type_`` a bytes JSON. El esquema se
+    compila en el primer uso o en ``warm_up()`` (al arrancar), no al importar.
+    """
+
+    def __init__(self, type_: Type[T], response_model: Optional[Type[BaseModel]] = None) -> None:
+        self.type_ = type_
+        self.response_model = response_model
+        self._adapter: Optional[TypeAdapter] = None
+
+    @property
+    def adapter(self) -> TypeAdapter:
+        if self._adapter is None:
+            self._adapter = TypeAdapter(self.type_)
+        return self._adapter
+
+    def warm_up(self) -> None:
+        self.adapter  # compila el esquema
+        if self.response_model is not None:
+            self.response_model.model_rebuild()
+
+    def dump(self, value: T) -> bytes:
+        return self.adapter.dump_json(value)
+
+    def response(self, value: T, status_code: int = 200) -> Response:
+        if self.response_model is not None and get_settings().DEBUG:
+            try:
+                self.response_model.model_validate(value, from_attributes=True)
+            except ValidationError as exc:
+                raise ResponseValidationError(errors=exc.errors(), body=value)
+        return Response(self.dump(value), status_code=status_code, media_type="application/json")
@@ -1,26 +1,75 @@
 # app/core/security.py
 from datetime import datetime, timedelta
-import hashlib
 import string
 import random
 import re
 import secrets
+import statistics
 import time
-from typing import Dict, Any, Optional
-import jwt
-from passlib.context import CryptContext
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 import hmac
+from functools import lru_cache
+
+from app.core.executors import get_password_executor
+from app.core.settings import Settings, get_settings
+from app.services.token_service import TokenService
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+def build_crypt_context(settings: Settings) -> "CryptContext":
+    """Build the password context from the hashing profiles in Settings"""
+    # passlib (and the bcrypt backend) is only loaded by whoever hashes passwords
+    from passlib.context import CryptContext
+
+    options: Dict[str, Any] = {}
+    for scheme in settings.PASSWORD_SCHEMES:
+        costs = settings.PASSWORD_SCHEME_COSTS.get(scheme, {})
+        for key, value in costs.items():
+            options[f"{scheme}__{key}"] = value
+        if "rounds" in costs:
+            # Pinning the range makes needs_update() flag hashes with any other cost
+            options[f"{scheme}__min_rounds"] = costs["rounds"]
+            options[f"{scheme}__max_rounds"] = costs["rounds"]
+    return CryptContext(schemes=settings.PASSWORD_SCHEMES, deprecated="auto", **options)
+
+
+def calibrate_rounds(scheme: str = "bcrypt", target_ms: float = 250.0, samples: int = 3) -> int:
+    """Highest rounds value whose hash takes at most target_ms on this machine"""
+    from passlib.registry import get_crypt_handler
+
+    handler = get_crypt_handler(scheme)
+    log2_cost = getattr(handler, "rounds_cost", "linear") == "log2"
+
+    def measure(rounds: int) -> float:
+        hasher = handler.using(rounds=rounds)
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            hasher.hash("calibration-password")
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    rounds = best = handler.min_rounds
+    best_ms = measure(rounds)
+    while best_ms <= target_ms and rounds < handler.max_rounds:
+        rounds = rounds + 1 if log2_cost else min(rounds * 2, handler.max_rounds)
+        elapsed = measure(rounds)
+        if elapsed > target_ms:
+            break
+        best, best_ms = rounds, elapsed
+
+    if not log2_cost and best_ms > 0:
+        # Linear cost: interpolate between the last two doublings
+        best = min(max(best, int(best * target_ms / best_ms)), handler.max_rounds)
+    return best
 
-from app.core.settings import Settings
 
 class SecurityUtils:
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.pwd_context = CryptContext(
-            schemes=["bcrypt"],
-            deprecated="auto",
-            bcrypt__rounds=12  # Stronger hashing with more rounds
-        )
+        self.pwd_context = build_crypt_context(settings)
+        self.token_service = TokenService(settings)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against a hash using constant-time comparison"""
@@ -29,6 +78,31 @@ class SecurityUtils:
     def hash_password(self, password: str) -> str:
         """Hash a password for storage"""
         return self.pwd_context.hash(password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password on the bounded hashing pool, without blocking the event loop"""
+        return await get_password_executor().run(
+            self.pwd_context.verify, plain_password, hashed_password
+        )
+
+    def verify_and_update_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, when the stored hash uses a deprecated scheme or
+        an outdated cost, also return a new hash for the caller to persist
+        """
+        return self.pwd_context.verify_and_update(plain_password, hashed_password)
+
+    async def verify_and_update_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """verify_and_update_password on the bounded hashing pool"""
+        return await get_password_executor().run(
+            self.pwd_context.verify_and_update, plain_password, hashed_password
+        )
+
+    async def hash_password_async(self, password: str) -> str:
+        """hash_password on the bounded hashing pool, without blocking the event loop"""
+        return await get_password_executor().run(self.pwd_context.hash, password)
     
     def is_password_strong(self, password: str) -> bool:
         """Check if a password meets security requirements"""
@@ -44,42 +118,14 @@ class SecurityUtils:
         return has_uppercase and has_lowercase and has_digit and has_special
     
     def create_access_token(self, data: Dict[str, Any]) -> str:
-        """Create a simple token using SHA256 with random key"""
-        # Get username
-        username = data.get("username", "")
-        
-        # Get current timestamp
-        timestamp = str(int(time.time()))
-        
-        # Generate random component
-        random_key = secrets.token_hex(16)  # 16 bytes of randomness
-        
-        # Concatenate all components
-        raw_token = f"{timestamp}:{username}:{random_key}"
-        
-        # Create SHA256 hash
-        hashed_token = hashlib.sha256(raw_token.encode()).hexdigest()
-        
-        # Return token
-        return hashed_token
+        """Create a signed access token (see TokenService) for data["sub"] or data["username"]"""
+        claims = dict(data)
+        subject = claims.pop("sub", None) or claims.get("username", "")
+        return self.token_service.issue(subject, claims)
         
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify a JWT token and return the payload if valid"""
-        try:
-            # Decode and verify token
-            payload = jwt.decode(
-                token, 
-                "secret_key",  # Default value if settings.secret_key is not available
-                algorithms=["HS256"],  # Default value if settings.token_algorithm is not available
-                options={
-                    "verify_signature": True, 
-                    "verify_exp": True, 
-                    "verify_iat": True,
-                }
-            )
-            return payload
-        except jwt.PyJWTError:
-            return None
+        """Verify a token issued by create_access_token and return the payload if valid"""
+        return self.token_service.verify(token)
     
     def generate_recovery_code(self) -> str:
         """Generate a secure recovery code for password reset"""
@@ -92,4 +138,10 @@ class SecurityUtils:
         """Perform a constant-time comparison of two strings to prevent timing attacks"""
         if a is None or b is None:
             return False
-        return hmac.compare_digest(a, b)
\ No newline at end of file
+        return hmac.compare_digest(a, b)
+
+
+@lru_cache()
+def get_security_utils() -> SecurityUtils:
+    """Process-wide SecurityUtils; building it loads passlib and the hash context"""
+    return SecurityUtils(get_settings())
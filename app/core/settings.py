@@ -1,10 +1,18 @@
 from functools import lru_cache
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Configuración de depuración
     DEBUG: bool = False
     LOG_LEVEL: str = "info"
+    LOG_FORMAT: str = "json"  # "json" o "text"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SUCCESS_SAMPLE_RATE: float = 1.0  # fracción de solicitudes < 400 que se registran
+
+    # Clave de las superficies internas (/diagnostics, /metrics, perfilado a
+    # demanda): Authorization: Bearer <clave>. Sin clave solo se abren con DEBUG
+    INTERNAL_API_KEY: Optional[str] = None
 
     # Config Database
     POSTGRES_DB: str
@@ -13,6 +21,107 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int = 5432
 
+    # Pool de conexiones del engine async
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_POOL_WARMUP_CONNECTIONS: int = 2  # conexiones abiertas al arrancar (0 = ninguna)
+
+    # Réplicas de lectura (URLs postgresql://...); sin réplicas todo va al
+    # primario. Una réplica que falla queda fuera DB_READ_REPLICA_RETRY_AFTER
+    # segundos. DB_READ_REPLICA_MAX_LAG es el retraso de replicación asumido:
+    # tras escribir, el mismo cliente lee del primario durante ese tiempo
+    DB_READ_REPLICA_URLS: List[str] = []
+    DB_READ_REPLICA_STRATEGY: str = "round_robin"  # "round_robin" o "least_busy"
+    DB_READ_REPLICA_RETRY_AFTER: float = 10.0
+    DB_READ_REPLICA_MAX_LAG: float = 2.0
+
+    # Paginación del listado de usuarios
+    USERS_PAGE_SIZE: int = 50
+    USERS_PAGE_SIZE_MAX: int = 200
+
+    # Resultados por página de GET /users/search (el máximo es USERS_PAGE_SIZE_MAX)
+    USERS_SEARCH_PAGE_SIZE: int = 10
+
+    # Máximo de IDs por consulta en GET /users/batch
+    USERS_BATCH_MAX_IDS: int = 100
+
+    # Exportación en streaming (filas por lote del cursor de servidor)
+    USERS_EXPORT_CHUNK_SIZE: int = 2000
+
+    # Hash de contraseñas: el primer esquema es el activo; el resto solo se
+    # verifica y se migra al activo en el siguiente login correcto
+    # (UserService.verify_password guarda el hash nuevo)
+    PASSWORD_SCHEMES: List[str] = ["bcrypt"]
+    PASSWORD_SCHEME_COSTS: Dict[str, Dict[str, int]] = {"bcrypt": {"rounds": 12}}
+
+    # Hash de contraseñas fuera del event loop
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = un hilo por núcleo
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+
+    # Tokens de acceso firmados; TOKEN_SIGNING_KEYS es {kid: secreto} y las
+    # claves retiradas se mantienen ahí hasta que caduquen sus tokens
+    TOKEN_SIGNING_KEYS: Dict[str, str] = {}
+    TOKEN_ACTIVE_KID: Optional[str] = None
+    TOKEN_ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_VERIFY_CACHE_SIZE: int = 10000
+
+    # Caché de usuarios (id / email / auth_id)
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL: float = 30.0
+    USER_CACHE_NEGATIVE_TTL: float = 5.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_SHARED_BACKEND: Optional[str] = None  # "memory": sustituto local del nivel compartido
+
+    # Búsquedas unitarias de usuarios concurrentes e idénticas comparten una consulta
+    USER_SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Caché de roles y áreas; se recarga con LISTEN/NOTIFY y, por si se
+    # pierde alguna notificación, cada REFERENCE_CACHE_POLL_INTERVAL segundos
+    REFERENCE_CACHE_ENABLED: bool = True
+    REFERENCE_CACHE_CHANNEL: str = "reference_changed"
+    REFERENCE_CACHE_POLL_INTERVAL: float = 300.0
+
+    # Importación masiva de usuarios
+    USERS_BULK_MAX_ROWS: int = 50000
+    USERS_BULK_CHUNK_SIZE: int = 1000  # 7 columnas x 1000 filas, lejos del límite de 32767 parámetros
+
+    # Correo saliente: los handlers solo encolan; EMAIL_WORKERS tareas envían
+    # lotes de hasta EMAIL_BATCH_SIZE mensajes por conexiones SMTP reutilizadas
+    EMAIL_ENABLED: bool = False
+    EMAIL_FROM: str = "no-reply@example.com"
+    EMAIL_SMTP_HOST: str = "localhost"
+    EMAIL_SMTP_PORT: int = 25
+    EMAIL_SMTP_USERNAME: Optional[str] = None
+    EMAIL_SMTP_PASSWORD: Optional[str] = None
+    EMAIL_SMTP_STARTTLS: bool = False
+    EMAIL_SMTP_TIMEOUT: float = 10.0
+    EMAIL_SMTP_SINK: bool = False  # servidor SMTP en proceso que solo guarda los mensajes (desarrollo)
+    EMAIL_POOL_SIZE: int = 2
+    EMAIL_POOL_MAX_IDLE: float = 30.0  # segundos antes de descartar una conexión ociosa
+    EMAIL_WORKERS: int = 2
+    EMAIL_QUEUE_SIZE: int = 1000
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_DELAY: float = 2.0  # se duplica en cada intento, con jitter
+    EMAIL_RETRY_MAX_DELAY: float = 300.0
+    EMAIL_SHUTDOWN_TIMEOUT: float = 10.0  # espera para vaciar la cola al parar
+
+    # Perfilado por muestreo de solicitudes en vivo; con PROFILING_ENABLED
+    # se perfila esa fracción de solicitudes o las que envíen la cabecera
+    # junto con la clave interna (INTERNAL_API_KEY)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_HEADER: str = "x-profile"
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_PROFILES: int = 200  # perfiles retenidos en memoria
+
     @property
     def database_url(self) -> str:
         # URL para SQLAlchemy async con asyncpg
@@ -37,5 +146,3 @@ class Settings(BaseSettings):
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
-
-settings = get_settings()
@@ -1,36 +1,100 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from app.core.settings import settings
+from app.core.metrics import instrument_engine
+from app.core.settings import get_settings
+from app.db.pool_metrics import InstrumentedAsyncQueuePool
 
 # Crear la base para los modelos declarativos
 Base = declarative_base()
 
-url = settings.database_url
-if not url.startswith("postgresql+asyncpg://"):
-    url = url.replace("postgresql://", "postgresql+asyncpg://")
-
-engine = create_async_engine(
-    url,  # Usar la URL modificada
-    echo=True,
-    future=True
-)
-# Crear la clase de sesión
-AsyncSessionLocal = sessionmaker(
-    engine, 
-    class_=AsyncSession, 
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False
-)
-
-# Función para obtener una sesión de base de datos
+# El engine y la fábrica de sesiones se crean en el primer uso (el lifespan
+# de la app), no al importar: importar modelos o routers no lee Settings ni
+# carga el driver
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[sessionmaker] = None
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """Engine async con el pool y la instrumentación configurados en Settings."""
+    settings = get_settings()
+    if not url.startswith("postgresql+asyncpg://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://")
+
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    # Duración de cada consulta y conteo por solicitud para /metrics
+    instrument_engine(engine)
+    return engine
+
+
+def get_engine() -> AsyncEngine:
+    """Engine principal del proceso, creado perezosamente."""
+    global _engine
+    if _engine is None:
+        _engine = build_engine(get_settings().database_url)
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    """Fábrica de sesiones ligada al engine principal."""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False
+        )
+    return _sessionmaker
+
+
+async def warm_up_pool(connections: int) -> None:
+    """Abre ``connections`` conexiones a la vez para que queden en el pool."""
+    engine = get_engine()
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+async def dispose_engine() -> None:
+    """Cierra el pool; el siguiente get_engine() crea uno nuevo."""
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _sessionmaker = None
+
+
+# Función para obtener una sesión de base de datos.
+# No hace COMMIT: cada caso de uso confirma con su UnitOfWork
 async def get_db():
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
-            raise
\ No newline at end of file
+            raise
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Estado y métricas del pool de conexiones del engine principal."""
+    return get_engine().pool.snapshot()
@@ -9,7 +9,7 @@ from alembic import context
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 
 # Importaciones locales
-from app.core.settings import settings
+from app.core.settings import get_settings
 from app.db.base import Base
 from app.modules.users.infrastructure.models import User, Role, Area
 
@@ -21,7 +21,7 @@ config = context.config
 fileConfig(config.config_file_name)
 
 # Sobrescribe sqlalchemy.url con el valor de settings
-sync_url = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+sync_url = get_settings().database_url.replace("postgresql+asyncpg://", "postgresql://")
 config.set_main_option("sqlalchemy.url", sync_url)
 
 # Define metadata objetivo para autogeneración
@@ -0,0 +1,47 @@
+"""notify role/area changes
+
+Revision ID: 5c1e8a7d2f90
+Revises: 739bcf63cf13
+Create Date: 2026-10-18 10:12:31.402116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8a7d2f90'
+down_revision: Union[str, None] = '739bcf63cf13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Debe coincidir con Settings.REFERENCE_CACHE_CHANNEL
+CHANNEL = 'reference_changed'
+TABLES = ('user_role', 'user_area')
+
+
+def upgrade() -> None:
+    # Un NOTIFY por sentencia (no por fila) con el nombre de la tabla;
+    # Postgres lo entrega al hacer COMMIT y descarta los duplicados
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_reference_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{CHANNEL}', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_change
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_change()
+        """)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_reference_change()")
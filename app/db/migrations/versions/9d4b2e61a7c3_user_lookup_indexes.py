@@ -0,0 +1,55 @@
+"""index user lookup columns
+
+Revision ID: 9d4b2e61a7c3
+Revises: 5c1e8a7d2f90
+Create Date: 2026-10-18 11:02:47.518930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b2e61a7c3'
+down_revision: Union[str, None] = '5c1e8a7d2f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY no bloquea escrituras en user_user pero no
+    # puede ir dentro de una transacción. Si falla (p. ej. auth_id duplicados
+    # para el índice único) deja un índice INVALID: corregir los datos,
+    # ejecutar el downgrade y repetir.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_user_auth_id', 'user_user', ['auth_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+        # (columna, id): filtro + paginación keyset por ID con el mismo índice
+        op.create_index(
+            'ix_user_user_role_id_id', 'user_user', ['role_id', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_user_area_id_id', 'user_user', ['area_id', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Búsqueda por email sin distinguir mayúsculas (User.normalize_email)
+        op.create_index(
+            'ix_user_user_email_lower', 'user_user', [sa.text('lower(email)')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (
+            'ix_user_user_email_lower',
+            'ix_user_user_area_id_id',
+            'ix_user_user_role_id_id',
+            'ix_user_user_auth_id',
+        ):
+            op.drop_index(name, table_name='user_user', postgresql_concurrently=True, if_exists=True)
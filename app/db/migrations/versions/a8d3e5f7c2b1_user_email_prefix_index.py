@@ -0,0 +1,38 @@
+"""user email prefix index
+
+Revision ID: a8d3e5f7c2b1
+Revises: f1c7a3e9b2d4
+Create Date: 2026-10-20 11:02:37.519846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3e5f7c2b1'
+down_revision: Union[str, None] = 'f1c7a3e9b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filtro email_prefix de GET /users/page: lower(email) LIKE 'prefijo%'.
+    # ix_user_user_email_lower usa el operador de la collation de la base y
+    # no sirve para LIKE salvo con collation C; text_pattern_ops sí
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_user_email_lower_pattern', 'user_user',
+            [sa.text('lower(email) text_pattern_ops')],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_user_email_lower_pattern', table_name='user_user',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,45 @@
+"""trigram index for user search
+
+Revision ID: b3f7c9d1e4a6
+Revises: 9d4b2e61a7c3
+Create Date: 2026-10-18 16:20:11.304857
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7c9d1e4a6'
+down_revision: Union[str, None] = '9d4b2e61a7c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Documento de búsqueda de GET /users/search; debe coincidir carácter a
+# carácter con _SEARCH_DOCUMENT del repositorio para que el planner use el índice
+SEARCH_DOCUMENT = "(names || ' ' || lastnames || ' ' || email)"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # GiST (no GIN): además de filtrar por ILIKE y por similitud (%>) entrega
+    # las filas ya ordenadas por distancia (<->>), así que una página de
+    # resultados no obliga a puntuar y ordenar todas las coincidencias
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_user_search_trgm', 'user_user',
+            [sa.text(f"{SEARCH_DOCUMENT} gist_trgm_ops")],
+            postgresql_using='gist', postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_user_search_trgm', table_name='user_user',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    # La extensión se deja instalada: otros objetos de la base pueden usarla
@@ -0,0 +1,46 @@
+"""unique case-insensitive user email
+
+Revision ID: e6a2d8f4c1b9
+Revises: b3f7c9d1e4a6
+Create Date: 2026-10-19 09:14:52.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a2d8f4c1b9'
+down_revision: Union[str, None] = 'b3f7c9d1e4a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_email_index(unique: bool) -> None:
+    # El índice nuevo se crea con otro nombre y se renombra al borrar el
+    # anterior: get_by_email nunca se queda sin índice durante la migración
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_user_email_lower_new', 'user_user', [sa.text('lower(email)')],
+            unique=unique, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_user_user_email_lower', table_name='user_user',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.execute('ALTER INDEX ix_user_user_email_lower_new RENAME TO ix_user_user_email_lower')
+
+
+def upgrade() -> None:
+    # Un email por usuario sin distinguir mayúsculas: el índice pasa a ser
+    # UNIQUE y es el destino de ON CONFLICT de las altas. Si falla por emails
+    # que solo difieren en mayúsculas deja ix_user_user_email_lower_new
+    # INVALID: unificar esos usuarios, borrar ese índice y repetir. Detectarlos:
+    #   SELECT lower(email) FROM user_user GROUP BY 1 HAVING count(*) > 1
+    _replace_email_index(unique=True)
+
+
+def downgrade() -> None:
+    _replace_email_index(unique=False)
@@ -0,0 +1,28 @@
+"""user password hash
+
+Revision ID: f1c7a3e9b2d4
+Revises: e6a2d8f4c1b9
+Create Date: 2026-10-19 16:40:11.834102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a3e9b2d4'
+down_revision: Union[str, None] = 'e6a2d8f4c1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable y sin valor por defecto: solo cambia el catálogo, sin reescribir
+    # la tabla. Los usuarios sin contraseña siguen entrando por auth_id
+    op.add_column('user_user', sa.Column('password_hash', sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user_user', 'password_hash')
@@ -0,0 +1,130 @@
+# app/db/pool_metrics.py
+"""
+Pool de conexiones instrumentado para el engine async.
+
+Extiende ``AsyncAdaptedQueuePool`` para medir cuánto esperan las peticiones
+por una conexión, cuántas veces se usa el overflow y cuántos checkouts
+terminan en timeout. Las métricas se consultan con ``snapshot()``.
+
+La espera se mide en la cola del pool: solo cuenta el tiempo hasta obtener
+un hueco, no el de abrir una conexión nueva ni el pre-ping del checkout.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+
+class PoolMetrics:
+    """Contadores acumulados del pool (seguros entre hilos)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.overflow_peak = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        with self._lock:
+            self.wait_time_total += wait
+            if wait > self.wait_time_max:
+                self.wait_time_max = wait
+
+    def record_checkout(self, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if overflow > 0:
+                self.overflow_checkouts += 1
+                if overflow > self.overflow_peak:
+                    self.overflow_peak = overflow
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "overflow_peak": self.overflow_peak,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self.wait_time_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+class _TimedQueue(AsyncAdaptedQueue):
+    """Cola del pool que registra cuánto se espera en cada ``get()``."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` que registra esperas, overflow y timeouts."""
+
+    _queue_class = _TimedQueue
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._use_metrics(PoolMetrics())
+
+    def _use_metrics(self, metrics: PoolMetrics) -> None:
+        self.metrics = metrics
+        self._pool.metrics = metrics
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        # dispose()/invalidate() recrean el pool: conservamos los contadores
+        new_pool = super().recreate()
+        new_pool._use_metrics(self.metrics)
+        return new_pool
+
+    def connect(self):
+        # Los checkouts se cuentan en connect() y no en _do_get(), que es
+        # recursivo; la espera ya la ha registrado la cola
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(self.overflow())
+        return conn
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self.metrics.record_checkin()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado actual del pool más los contadores acumulados."""
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_connections": self.size() + max(self._max_overflow, 0),
+            **self.metrics.as_dict(),
+        }
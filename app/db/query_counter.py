@@ -0,0 +1,42 @@
+# app/db/query_counter.py
+"""
+Cuenta las sentencias SQL y los COMMIT que pasan por un engine.
+
+Uso:
+    with QueryCounter(engine) as counter:
+        ...
+    assert counter.statements == 1
+"""
+
+from typing import Any, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine.sync_engine
+        self.queries: List[str] = []
+        self.parameters: List[Any] = []  # parámetros de cada sentencia, en el formato del driver
+        self.commits = 0
+
+    @property
+    def statements(self) -> int:
+        return len(self.queries)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.queries.append(statement)
+        self.parameters.append(parameters)
+
+    def _on_commit(self, conn) -> None:
+        self.commits += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self._engine, "before_cursor_execute", self._on_execute)
+        event.listen(self._engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self._engine, "before_cursor_execute", self._on_execute)
+        event.remove(self._engine, "commit", self._on_commit)
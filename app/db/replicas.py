@@ -0,0 +1,233 @@
+# app/db/replicas.py
+"""
+Enrutado de lecturas a réplicas de Postgres.
+
+Con ``DB_READ_REPLICA_URLS`` cada réplica tiene su propio engine y pool
+(``build_engine``), creados en el primer uso como el del primario.
+``get_read_db`` da a la solicitud una sesión de lectura que elige réplica
+sana, por turno (``round_robin``) o por menos conexiones en uso
+(``least_busy``), la primera vez que ejecuta una consulta: las solicitudes
+servidas desde la caché de usuarios o por una búsqueda single-flight
+compartida no llegan a sacar conexión. Si ninguna réplica responde, esa
+sesión lee del primario. Cuando no hay réplicas, la solicitud escribe o debe
+ver sus propias escrituras, ``get_read_db`` es la sesión de ``get_db``.
+
+Una réplica que rechaza la conexión, o cuya conexión se corta en plena
+consulta, queda fuera ``DB_READ_REPLICA_RETRY_AFTER`` segundos; pasado ese
+tiempo la siguiente lectura vuelve a probarla.
+
+Leer lo propio: tras una escritura correcta, ReadYourWritesMiddleware pone
+la cookie ``PRIMARY_COOKIE`` con el instante hasta el que ese cliente lee
+del primario (``DB_READ_REPLICA_MAX_LAG``). La cabecera
+``X-Read-Consistency: primary`` fuerza lo mismo en una solicitud concreta.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+from fastapi import Depends, Request
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.settings import get_settings
+from app.db.base import build_engine, get_db, get_engine
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_COOKIE = "db_primary_until"
+CONSISTENCY_HEADER = "x-read-consistency"
+STRATEGIES = ("round_robin", "least_busy")
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.name = engine.url.render_as_string(hide_password=True)
+        self.down_until = 0.0
+        self.failures = 0
+        self.reads = 0
+
+    @property
+    def busy(self) -> int:
+        return self.engine.pool.checkedout()
+
+    def healthy(self, now: float) -> bool:
+        return self.down_until <= now
+
+
+class ReplicaSet:
+    def __init__(self, replicas: List[Replica], strategy: str = "round_robin", retry_after: float = 10.0) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"DB_READ_REPLICA_STRATEGY debe ser uno de {', '.join(STRATEGIES)}")
+        self.replicas = replicas
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self.fallbacks = 0  # lecturas enviadas al primario por no haber réplica sana
+        self._turns = itertools.count()
+        for replica in replicas:
+            event.listen(replica.engine.sync_engine, "handle_error", partial(self._on_error, replica))
+
+    def _on_error(self, replica: Replica, context) -> None:
+        # Conexión cortada en plena consulta: las siguientes lecturas no deben ir allí
+        if context.is_disconnect:
+            self.mark_down(replica, context.original_exception)
+
+    def pick(self) -> Optional[Replica]:
+        now = time.monotonic()
+        healthy = [replica for replica in self.replicas if replica.healthy(now)]
+        if not healthy:
+            return None
+        if self.strategy == "least_busy":
+            return min(healthy, key=lambda replica: replica.busy)
+        return healthy[next(self._turns) % len(healthy)]
+
+    def mark_down(self, replica: Replica, error: BaseException) -> None:
+        now = time.monotonic()
+        if replica.healthy(now):
+            replica.failures += 1
+            logger.warning(
+                "Réplica %s fuera durante %.0fs: %r", replica.name, self.retry_after, error
+            )
+        replica.down_until = now + self.retry_after
+
+    def connect(self) -> Optional[Connection]:
+        """
+        Conexión a una réplica sana, o None si ninguna responde. Es síncrona:
+        la llama ReplicaSession dentro del greenlet de la sesión async.
+        """
+        for _ in range(len(self.replicas)):
+            replica = self.pick()
+            if replica is None:
+                break
+            try:
+                connection = replica.engine.sync_engine.connect()
+            except (DBAPIError, OSError, asyncio.TimeoutError) as exc:
+                self.mark_down(replica, exc)
+                continue
+            replica.reads += 1
+            return connection
+        self.fallbacks += 1
+        return None
+
+    def session(self) -> AsyncSession:
+        """Sesión de lectura que no pide conexión hasta su primera consulta."""
+        return AsyncSession(
+            sync_session_class=ReplicaSession,
+            replicas=self,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "fallbacks": self.fallbacks,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy(now),
+                    "retry_in": round(max(replica.down_until - now, 0.0), 1),
+                    "failures": replica.failures,
+                    "reads": replica.reads,
+                    "pool": replica.engine.pool.snapshot(),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+class ReplicaSession(Session):
+    """
+    Sesión (síncrona, bajo AsyncSession) que elige la réplica en la primera
+    consulta y la mantiene hasta cerrarse. Sin réplica sana usa el engine
+    del primario.
+    """
+
+    def __init__(self, *args: Any, replicas: ReplicaSet, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self._target: Union[Connection, Engine, None] = None
+
+    def get_bind(self, *args: Any, **kwargs: Any) -> Union[Connection, Engine]:
+        if self._target is None:
+            self._target = self.replicas.connect() or get_engine().sync_engine
+        return self._target
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            # La conexión de la réplica es externa a la sesión: se devuelve aquí
+            target, self._target = self._target, None
+            if isinstance(target, Connection):
+                target.close()
+
+
+# Como el engine principal: se crean en el primer uso, no al importar
+_replicas: Optional[ReplicaSet] = None
+
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    """Réplicas de lectura configuradas, o None si no hay ninguna."""
+    global _replicas
+    if _replicas is None:
+        settings = get_settings()
+        if not settings.DB_READ_REPLICA_URLS:
+            return None
+        _replicas = ReplicaSet(
+            [Replica(build_engine(url)) for url in settings.DB_READ_REPLICA_URLS],
+            strategy=settings.DB_READ_REPLICA_STRATEGY,
+            retry_after=settings.DB_READ_REPLICA_RETRY_AFTER,
+        )
+    return _replicas
+
+
+async def dispose_replicas() -> None:
+    """Cierra los pools de las réplicas; el siguiente uso los vuelve a crear."""
+    global _replicas
+    if _replicas is not None:
+        await _replicas.dispose()
+    _replicas = None
+
+
+def reads_from_primary(request: Request) -> bool:
+    """La solicitud pide (o necesita, por una escritura reciente) leer del primario."""
+    if request.method not in SAFE_METHODS:
+        # Las lecturas de una escritura (validaciones, respuesta) deben ver el primario
+        return True
+    if request.headers.get(CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    until = request.cookies.get(PRIMARY_COOKIE)
+    if until is None:
+        return False
+    try:
+        return float(until) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)) -> AsyncIterator[AsyncSession]:
+    """Sesión para casos de uso de solo lectura; es ``db`` si la solicitud debe leer del primario."""
+    replicas = get_replica_set()
+    if replicas is None or reads_from_primary(request):
+        yield db
+        return
+    async with replicas.session() as session:
+        yield session
+
+
+def get_replica_status() -> Optional[Dict[str, Any]]:
+    replicas = get_replica_set()
+    return replicas.status() if replicas is not None else None
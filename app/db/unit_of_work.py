@@ -0,0 +1,99 @@
+# app/db/unit_of_work.py
+"""
+Unidad de trabajo sobre una AsyncSession.
+
+Cada caso de uso abre ``async with uow.transaction():``. El bloque más
+externo es la transacción real: al salir hace COMMIT solo si la sesión
+escribió algo, y ROLLBACK si hubo una excepción. Los bloques anidados usan
+SAVEPOINT, de modo que un paso puede fallar sin deshacer a los demás.
+
+Las lecturas fuera de una transacción nunca emiten COMMIT: la conexión
+vuelve al pool y éste la resetea.
+
+Los callbacks de ``after_commit`` corren con la transacción ya cerrada: si
+uno falla se registra en el log y no afecta al resultado del caso de uso,
+que ya está confirmado.
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_WRITES_KEY = "uow_has_writes"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session, flush_context) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset_writes(session) -> None:
+    session.info.pop(_WRITES_KEY, None)
+
+
+class UnitOfWork:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._depth = 0
+        self._after_commit: List[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def has_writes(self) -> bool:
+        return bool(self.session.info.get(_WRITES_KEY))
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Programa un callback para después del COMMIT (se descarta si hay ROLLBACK)."""
+        self._after_commit.append(callback)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["UnitOfWork"]:
+        if self._depth > 0:
+            async with self.session.begin_nested():
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+            return
+
+        self._depth = 1
+        committed = False
+        try:
+            yield self
+            if self.has_writes:
+                await self.session.commit()
+                committed = True
+        except BaseException:
+            await self.session.rollback()
+            raise
+        finally:
+            callbacks, self._after_commit = self._after_commit, []
+            self._depth = 0
+            self.session.info.pop(_WRITES_KEY, None)
+
+        if committed:
+            await self._run_after_commit(callbacks)
+
+    @staticmethod
+    async def _run_after_commit(callbacks: List[Callable[[], Awaitable[None]]]) -> None:
+        # El COMMIT ya está hecho: un fallo aquí no puede deshacerlo ni debe
+        # convertir en error una escritura que sí se guardó
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("Falló un callback after_commit: %r", callback)
@@ -1,18 +1,148 @@
-from fastapi import FastAPI
-from app.modules.users.infrastructure.routers import router as user_router
-from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI()
-
-@app.get("/")
-def read_root():
-    return {"message": "¡Hola desde FastAPI + Poetry!"}
-
-app.include_router(user_router)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Para desarrollo; restringe esto en producción
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
\ No newline at end of file
+"""
+Punto de entrada: ``create_app()`` construye la aplicación.
+
+Importar este módulo no lee Settings, no crea el engine ni carga FastAPI,
+SQLAlchemy o los routers: todo eso ocurre al llamar a ``create_app()`` y, lo
+que necesita el event loop (pool, caché de referencia, listeners), en el
+lifespan antes de aceptar tráfico.
+
+    uvicorn --factory app.main:create_app
+    uvicorn app.main:app      # también funciona: ``app`` se crea al pedirla
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Optional
+
+from app.core.settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(settings: Settings) -> None:
+    """Abre conexiones del pool y compila serializadores antes de servir."""
+    from app.db.base import warm_up_pool
+    from app.modules.users.infrastructure.serializers import warm_up_serializers
+
+    warm_up_serializers()
+    if settings.DB_POOL_WARMUP_CONNECTIONS > 0:
+        try:
+            await warm_up_pool(min(settings.DB_POOL_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+        except Exception:
+            # pool_pre_ping y los reintentos del pool cubren una base que tarda en llegar
+            logger.warning("No se pudo precalentar el pool de conexiones", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: "FastAPI"):
+    from app.core.logging_config import configure_logging
+    from app.core.profiling import get_profiler
+    from app.db.base import dispose_engine, get_engine, get_sessionmaker
+    from app.db.replicas import dispose_replicas
+    from app.modules.users.infrastructure.reference_cache import (
+        ReferenceChangeListener,
+        get_reference_cache,
+    )
+
+    settings: Settings = app.state.settings
+    # Los logs se escriben desde un hilo aparte; el event loop solo encola
+    log_listener = configure_logging(settings)
+    get_engine()
+    await warm_up(settings)
+
+    reference_listener = None
+    if settings.REFERENCE_CACHE_ENABLED:
+        # Roles y áreas en memoria; LISTEN/NOTIFY los recarga en cada worker
+        reference_listener = ReferenceChangeListener(
+            get_reference_cache(),
+            get_sessionmaker(),
+            dsn=settings.database_url.replace("postgresql+asyncpg://", "postgresql://"),
+            channel=settings.REFERENCE_CACHE_CHANNEL,
+            poll_interval=settings.REFERENCE_CACHE_POLL_INTERVAL,
+        )
+        await reference_listener.start()
+
+    email_service = None
+    if settings.EMAIL_ENABLED:
+        from app.services.email_service import get_email_service, get_smtp_sink
+
+        if settings.EMAIL_SMTP_SINK:
+            await get_smtp_sink().start()
+        # Los handlers solo encolan; estos workers envían por SMTP
+        email_service = get_email_service()
+        await email_service.start()
+    try:
+        yield
+    finally:
+        if email_service is not None:
+            await email_service.stop(settings.EMAIL_SHUTDOWN_TIMEOUT)
+            if settings.EMAIL_SMTP_SINK:
+                await get_smtp_sink().stop()
+        if reference_listener is not None:
+            await reference_listener.stop()
+        await dispose_replicas()
+        await dispose_engine()
+        get_profiler().stop()
+        log_listener.stop()
+
+
+def create_app(settings: Optional[Settings] = None) -> "FastAPI":
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from app.adapters.http.diagnostics import router as diagnostics_router
+    from app.adapters.http.metrics import router as metrics_router
+    from app.core.internal_access import internal_access_allowed
+    from app.core.profiling import get_profiler
+    from app.core.responses import FastJSONResponse
+    from app.middlewares.logging import RequestLoggingMiddleware
+    from app.middlewares.metrics import MetricsMiddleware
+    from app.middlewares.profiling import ProfilingMiddleware
+    from app.middlewares.read_your_writes import ReadYourWritesMiddleware
+    from app.modules.users.infrastructure.routers import router as user_router
+
+    settings = settings or get_settings()
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+    app.state.settings = settings
+
+    @app.get("/")
+    def read_root():
+        return {"message": "¡Hola desde FastAPI + Poetry!"}
+
+    app.include_router(user_router)
+    app.include_router(diagnostics_router)
+    app.include_router(metrics_router)
+    if settings.PROFILING_ENABLED:
+        # Dentro de métricas y logging: necesita el request_id y el tiempo en base
+        app.add_middleware(
+            ProfilingMiddleware,
+            profiler=get_profiler(),
+            sample_rate=settings.PROFILING_SAMPLE_RATE,
+            header=settings.PROFILING_HEADER,
+            authorize=partial(internal_access_allowed, settings=settings),
+        )
+    if settings.DB_READ_REPLICA_URLS:
+        app.add_middleware(ReadYourWritesMiddleware, window=settings.DB_READ_REPLICA_MAX_LAG)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestLoggingMiddleware, sample_rate=settings.LOG_SUCCESS_SAMPLE_RATE)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Para desarrollo; restringe esto en producción
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+
+def __getattr__(name: str):
+    # ``app.main:app`` se resuelve aquí la primera vez que se pide
+    if name == "app":
+        app = create_app()
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
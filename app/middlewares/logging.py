@@ -1,10 +1,10 @@
 # app/middlewares/logging.py
 import logging
+import random
 import time
 import uuid
 from contextvars import ContextVar
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Optional
 
 # Crear variable de contexto para almacenar el ID de la solicitud
 request_id_var = ContextVar("request_id", default=None)
@@ -13,47 +13,68 @@ def get_request_id():
     """Obtiene el ID de la solicitud actual desde la variable de contexto"""
     return request_id_var.get()
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware para registrar solicitudes HTTP y establecer un ID único"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Generar ID único para esta solicitud
+class RequestLoggingMiddleware:
+    """
+    Middleware ASGI puro para registrar solicitudes HTTP y establecer un ID único.
+
+    No usa BaseHTTPMiddleware (sin tarea ni stream extra por solicitud). Los
+    registros son estructurados (campos en ``extra``) y no se formatean si el
+    nivel INFO está desactivado. Las solicitudes correctas (< 400) se muestrean
+    con ``sample_rate``; los errores se registran siempre.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0, logger: Optional[logging.Logger] = None):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Generar ID único para esta solicitud y guardarlo en el contexto
         request_id = str(uuid.uuid4())
-        # Guardar en la variable de contexto
-        request_id_var.set(request_id)
-        
-        # Configurar logger
-        logger = logging.getLogger(__name__)
-        
-        # Registrar inicio de solicitud
-        start_time = time.time()
-        logger.info(f"Solicitud iniciada: {request.method} {request.url.path} [request_id={request_id}]")
-        
+        token = request_id_var.set(request_id)
+        header_value = request_id.encode("latin-1")
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Agregar ID de solicitud a las cabeceras de respuesta
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", header_value)]
+            await send(message)
+
         try:
-            # Procesar la solicitud
-            response = await call_next(request)
-            
-            # Calcular tiempo de procesamiento
-            process_time = time.time() - start_time
-            
-            # Registrar finalización de solicitud
-            logger.info(
-                f"Solicitud completada: {request.method} {request.url.path} "
-                f"status={response.status_code} tiempo={process_time:.3f}s "
-                f"[request_id={request_id}]"
-            )
-            
-            # Agregar ID de solicitud a las cabeceras de respuesta
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Registrar errores
-            process_time = time.time() - start_time
-            logger.error(
-                f"Error en solicitud: {request.method} {request.url.path} "
-                f"error={str(e)} tiempo={process_time:.3f}s "
-                f"[request_id={request_id}]",
-                exc_info=True
+            self.logger.error(
+                "Error en solicitud",
+                exc_info=True,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "error": str(e),
+                    "duration_ms": round((time.perf_counter() - start_time) * 1000, 3),
+                },
             )
-            raise
\ No newline at end of file
+            raise
+        else:
+            if (
+                (status_code >= 400 or self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+                and self.logger.isEnabledFor(logging.INFO)
+            ):
+                self.logger.info(
+                    "Solicitud completada",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - start_time) * 1000, 3),
+                    },
+                )
+        finally:
+            request_id_var.reset(token)
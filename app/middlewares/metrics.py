@@ -0,0 +1,49 @@
+# app/middlewares/metrics.py
+import time
+
+from app.core.metrics import RequestDbStats, current_db_stats, metrics
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro que registra la latencia de cada solicitud por
+    plantilla de ruta (``/users/{user_id}``, no la ruta real) y clase de
+    estado, junto con las consultas SQL que ejecutó.
+
+    La ruta se lee de ``scope["route"]`` cuando el router ya la resolvió;
+    las solicitudes sin ruta se agrupan en ``unmatched`` para no crear una
+    serie por cada URL desconocida.
+    """
+
+    def __init__(self, app, registry=metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = RequestDbStats()
+        token = current_db_stats.set(db_stats)
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start_time,
+                db_stats,
+            )
+            current_db_stats.reset(token)
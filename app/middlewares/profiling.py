@@ -0,0 +1,66 @@
+# app/middlewares/profiling.py
+import random
+from typing import Callable, Optional
+
+from app.core.metrics import RequestDbStats, current_db_stats
+from app.core.profiling import SamplingProfiler
+from app.middlewares.logging import get_request_id
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI puro que perfila una fracción de las solicitudes.
+
+    Se perfila con probabilidad ``sample_rate`` o cuando la solicitud trae la
+    cabecera ``header`` con valor ``1`` y ``authorize`` acepta su cabecera
+    Authorization (sin ``authorize`` la cabecera se ignora): perfilar es
+    caro y los perfiles contienen pilas internas. El perfil queda indexado por el
+    ``request_id`` de RequestLoggingMiddleware, que debe envolver a este
+    middleware (igual que MetricsMiddleware, de quien toma el tiempo en base).
+    """
+
+    def __init__(
+        self,
+        app,
+        profiler: SamplingProfiler,
+        sample_rate: float = 0.0,
+        header: str = "x-profile",
+        authorize: Optional[Callable[[Optional[str]], bool]] = None,
+    ):
+        self.app = app
+        self.profiler = profiler
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1")
+        self.authorize = authorize
+
+    def _wants_profile(self, scope) -> bool:
+        forced = False
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                forced = value == b"1"
+            elif name == b"authorization":
+                authorization = value.decode("latin-1")
+        if forced and self.authorize is not None and self.authorize(authorization):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        request_id = get_request_id() if scope["type"] == "http" else None
+        if request_id is None or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = current_db_stats.get()
+        token = None
+        if db_stats is None:
+            db_stats = RequestDbStats()
+            token = current_db_stats.set(db_stats)
+
+        profile = self.profiler.begin(request_id, scope["method"], scope["path"], db_stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.end(profile)
+            if token is not None:
+                current_db_stats.reset(token)
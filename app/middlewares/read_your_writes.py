@@ -0,0 +1,37 @@
+# app/middlewares/read_your_writes.py
+import math
+import time
+
+from app.db.replicas import PRIMARY_COOKIE, SAFE_METHODS
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI puro para leer lo propio con réplicas de lectura.
+
+    Tras una escritura correcta (método no seguro y estado < 400) añade la
+    cookie ``PRIMARY_COOKIE`` con el instante hasta el que ese cliente debe
+    leer del primario: ``window`` segundos, el retraso de replicación
+    asumido. ``get_read_db`` la respeta.
+    """
+
+    def __init__(self, app, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or self.window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,102 @@
+# app/modules/users/application/user_loader.py
+"""
+Agrupador de búsquedas de usuarios (estilo DataLoader) con ámbito de solicitud.
+
+Las llamadas a ``load_by_id``, ``load_by_email`` y ``load_by_auth_id`` hechas
+en la misma vuelta del event loop (p. ej. desde un ``asyncio.gather``) se
+resuelven con una sola consulta ``WHERE ... = ANY(:claves)`` por tipo de
+clave. Las consultas de distintos tipos se ejecutan de una en una, porque
+comparten la sesión de la solicitud (AsyncSession no admite uso concurrente).
+Una búsqueda que llega sola usa el método unitario del repositorio.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from app.modules.users.domain.user import User
+from app.modules.users.interfaces.user_repository import UserRepositoryInterface
+
+
+class UserLoader:
+    def __init__(self, repository: UserRepositoryInterface, max_batch_size: int = 1000) -> None:
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        # Por tipo de clave: (búsqueda unitaria, búsqueda por lotes, clave de un usuario)
+        self._sources: Dict[str, Tuple[Any, Any, Any]] = {
+            "id": (repository.get_by_id, repository.get_by_ids, lambda user: user.id),
+            "email": (
+                repository.get_by_email,
+                repository.get_by_emails,
+                lambda user: User.normalize_email(user.email),
+            ),
+            "auth": (repository.get_by_auth_id, repository.get_by_auth_ids, lambda user: user.auth_id),
+        }
+        self._pending: Dict[str, Dict[Any, asyncio.Future]] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self.loads = 0  # claves pedidas
+        self.queries = 0  # consultas ejecutadas
+
+    async def load_by_id(self, user_id: UUID) -> Optional[User]:
+        return await self._load("id", user_id)
+
+    async def load_by_email(self, email: str) -> Optional[User]:
+        return await self._load("email", User.normalize_email(email))
+
+    async def load_by_auth_id(self, auth_id: UUID) -> Optional[User]:
+        return await self._load("auth", auth_id)
+
+    async def _load(self, kind: str, key: Any) -> Optional[User]:
+        self.loads += 1
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(kind)
+        if pending is None:
+            # El despacho corre en la siguiente vuelta del loop: para entonces
+            # el resto de tareas listas ya han encolado sus claves
+            pending = self._pending[kind] = {}
+            loop.call_soon(self._dispatch_soon, kind)
+        future = pending.get(key)
+        if future is None:
+            future = pending[key] = loop.create_future()
+        # shield: cancelar a un llamador no cancela la búsqueda de los demás
+        return await asyncio.shield(future)
+
+    def _dispatch_soon(self, kind: str) -> None:
+        batch = self._pending.pop(kind)
+        task = asyncio.get_running_loop().create_task(self._dispatch(kind, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, kind: str, batch: Dict[Any, asyncio.Future]) -> None:
+        load_one, load_many, key_of = self._sources[kind]
+        keys = list(batch)
+        try:
+            async with self._lock:
+                if len(keys) == 1:
+                    self.queries += 1
+                    user = await load_one(keys[0])
+                    found = {keys[0]: user} if user is not None else {}
+                else:
+                    found = {}
+                    for start in range(0, len(keys), self.max_batch_size):
+                        self.queries += 1
+                        users = await load_many(keys[start:start + self.max_batch_size])
+                        found.update((key_of(user), user) for user in users)
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+                    # Los llamadores que esperan reciben la excepción igual;
+                    # si no queda ninguno, así asyncio no avisa de
+                    # "Future exception was never retrieved"
+                    future.exception()
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
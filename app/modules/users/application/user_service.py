@@ -1,10 +1,24 @@
 # app/modules/users/application/user_service.py
+import base64
+import binascii
 import logging
-from typing import List, Optional, Dict
+import struct
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional, Dict, Set, Tuple, Union
 from uuid import UUID, uuid4
 
+from app.db.unit_of_work import UnitOfWork
+from app.modules.users.application.user_loader import UserLoader
+from app.modules.users.interfaces.password_hasher import PasswordHasher
+from app.modules.users.interfaces.reference_lookup import ReferenceLookup
+from app.modules.users.interfaces.user_notifier import UserNotifier
 from app.modules.users.interfaces.user_repository import UserRepositoryInterface
-from app.modules.users.domain.user import User
+from app.modules.users.domain.exceptions import (
+    DuplicateAuthIdError,
+    DuplicateEmailError,
+    UserNotFoundError,
+)
+from app.modules.users.domain.user import User, UserDetail, UserMatch
 from app.modules.users.interfaces.schemas import (
     UserCreate,
     UserUpdate,
@@ -12,90 +26,391 @@ from app.modules.users.interfaces.schemas import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class BulkCreateResult:
+    """Resultado de una importación masiva; los errores se indexan por fila."""
+    created: int = 0
+    errors: Dict[int, str] = field(default_factory=dict)
+
+
+@dataclass
+class UserPage:
+    """Página de usuarios; ``next_cursor`` es None en la última página."""
+    items: List[User]
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class UserBatch:
+    """Usuarios pedidos por ID, en el orden de la petición, y los IDs inexistentes."""
+    items: List[User]
+    missing: List[UUID]
+
+
+@dataclass
+class UserDetailPage:
+    """Página de usuarios con su rol y su área."""
+    items: List[UserDetail]
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class UserSearchPage:
+    """Resultados de búsqueda, del más parecido al menos parecido."""
+    items: List[UserMatch]
+    next_cursor: Optional[str] = None
+
+
+# Términos más cortos no forman trigramas útiles y recorrerían media tabla
+SEARCH_MIN_LENGTH = 3
+
+
+def encode_cursor(user_id: UUID) -> str:
+    """Cursor opaco para el cliente a partir del último ID servido."""
+    return base64.urlsafe_b64encode(user_id.bytes).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> UUID:
+    try:
+        return UUID(bytes=base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise ValueError("Cursor de paginación inválido")
+
+
+def encode_search_cursor(distance: float, user_id: UUID) -> str:
+    """Cursor de búsqueda: distancia (real de 4 bytes, como en Postgres) e ID."""
+    raw = struct.pack(">f", distance) + user_id.bytes
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        (distance,) = struct.unpack(">f", raw[:4])
+        return distance, UUID(bytes=raw[4:])
+    except (binascii.Error, struct.error, ValueError):
+        raise ValueError("Cursor de búsqueda inválido")
+
+
 class UserService:
     """Casos de uso relacionados con usuarios."""
 
-    def __init__(self, user_repository: UserRepositoryInterface) -> None:
+    def __init__(
+        self,
+        user_repository: UserRepositoryInterface,
+        uow: UnitOfWork,
+        references: Optional[ReferenceLookup] = None,
+        notifier: Optional[UserNotifier] = None,
+        read_repository: Optional[UserRepositoryInterface] = None,
+        passwords: Optional[PasswordHasher] = None,
+    ) -> None:
         self.user_repository = user_repository
+        self.uow = uow
+        self.references = references
+        self.notifier = notifier
+        self.passwords = passwords
+        # Casos de uso de solo lectura (puede ser una réplica). Las escrituras,
+        # y las lecturas en las que se apoya una escritura, usan user_repository
+        self.read_repository = read_repository or user_repository
+        # Búsquedas unitarias concurrentes de la misma solicitud en una consulta
+        self.loader = UserLoader(self.read_repository)
+
+    def _references_ready(self) -> bool:
+        return self.references is not None and self.references.ready
+
+    def _expand(self, user: User) -> UserDetail:
+        """Añade rol y área desde la caché de referencia (sin consultas)."""
+        return UserDetail(
+            user.id, user.names, user.lastnames, user.email,
+            user.role_id, user.area_id, user.auth_id,
+            role=self.references.get_role(user.role_id),
+            area=self.references.get_area(user.area_id),
+        )
 
     # ──────────────────────────── Consultas ────────────────────────────
     async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         logger.info("Obteniendo usuario con ID: %s", user_id)
-        return await self.user_repository.get_by_id(user_id)
+        return await self.loader.load_by_id(user_id)
+
+    async def get_users_by_ids(self, user_ids: List[UUID]) -> UserBatch:
+        """Resuelve todos los IDs con una sola consulta (sin repetidos)."""
+        logger.info("Obteniendo %d usuarios por ID", len(user_ids))
+        requested = list(dict.fromkeys(user_ids))
+        found = {user.id: user for user in await self.read_repository.get_by_ids(requested)}
+        return UserBatch(
+            items=[found[user_id] for user_id in requested if user_id in found],
+            missing=[user_id for user_id in requested if user_id not in found],
+        )
+
+    async def get_user_detail(self, user_id: UUID) -> Optional[UserDetail]:
+        logger.info("Obteniendo usuario con rol y área, ID: %s", user_id)
+        if self._references_ready():
+            user = await self.loader.load_by_id(user_id)
+            return self._expand(user) if user else None
+        return await self.read_repository.get_detail_by_id(user_id)
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         logger.info("Buscando usuario con email: %s", email)
-        return await self.user_repository.get_by_email(email)
+        return await self.loader.load_by_email(email)
 
     async def get_user_by_auth_id(self, auth_id: UUID) -> Optional[User]:
         logger.info("Buscando usuario con auth_id: %s", auth_id)
-        return await self.user_repository.get_by_auth_id(auth_id)
+        return await self.loader.load_by_auth_id(auth_id)
 
     # ──────────────────────────── Creación ─────────────────────────────
     async def create_user(self, user_data: UserCreate) -> User:
         email = user_data.email
         logger.info("Creando nuevo usuario con email: %s", email)
 
-        # ¿Existe ya un usuario con ese email?
-        if await self.user_repository.get_by_email(email):
+        # El INSERT detecta el email duplicado: no hace falta consultarlo antes
+        try:
+            async with self.uow.transaction():
+                user = await self.user_repository.create(self._build_user(user_data))
+        except DuplicateEmailError:
             logger.warning("Email duplicado: %s", email)
-            raise ValueError("Ya existe un usuario con este email")
+            raise
+        except DuplicateAuthIdError:
+            logger.warning("auth_id duplicado: %s", user_data.auth_id)
+            raise
+        # Tras el commit: no se avisa de un alta que acabe en rollback
+        if self.notifier is not None:
+            self.notifier.user_created(user)
+        return user
+
+    async def bulk_create_users(
+        self, rows: Dict[int, UserCreate], chunk_size: int = 1000
+    ) -> BulkCreateResult:
+        """Crea muchos usuarios con una consulta de duplicados y INSERTs por bloques."""
+        logger.info("Importando %d usuarios", len(rows))
+        result = BulkCreateResult()
 
-        # Construimos la entidad de dominio
-        user = User(
+        # Duplicados dentro del propio lote (email y auth_id son únicos)
+        seen_emails: Set[str] = set()
+        seen_auth_ids: Set[UUID] = set()
+        candidates: List[Tuple[int, UserCreate]] = []
+        for row, user_data in rows.items():
+            email = User.normalize_email(user_data.email)
+            if email in seen_emails:
+                result.errors[row] = "Email duplicado en la importación"
+                continue
+            if user_data.auth_id in seen_auth_ids:
+                result.errors[row] = "auth_id duplicado en la importación"
+                continue
+            seen_emails.add(email)
+            seen_auth_ids.add(user_data.auth_id)
+            candidates.append((row, user_data))
+
+        # Duplicados contra la base, una consulta por columna única
+        existing_emails = await self.user_repository.get_existing_emails(seen_emails)
+        existing_auth_ids = await self.user_repository.get_existing_auth_ids(seen_auth_ids)
+        pending: List[Tuple[int, User]] = []
+        for row, user_data in candidates:
+            if User.normalize_email(user_data.email) in existing_emails:
+                result.errors[row] = "Ya existe un usuario con este email"
+            elif user_data.auth_id in existing_auth_ids:
+                result.errors[row] = "Ya existe un usuario con este auth_id"
+            else:
+                pending.append((row, self._build_user(user_data)))
+
+        async with self.uow.transaction():
+            outcome = await self.user_repository.bulk_create(
+                [user for _, user in pending], chunk_size
+            )
+        for (row, _), error in zip(pending, outcome):
+            if error is None:
+                result.created += 1
+            else:
+                result.errors[row] = error
+
+        logger.info("Importación terminada: %d creados, %d con error",
+                    result.created, len(result.errors))
+        return result
+
+    @staticmethod
+    def _build_user(user_data: UserCreate) -> User:
+        """Construye la entidad de dominio a partir del DTO de creación."""
+        return User(
             id=uuid4(),
             names=user_data.names,
             lastnames=user_data.lastnames,
-            email=email,
+            email=User.normalize_email(user_data.email),
             role_id=user_data.role_id,
             area_id=user_data.area_id,
             auth_id=user_data.auth_id,
         )
 
-        return await self.user_repository.create(user)
     # ──────────────────────────── Actualización ────────────────────────
     async def update_user(self, user_id: UUID, user_data: UserUpdate) -> User:
         logger.info("Actualizando usuario con ID: %s", user_id)
 
-        existing_user = await self.user_repository.get_by_id(user_id)
-        if not existing_user:
-            logger.warning("Usuario inexistente: %s", user_id)
-            raise ValueError("El usuario no existe")
-
-        # Validar email duplicado
-        if user_data.email and user_data.email != existing_user.email:
-            dup = await self.user_repository.get_by_email(user_data.email)
-            if dup and dup.id != user_id:
-                logger.warning("Email ya en uso: %s", user_data.email)
-                raise ValueError("El email ya está en uso por otro usuario")
-            existing_user.change_email(user_data.email)
-
-        # Actualizar otros campos
+        changes: Dict[str, Any] = {}
+        if user_data.email:
+            changes["email"] = User.normalize_email(user_data.email)
         if user_data.names:
-            existing_user.names = user_data.names
+            changes["names"] = user_data.names
         if user_data.lastnames:
-            existing_user.lastnames = user_data.lastnames
+            changes["lastnames"] = user_data.lastnames
         if user_data.role_id:
-            existing_user.role_id = user_data.role_id
+            changes["role_id"] = user_data.role_id
         if user_data.area_id:
-            existing_user.area_id = user_data.area_id
+            changes["area_id"] = user_data.area_id
+
+        # UPDATE ... RETURNING: la existencia y el email duplicado los resuelve la base.
+        # Si no hay fila, la excepción dentro del bloque evita el COMMIT
+        try:
+            async with self.uow.transaction():
+                updated = await self.user_repository.update_fields(user_id, changes)
+                if updated is None:
+                    logger.warning("Usuario inexistente: %s", user_id)
+                    raise UserNotFoundError("El usuario no existe")
+        except DuplicateEmailError:
+            logger.warning("Email ya en uso: %s", user_data.email)
+            raise
+        return updated
+    # ──────────────────────────── Contraseñas ──────────────────────────
+    def _password_hasher(self) -> PasswordHasher:
+        if self.passwords is None:
+            raise RuntimeError("UserService sin PasswordHasher: no gestiona contraseñas")
+        return self.passwords
+
+    async def set_password(self, user_id: UUID, password: str) -> None:
+        logger.info("Cambiando la contraseña del usuario con ID: %s", user_id)
+        # El hash (lento) se calcula antes de abrir la transacción
+        password_hash = await self._password_hasher().hash(password)
+        async with self.uow.transaction():
+            if not await self.user_repository.set_password_hash(user_id, password_hash):
+                logger.warning("Usuario inexistente: %s", user_id)
+                raise UserNotFoundError("El usuario no existe")
+
+    async def verify_password(self, email: str, password: str) -> Optional[User]:
+        """
+        Usuario de ``email`` si ``password`` es su contraseña, o None. Si su
+        hash usa un esquema o un coste anticuados (PASSWORD_SCHEMES,
+        PASSWORD_SCHEME_COSTS) se guarda el hash nuevo en la misma unidad de
+        trabajo: los hashes se migran de login en login.
+        """
+        passwords = self._password_hasher()
+        async with self.uow.transaction():
+            user = await self.user_repository.get_by_email(email)
+            password_hash = await self.user_repository.get_password_hash(user.id) if user else None
+            if password_hash is None:
+                return None
+            valid, new_hash = await passwords.verify_and_update(password, password_hash)
+            if not valid:
+                return None
+            if new_hash is not None:
+                # Si la contraseña cambió entretanto, el hash nuevo ya no vale
+                upgraded = await self.user_repository.set_password_hash(
+                    user.id, new_hash, expected=password_hash
+                )
+                logger.info("Hash de contraseña actualizado (usuario %s): %s", user.id, upgraded)
+        return user
 
-        return await self.user_repository.update(existing_user)
     # ──────────────────────────── Eliminación ──────────────────────────
     async def delete_user(self, user_id: UUID) -> bool:
         logger.info("Eliminando usuario con ID: %s", user_id)
 
-        if not await self.user_repository.get_by_id(user_id):
-            logger.warning("Usuario inexistente: %s", user_id)
-            raise ValueError("El usuario no existe")
-
-        return await self.user_repository.delete(user_id)
+        # El rowcount del DELETE ya indica si el usuario existía
+        async with self.uow.transaction():
+            if not await self.user_repository.delete(user_id):
+                logger.warning("Usuario inexistente: %s", user_id)
+                raise UserNotFoundError("El usuario no existe")
+        return True
 
     # ──────────────────────────── Listados ─────────────────────────────
     async def get_users_by_role(self, role_id: UUID) -> List[User]:
         logger.info("Listando usuarios por rol: %s", role_id)
-        return await self.user_repository.get_users_by_role(role_id)
+        return await self.read_repository.get_users_by_role(role_id)
 
     async def get_users_by_area(self, area_id: UUID) -> List[User]:
         logger.info("Listando usuarios por área: %s", area_id)
-        return await self.user_repository.get_users_by_area(area_id)
+        return await self.read_repository.get_users_by_area(area_id)
+
+    async def list_users(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+        email_prefix: Optional[str] = None,
+        search: Optional[str] = None,
+        expand: bool = False,
+    ) -> Union[UserPage, UserDetailPage]:
+        """
+        Página de usuarios filtrada; el coste no depende de la profundidad.
+        Con ``expand`` cada usuario incluye su rol y su área: desde la caché
+        de referencia si está cargada, o con un JOIN en la misma consulta.
+        """
+        logger.info("Listando usuarios (limit=%d, cursor=%s, expand=%s)", limit, cursor, expand)
+        after_id = decode_cursor(cursor) if cursor else None
+        expand_in_memory = expand and self._references_ready()
+        if expand and not expand_in_memory:
+            list_users, page_class = self.read_repository.list_user_details, UserDetailPage
+        else:
+            list_users, page_class = self.read_repository.list_users, UserPage
+
+        # Pedimos una fila de más para saber si existe otra página
+        users = await list_users(
+            limit=limit + 1,
+            after_id=after_id,
+            role_id=role_id,
+            area_id=area_id,
+            email_prefix=email_prefix,
+            search=search,
+        )
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].id)
+        if expand_in_memory:
+            users, page_class = [self._expand(user) for user in users], UserDetailPage
+        return page_class(items=users, next_cursor=next_cursor)
+
+    # ──────────────────────────── Búsqueda ─────────────────────────────
+    async def search_users(
+        self,
+        q: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> UserSearchPage:
+        """
+        Búsqueda aproximada por nombre, apellidos o email, tolerante a
+        erratas y a términos parciales. ``score`` es la similitud de palabra
+        de pg_trgm (1 = el término aparece tal cual).
+        """
+        q = q.strip()
+        if len(q) < SEARCH_MIN_LENGTH:
+            raise ValueError(f"La búsqueda requiere al menos {SEARCH_MIN_LENGTH} caracteres")
+        logger.info("Buscando usuarios (q=%r, limit=%d, cursor=%s)", q, limit, cursor)
+        after = decode_search_cursor(cursor) if cursor else None
+
+        matches = await self.read_repository.search(q, limit=limit + 1, after=after)
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            last_user, last_distance = matches[-1]
+            next_cursor = encode_search_cursor(last_distance, last_user.id)
+        items = [
+            UserMatch(
+                id=user.id,
+                names=user.names,
+                lastnames=user.lastnames,
+                email=user.email,
+                role_id=user.role_id,
+                area_id=user.area_id,
+                auth_id=user.auth_id,
+                score=round(1.0 - distance, 4),
+            )
+            for user, distance in matches
+        ]
+        return UserSearchPage(items=items, next_cursor=next_cursor)
+
+    # ──────────────────────────── Exportación ──────────────────────────
+    def export_users(
+        self,
+        chunk_size: int,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+    ) -> AsyncIterator[List[Tuple[Any, ...]]]:
+        logger.info("Exportando usuarios (role=%s, area=%s)", role_id, area_id)
+        return self.read_repository.stream_rows(chunk_size, role_id=role_id, area_id=area_id)
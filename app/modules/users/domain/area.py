@@ -0,0 +1,10 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from uuid import UUID
+
+
+@dataclass(slots=True)
+class Area:
+    id: UUID
+    nombre: str
+    color: str | None = None
@@ -0,0 +1,16 @@
+# app/modules/users/domain/exceptions.py
+
+class UserNotFoundError(ValueError):
+    """El usuario indicado no existe."""
+
+
+class DuplicateEmailError(ValueError):
+    """Ya existe otro usuario con el mismo email."""
+
+
+class DuplicateAuthIdError(ValueError):
+    """Ya existe otro usuario con el mismo auth_id."""
+
+
+class InvalidReferenceError(ValueError):
+    """El rol o el área indicados no existen."""
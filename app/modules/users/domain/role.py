@@ -0,0 +1,11 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import List
+from uuid import UUID
+
+
+@dataclass(slots=True)
+class Role:
+    id: UUID
+    nombre: str
+    permissions: List[str] = field(default_factory=list)
@@ -3,8 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from uuid import UUID
 
+from app.modules.users.domain.area import Area
+from app.modules.users.domain.role import Role
 
-@dataclass
+
+@dataclass(slots=True)
 class User:
     id: UUID
     names: str
@@ -17,4 +20,21 @@ class User:
     # Ejemplo de regla de dominio
     def change_email(self, new_email: str) -> None:
         """Cambia el email aplicando una regla simple de normalización."""
-        self.email = new_email.strip().lower()
\ No newline at end of file
+        self.email = self.normalize_email(new_email)
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+
+@dataclass(slots=True)
+class UserDetail(User):
+    """Vista ampliada del usuario con su rol y su área."""
+    role: Role | None = None
+    area: Area | None = None
+
+
+@dataclass(slots=True)
+class UserMatch(User):
+    """Resultado de la búsqueda aproximada; ``score`` va de 0 a 1 (1 = exacto)."""
+    score: float = 0.0
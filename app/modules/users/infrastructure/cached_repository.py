@@ -0,0 +1,305 @@
+"""
+Decorador de caché read-through para UserRepositoryInterface.
+
+Las entidades se guardan una sola vez, bajo ``("id", user_id)``. Las
+búsquedas por email y auth_id guardan solo un puntero al ID, de modo que
+invalidar la entrada del ID basta para invalidar las tres vías de acceso:
+un puntero cuyo usuario ya no está (o ya no coincide) cuenta como fallo.
+
+La entidad cacheada la comparten todas las solicitudes y ``User`` es
+mutable: se guarda una copia y cada lectura devuelve otra, así lo que haga
+un llamador con su usuario no altera el de los demás.
+"""
+
+import asyncio
+from dataclasses import replace
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.settings import get_settings
+from app.db.unit_of_work import UnitOfWork
+from app.modules.users.domain.user import User, UserDetail
+from app.modules.users.interfaces.user_repository import UserRepositoryInterface
+from app.shared.cache import InMemorySharedCache, SharedCache, TTLCache
+
+# Marcador de "no existe"; es un str para poder viajar a un nivel compartido
+NEGATIVE = "__user_not_found__"
+
+# Valor del usuario que corresponde a cada tipo de clave; el
+# email se normaliza porque la búsqueda no distingue mayúsculas
+_LOOKUP_KEYS = {
+    "id": lambda user: user.id,
+    "email": lambda user: User.normalize_email(user.email),
+    "auth": lambda user: user.auth_id,
+}
+
+
+class UserCache:
+    """Caché de usuarios en dos niveles: local (LRU+TTL) y compartido opcional."""
+
+    def __init__(
+        self,
+        local: TTLCache,
+        shared: Optional[SharedCache] = None,
+        ttl: float = 30.0,
+        negative_ttl: float = 5.0,
+    ) -> None:
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # Búsquedas resueltas sin base (incluye negativas) y cargas desde la base
+        self.served = 0
+        self.negative_hits = 0
+        self.loads = 0
+
+    # ──────── Niveles ───────────────────────────────────────────────
+    async def _get(self, key: Hashable) -> Any:
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = await self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value, self.negative_ttl if value == NEGATIVE else self.ttl)
+        return value
+
+    async def _set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self.local.set(key, value, ttl)
+        if self.shared is not None:
+            await self.shared.set(key, value, ttl)
+
+    async def _delete(self, keys: List[Hashable]) -> None:
+        self.local.delete(*keys)
+        if self.shared is not None:
+            await self.shared.delete(keys)
+
+    # ──────── API ───────────────────────────────────────────────────
+    async def lookup(self, kind: str, value: Any) -> Tuple[bool, Optional[User]]:
+        """Devuelve ``(resuelto, usuario)``; resuelto=False obliga a ir a la base."""
+        cached = await self._get((kind, value))
+        if cached is None:
+            return False, None
+        if cached == NEGATIVE:
+            self.served += 1
+            self.negative_hits += 1
+            return True, None
+        if kind == "id":
+            self.served += 1
+            return True, replace(cached)
+
+        user = await self._get(("id", cached))
+        if user is None or user == NEGATIVE or _LOOKUP_KEYS[kind](user) != value:
+            return False, None
+        self.served += 1
+        return True, replace(user)
+
+    async def remember(self, kind: str, value: Any, user: Optional[User]) -> None:
+        if user is None:
+            await self._set((kind, value), NEGATIVE, self.negative_ttl)
+            return
+        await self._set(("id", user.id), replace(user), self.ttl)
+        await self._set(("email", User.normalize_email(user.email)), user.id, self.ttl)
+        if user.auth_id is not None:
+            await self._set(("auth", user.auth_id), user.id, self.ttl)
+
+    async def invalidate(self, user_id: UUID, *users: User) -> None:
+        """Olvida un usuario por sus tres claves, incluida la versión cacheada."""
+        keys: List[Hashable] = [("id", user_id)]
+        cached = self.local.peek(("id", user_id))
+        for user in (cached, *users):
+            if isinstance(user, User):
+                keys.append(("email", User.normalize_email(user.email)))
+                if user.auth_id is not None:
+                    keys.append(("auth", user.auth_id))
+        await self._delete(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        shared_stats = getattr(self.shared, "stats", None)
+        return {
+            "local": {**self.local.stats.as_dict(), "entries": len(self.local)},
+            "shared": shared_stats.as_dict() if shared_stats is not None else None,
+            "served": self.served,
+            "negative_hits": self.negative_hits,
+            "loads": self.loads,
+        }
+
+
+# Invalidaciones diferidas en curso (el loop solo guarda referencias débiles)
+_pending_invalidations: Set[asyncio.Task] = set()
+
+
+def _spawn(invalidate: Callable[[], Awaitable[None]]) -> None:
+    task = asyncio.get_running_loop().create_task(invalidate())
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
+
+
+@lru_cache()
+def get_user_cache() -> UserCache:
+    """Caché de usuarios del proceso, configurada desde Settings."""
+    settings = get_settings()
+    shared = InMemorySharedCache() if settings.USER_CACHE_SHARED_BACKEND == "memory" else None
+    return UserCache(
+        local=TTLCache(max_entries=settings.USER_CACHE_MAX_ENTRIES, default_ttl=settings.USER_CACHE_TTL),
+        shared=shared,
+        ttl=settings.USER_CACHE_TTL,
+        negative_ttl=settings.USER_CACHE_NEGATIVE_TTL,
+    )
+
+
+class CachedUserRepository(UserRepositoryInterface):
+    """Envuelve un repositorio y sirve get_by_id/email/auth_id desde caché."""
+
+    def __init__(
+        self,
+        inner: UserRepositoryInterface,
+        cache: UserCache,
+        uow: Optional[UnitOfWork] = None,
+        stale_window: float = 0.0,
+        serve_reads: bool = True,
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.uow = uow
+        # Con réplicas de lectura, el retraso de replicación asumido
+        self.stale_window = stale_window
+        # False: lee siempre de ``inner`` (el primario, cuando la caché la
+        # llenan las réplicas) pero sigue invalidando lo que escribe
+        self.serve_reads = serve_reads
+
+    async def _invalidate(self, user_id: UUID, *users: User) -> None:
+        await self.cache.invalidate(user_id, *users)
+        if self.uow is not None:
+            # Una lectura concurrente pudo recachear la versión previa antes del COMMIT
+            self.uow.after_commit(lambda: self._invalidate_after_commit(user_id, users))
+
+    async def _invalidate_after_commit(self, user_id: UUID, users: Tuple[User, ...]) -> None:
+        await self.cache.invalidate(user_id, *users)
+        if self.stale_window > 0:
+            # ...y una réplica con retraso puede hacerlo también después del COMMIT
+            loop = asyncio.get_running_loop()
+            loop.call_later(self.stale_window, _spawn, lambda: self.cache.invalidate(user_id, *users))
+
+    # ──────── Lectura ───────────────────────────────────────────────
+    async def _read_through(self, kind: str, value: Any, load) -> Optional[User]:
+        if not self.serve_reads:
+            return await load(value)
+        resolved, user = await self.cache.lookup(kind, value)
+        if resolved:
+            return user
+        user = await load(value)
+        self.cache.loads += 1
+        await self.cache.remember(kind, value, user)
+        return user
+
+    async def _read_through_many(self, kind: str, values: Iterable[Any], load_many) -> List[User]:
+        """Sirve de la caché lo que pueda y carga el resto en una sola consulta."""
+        if not self.serve_reads:
+            return await load_many(values)
+        found: Dict[Any, User] = {}
+        misses: List[Any] = []
+        for value in dict.fromkeys(values):
+            resolved, user = await self.cache.lookup(kind, value)
+            if not resolved:
+                misses.append(value)
+            elif user is not None:
+                found[value] = user
+        if misses:
+            key_of = _LOOKUP_KEYS[kind]
+            loaded = {key_of(user): user for user in await load_many(misses)}
+            self.cache.loads += 1
+            for value in misses:
+                user = loaded.get(value)
+                await self.cache.remember(kind, value, user)
+                if user is not None:
+                    found[value] = user
+        return list(found.values())
+
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        return await self._read_through("id", user_id, self.inner.get_by_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._read_through("email", User.normalize_email(email), self.inner.get_by_email)
+
+    async def get_by_auth_id(self, auth_id: UUID) -> Optional[User]:
+        return await self._read_through("auth", auth_id, self.inner.get_by_auth_id)
+
+    async def get_by_ids(self, user_ids: Iterable[UUID]) -> List[User]:
+        return await self._read_through_many("id", user_ids, self.inner.get_by_ids)
+
+    async def get_by_emails(self, emails: Iterable[str]) -> List[User]:
+        return await self._read_through_many(
+            "email", (User.normalize_email(email) for email in emails), self.inner.get_by_emails
+        )
+
+    async def get_by_auth_ids(self, auth_ids: Iterable[UUID]) -> List[User]:
+        return await self._read_through_many("auth", auth_ids, self.inner.get_by_auth_ids)
+
+    # ──────── Escritura ─────────────────────────────────────────────
+    async def create(self, user: User) -> User:
+        created = await self.inner.create(user)
+        await self._invalidate(created.id, created)
+        return created
+
+    async def bulk_create(self, users: List[User], chunk_size: int) -> List[Optional[str]]:
+        outcome = await self.inner.bulk_create(users, chunk_size)
+        for user, error in zip(users, outcome):
+            if error is None:
+                await self._invalidate(user.id, user)
+        return outcome
+
+    async def update(self, user: User) -> User:
+        updated = await self.inner.update(user)
+        await self._invalidate(user.id, user)
+        return updated
+
+    async def update_fields(self, user_id: UUID, changes: Dict[str, Any]) -> Optional[User]:
+        updated = await self.inner.update_fields(user_id, changes)
+        if updated is None:
+            await self._invalidate(user_id)
+        else:
+            await self._invalidate(user_id, updated)
+        return updated
+
+    async def delete(self, user_id: UUID) -> bool:
+        deleted = await self.inner.delete(user_id)
+        await self._invalidate(user_id)
+        return deleted
+
+    # ──────── Sin caché ─────────────────────────────────────────────
+    async def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        return await self.inner.get_existing_emails(emails)
+
+    async def get_existing_auth_ids(self, auth_ids: Iterable[UUID]) -> Set[UUID]:
+        return await self.inner.get_existing_auth_ids(auth_ids)
+
+    # El hash no forma parte de la entidad cacheada: no hay nada que invalidar
+    async def get_password_hash(self, user_id: UUID) -> Optional[str]:
+        return await self.inner.get_password_hash(user_id)
+
+    async def set_password_hash(
+        self, user_id: UUID, password_hash: str, expected: Optional[str] = None
+    ) -> bool:
+        return await self.inner.set_password_hash(user_id, password_hash, expected)
+
+    async def get_users_by_role(self, role_id: UUID) -> List[User]:
+        return await self.inner.get_users_by_role(role_id)
+
+    async def get_users_by_area(self, area_id: UUID) -> List[User]:
+        return await self.inner.get_users_by_area(area_id)
+
+    async def list_users(self, limit: int, **filters: Any) -> List[User]:
+        return await self.inner.list_users(limit, **filters)
+
+    # El rol y el área pueden cambiar sin pasar por este repositorio
+    async def get_detail_by_id(self, user_id: UUID) -> Optional[UserDetail]:
+        return await self.inner.get_detail_by_id(user_id)
+
+    async def list_user_details(self, limit: int, **filters: Any) -> List[UserDetail]:
+        return await self.inner.list_user_details(limit, **filters)
+
+    async def search(self, text_query: str, limit: int, **kwargs: Any) -> List[Tuple[User, float]]:
+        return await self.inner.search(text_query, limit, **kwargs)
+
+    def stream_rows(self, chunk_size: int, **filters: Any) -> AsyncIterator[List[Tuple[Any, ...]]]:
+        return self.inner.stream_rows(chunk_size, **filters)
@@ -0,0 +1,33 @@
+# app/modules/users/infrastructure/email_notifier.py
+"""
+Avisos a usuarios por correo a través de ``EmailService``.
+
+Solo encola: si la cola está llena el aviso se pierde y se registra, pero
+el alta del usuario (ya confirmada) no falla por ello.
+"""
+
+import logging
+from typing import Any
+
+from app.modules.users.domain.user import User
+from app.modules.users.interfaces.user_notifier import UserNotifier
+from app.services.email_service import EmailQueueFullError, EmailService
+
+logger = logging.getLogger(__name__)
+
+
+class EmailUserNotifier(UserNotifier):
+    def __init__(self, emails: EmailService) -> None:
+        self.emails = emails
+
+    def user_created(self, user: User) -> None:
+        self._enqueue(user, "user_created", email=user.email)
+
+    def recovery_code(self, user: User, code: str) -> None:
+        self._enqueue(user, "password_recovery", code=code)
+
+    def _enqueue(self, user: User, template: str, **context: Any) -> None:
+        try:
+            self.emails.enqueue(user.email, template, names=user.names, **context)
+        except EmailQueueFullError:
+            logger.warning("Aviso %s a %s descartado: cola de correo llena", template, user.email)
@@ -0,0 +1,51 @@
+"""
+Serializadores por lotes para la exportación de usuarios.
+
+Trabajan sobre las tuplas crudas de ``UserRepository.stream_rows`` (en el
+orden de ``EXPORT_FIELDS``) y producen un bloque de texto por lote, sin
+instanciar modelos ORM ni Pydantic por fila.
+"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, List, Tuple
+from uuid import UUID
+
+from app.modules.users.infrastructure.repository import EXPORT_FIELDS
+
+_UUID_POSITIONS = tuple(
+    i for i, name in enumerate(EXPORT_FIELDS) if name in ("id", "auth_id", "role_id", "area_id")
+)
+
+
+def _plain(row: Tuple[Any, ...]) -> List[Any]:
+    """Convierte los UUID de la fila a texto (None se mantiene)."""
+    values = list(row)
+    for i in _UUID_POSITIONS:
+        if isinstance(values[i], UUID):
+            values[i] = str(values[i])
+    return values
+
+
+async def ndjson_chunks(partitions: AsyncIterator[List[Tuple[Any, ...]]]) -> AsyncIterator[bytes]:
+    dumps = json.dumps
+    async for rows in partitions:
+        lines = [dumps(dict(zip(EXPORT_FIELDS, _plain(row))), ensure_ascii=False) for row in rows]
+        lines.append("")
+        yield "\n".join(lines).encode()
+
+
+async def csv_chunks(partitions: AsyncIterator[List[Tuple[Any, ...]]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # La cabecera sale sola para que el primer byte no espere a la base
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode()
+
+    async for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)  # csv ya escribe UUID con str() y None vacío
+        yield buffer.getvalue().encode()
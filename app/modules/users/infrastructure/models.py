@@ -1,6 +1,6 @@
 from typing import List, Optional
 from uuid import UUID as PyUUID
-from sqlalchemy import ARRAY, Column, String, ForeignKey
+from sqlalchemy import ARRAY, Column, String, ForeignKey, Index, func, literal_column
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import uuid
@@ -34,7 +34,34 @@ class User(Base):
     role_id: Mapped[Optional[PyUUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("user_role.id"), nullable=True)
     area_id: Mapped[Optional[PyUUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("user_area.id"), nullable=True)
     card_id: Mapped[Optional[PyUUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("user_area.id"), nullable=True)
+    # Hash de passlib (migración f1c7a3e9b2d4); fuera de la entidad User
+    password_hash: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
     # Relaciones
     role: Mapped["Role"] = relationship(foreign_keys=[role_id], uselist=False)
     area: Mapped["Area"] = relationship(foreign_keys=[area_id], uselist=False)
+
+    # Índices de las búsquedas del repositorio (migración 9d4b2e61a7c3)
+    __table_args__ = (
+        Index("ix_user_user_auth_id", "auth_id", unique=True),
+        Index("ix_user_user_role_id_id", "role_id", "id"),
+        Index("ix_user_user_area_id_id", "area_id", "id"),
+        # Un email por usuario sin distinguir mayúsculas (migración e6a2d8f4c1b9)
+        Index("ix_user_user_email_lower", func.lower(email), unique=True),
+        # Filtro por prefijo de email (migración a8d3e5f7c2b1)
+        Index(
+            "ix_user_user_email_lower_pattern",
+            func.lower(email).label("email_lower"),
+            postgresql_ops={"email_lower": "text_pattern_ops"},
+        ),
+        # Búsqueda aproximada (migración b3f7c9d1e4a6)
+        Index(
+            "ix_user_user_search_trgm",
+            (
+                names.column + literal_column("' '") + lastnames.column
+                + literal_column("' '") + email.column
+            ).label("search_document"),
+            postgresql_using="gist",
+            postgresql_ops={"search_document": "gist_trgm_ops"},
+        ),
+    )
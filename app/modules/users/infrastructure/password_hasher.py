@@ -0,0 +1,32 @@
+# app/modules/users/infrastructure/password_hasher.py
+"""
+``PasswordHasher`` sobre ``SecurityUtils`` (passlib, pool de hashing acotado).
+
+SecurityUtils (y con él passlib, PyJWT y el contexto de hash) se importa y
+se construye la primera vez que un caso de uso toca una contraseña, no al
+importar los routers ni en cada solicitud.
+"""
+
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from app.modules.users.interfaces.password_hasher import PasswordHasher
+
+if TYPE_CHECKING:
+    from app.core.security import SecurityUtils
+
+
+def _security_utils() -> "SecurityUtils":
+    from app.core.security import get_security_utils
+
+    return get_security_utils()
+
+
+class SecurityPasswordHasher(PasswordHasher):
+    def __init__(self, security: Callable[[], "SecurityUtils"] = _security_utils) -> None:
+        self.security = security
+
+    async def hash(self, password: str) -> str:
+        return await self.security().hash_password_async(password)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        return await self.security().verify_and_update_password_async(password, password_hash)
@@ -0,0 +1,202 @@
+"""
+Caché en memoria de roles y áreas (tablas de referencia pequeñas).
+
+Se carga completa al arrancar y se sustituye de una vez en cada recarga, así
+que las consultas (por ID, y los permisos de cada rol como frozenset
+precalculado) son O(1) y nunca van a la base ni ven una carga a medias.
+
+Cada worker mantiene su copia al día con ``ReferenceChangeListener``: una
+conexión asyncpg dedicada hace LISTEN en el canal que notifican los
+triggers de user_role/user_area (migración 5c1e8a7d2f90). Por si se pierde
+alguna notificación (reconexión, trigger desactivado) también recarga cada
+``poll_interval`` segundos y tras cada reconexión.
+"""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.modules.users.domain.area import Area
+from app.modules.users.domain.role import Role
+from app.modules.users.infrastructure.models import Area as AreaModel
+from app.modules.users.infrastructure.models import Role as RoleModel
+from app.modules.users.interfaces.reference_lookup import ReferenceLookup
+
+logger = logging.getLogger(__name__)
+
+_NO_PERMISSIONS: FrozenSet[str] = frozenset()
+
+
+class _Snapshot(NamedTuple):
+    roles: Dict[UUID, Role]
+    areas: Dict[UUID, Area]
+    permissions: Dict[UUID, FrozenSet[str]]
+
+
+class ReferenceCache(ReferenceLookup):
+    def __init__(self) -> None:
+        self._snapshot: Optional[_Snapshot] = None
+        self.loads = 0
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    async def load(self, session: AsyncSession) -> None:
+        """Lee ambas tablas y reemplaza la instantánea completa."""
+        roles = {
+            row.id: Role(row.id, row.nombre, list(row.permissions or []))
+            for row in await session.execute(
+                select(RoleModel.id, RoleModel.nombre, RoleModel.permissions)
+            )
+        }
+        areas = {
+            row.id: Area(row.id, row.nombre, row.color)
+            for row in await session.execute(
+                select(AreaModel.id, AreaModel.nombre, AreaModel.color)
+            )
+        }
+        permissions = {role_id: frozenset(role.permissions) for role_id, role in roles.items()}
+        self._snapshot = _Snapshot(roles, areas, permissions)
+        self.loads += 1
+        self.loaded_at = time.time()
+
+    def get_role(self, role_id: Optional[UUID]) -> Optional[Role]:
+        return self._snapshot.roles.get(role_id) if self._snapshot else None
+
+    def get_area(self, area_id: Optional[UUID]) -> Optional[Area]:
+        return self._snapshot.areas.get(area_id) if self._snapshot else None
+
+    def permissions_for(self, role_id: Optional[UUID]) -> FrozenSet[str]:
+        if self._snapshot is None:
+            return _NO_PERMISSIONS
+        return self._snapshot.permissions.get(role_id, _NO_PERMISSIONS)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "ready": snapshot is not None,
+            "roles": len(snapshot.roles) if snapshot else 0,
+            "areas": len(snapshot.areas) if snapshot else 0,
+            "loads": self.loads,
+            "loaded_at": self.loaded_at,
+        }
+
+
+@lru_cache()
+def get_reference_cache() -> ReferenceCache:
+    """Caché de roles y áreas del proceso."""
+    return ReferenceCache()
+
+
+class ReferenceChangeListener:
+    """Mantiene una ReferenceCache al día con LISTEN/NOTIFY y recarga periódica."""
+
+    def __init__(
+        self,
+        cache: ReferenceCache,
+        session_factory: Callable[[], AsyncSession],
+        dsn: str,
+        channel: str,
+        poll_interval: float,
+        debounce: float = 0.2,
+    ) -> None:
+        self.cache = cache
+        self.session_factory = session_factory
+        self.dsn = dsn
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.notifications = 0
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        # Primero LISTEN y después la única carga inicial, antes de servir:
+        # así no se pierde ningún cambio entre ambas. Si la base no responde
+        # se arranca igual y los casos de uso resuelven rol y área con un JOIN
+        connection = await self._listen()
+        await self.refresh()
+        self._task = asyncio.create_task(self._run(connection), name="reference-cache-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> None:
+        # La carga ya incluye lo notificado hasta ahora: no hace falta repetirla
+        self._changed.clear()
+        try:
+            async with self.session_factory() as session:
+                await self.cache.load(session)
+        except Exception:
+            logger.warning("No se pudo recargar la caché de roles y áreas", exc_info=True)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.notifications += 1
+        self._changed.set()
+
+    def _on_terminate(self, connection) -> None:
+        self._changed.set()
+
+    async def _listen(self) -> Optional[Any]:
+        """Conexión asyncpg dedicada (fuera del pool de SQLAlchemy) con LISTEN activo."""
+        import asyncpg
+
+        connection = None
+        try:
+            connection = await asyncpg.connect(self.dsn)
+            connection.add_termination_listener(self._on_terminate)
+            await connection.add_listener(self.channel, self._on_notify)
+        except Exception:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+            return None
+        return connection
+
+    async def _run(self, connection: Optional[Any]) -> None:
+        # connection: la que abrió start(), ya escuchando y con la carga hecha
+        backoff = 1.0
+        while True:
+            if connection is None:
+                connection = await self._listen()
+                if connection is None:
+                    logger.warning("LISTEN %s: sin conexión, reintento en %.0fs", self.channel, backoff)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 60.0)
+                    continue
+                backoff = 1.0
+                # Lo que cambió mientras no escuchábamos
+                await self.refresh()
+
+            try:
+                while not connection.is_closed():
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=self.poll_interval)
+                        # Agrupa las notificaciones de una misma ráfaga en una recarga
+                        await asyncio.sleep(self.debounce)
+                    except asyncio.TimeoutError:
+                        pass
+                    if connection.is_closed():
+                        break  # recarga al reconectar, ya escuchando
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("LISTEN %s interrumpido", self.channel, exc_info=True)
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+                connection = None
@@ -1,35 +1,170 @@
 """
 Repositorio concreto para la entidad User usando SQLAlchemy async.
-Convierte explícitamente entre el modelo ORM (UserModel) y la entidad
-de dominio pura (User) para mantener aisladas las capas.
+Las consultas seleccionan columnas (no instancias de UserModel) y las filas
+se convierten directamente en la entidad de dominio pura (User): sin
+identity map ni estado ORM por fila, y las capas siguen aisladas.
+
+No hace COMMIT: la transacción la gestiona la UnitOfWork del caso de uso.
 """
 
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, NoReturn, Optional, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy import delete, update
+from asyncpg.exceptions import ForeignKeyViolationError, UniqueViolationError
+from sqlalchemy import (
+    ARRAY, REAL, Boolean, String, any_, bindparam, delete, func, literal_column, tuple_, union, update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql.elements import Grouping
 
-from app.modules.users.domain.user import User
+from app.modules.users.domain.exceptions import (
+    DuplicateAuthIdError,
+    DuplicateEmailError,
+    InvalidReferenceError,
+)
+from app.modules.users.domain.area import Area
+from app.modules.users.domain.role import Role
+from app.modules.users.domain.user import User, UserDetail
+from app.modules.users.infrastructure.models import Area as AreaModel
+from app.modules.users.infrastructure.models import Role as RoleModel
 from app.modules.users.infrastructure.models import User as UserModel
 from app.modules.users.interfaces.user_repository import UserRepositoryInterface
 
 
+# Columnas (y orden) de las filas que entrega ``stream_rows``
+EXPORT_FIELDS = ("id", "auth_id", "names", "lastnames", "email", "role_id", "area_id")
+
+
+# Columnas de la entidad, en el orden de los campos de User
+_USER_COLUMNS = (
+    UserModel.id,
+    UserModel.names,
+    UserModel.lastnames,
+    UserModel.email,
+    UserModel.role_id,
+    UserModel.area_id,
+    UserModel.auth_id,
+)
+_USER_FIELDS = tuple(column.key for column in _USER_COLUMNS)
+
+# Destino de ON CONFLICT de las altas: el índice único de lower(email), que
+# también cubre los emails antiguos guardados con mayúsculas
+_EMAIL_CONFLICT_TARGET = [func.lower(UserModel.email)]
+
+# Vista ampliada: usuario + rol + área en una sola fila (LEFT JOIN)
+_DETAIL_COLUMNS = (
+    *_USER_COLUMNS,
+    RoleModel.id, RoleModel.nombre, RoleModel.permissions,
+    AreaModel.id, AreaModel.nombre, AreaModel.color,
+)
+
+# Documento de la búsqueda aproximada; el mismo texto que indexa
+# ix_user_user_search_trgm (migración b3f7c9d1e4a6)
+_SEARCH_DOCUMENT = Grouping(
+    UserModel.names + literal_column("' '") + UserModel.lastnames
+    + literal_column("' '") + UserModel.email
+)
+
+
+# Restricciones de user_user (nombres por defecto de Postgres) cuya violación
+# es un error del cliente y no del servidor
+_EMAIL_CONSTRAINTS = frozenset({"user_user_email_key", "ix_user_user_email_lower"})
+_AUTH_ID_CONSTRAINT = "ix_user_user_auth_id"
+_REFERENCE_CONSTRAINTS = {
+    "user_user_role_id_fkey": "El rol no existe",
+    "user_user_area_id_fkey": "El área no existe",
+}
+
+
 # ───────────────────────────── Helpers ──────────────────────────────
-def _model_to_entity(model: UserModel) -> User:
-    """Convierte un modelo SQLAlchemy en una entidad de dominio."""
-    return User(
-        id=model.id,
-        names=model.names,
-        lastnames=model.lastnames,
-        email=model.email,
-        role_id=model.role_id,
-        area_id=model.area_id,
-        auth_id=model.auth_id,
+def _entity_values(user: User) -> Dict[str, Any]:
+    """Valores de columna de la entidad (User usa __slots__: no tiene __dict__)."""
+    return {name: getattr(user, name) for name in _USER_FIELDS}
+
+
+def _row_to_entity(row) -> User:
+    """Construye la entidad desde una fila con las columnas de ``_USER_COLUMNS``."""
+    return User(*row)
+
+
+def _row_to_detail(row) -> UserDetail:
+    """Construye la vista ampliada desde una fila con las columnas de ``_DETAIL_COLUMNS``."""
+    role_id, role_name, permissions, area_id, area_name, color = row[7:]
+    return UserDetail(
+        *row[:7],
+        role=Role(role_id, role_name, permissions or []) if role_id is not None else None,
+        area=Area(area_id, area_name, color) if area_id is not None else None,
     )
 
 
+def _detail_select():
+    return (
+        select(*_DETAIL_COLUMNS)
+        .outerjoin(RoleModel, RoleModel.id == UserModel.role_id)
+        .outerjoin(AreaModel, AreaModel.id == UserModel.area_id)
+    )
+
+
+def _list_filters(
+    query,
+    after_id: Optional[UUID],
+    role_id: Optional[UUID],
+    area_id: Optional[UUID],
+    email_prefix: Optional[str],
+    search: Optional[str],
+):
+    """Aplica los filtros y el keyset por ID comunes a los listados."""
+    if after_id is not None:
+        query = query.where(UserModel.id > after_id)
+    if role_id is not None:
+        query = query.where(UserModel.role_id == role_id)
+    if area_id is not None:
+        query = query.where(UserModel.area_id == area_id)
+    if email_prefix:
+        # Misma expresión que ix_user_user_email_lower_pattern (text_pattern_ops)
+        query = query.where(func.lower(UserModel.email).like(
+            f"{_escape_like(User.normalize_email(email_prefix))}%", escape="\\"
+        ))
+    if search:
+        # Sobre _SEARCH_DOCUMENT para usar el índice trigram (GiST)
+        query = query.where(
+            _SEARCH_DOCUMENT.ilike(f"%{_escape_like(search)}%", escape="\\")
+        )
+    return query
+
+
+def _domain_error(exc: IntegrityError) -> Optional[ValueError]:
+    """
+    Error de dominio de una violación de restricción, según la excepción de
+    asyncpg y el nombre de la restricción (no el texto del mensaje). None si
+    no es una violación que el cliente pueda corregir.
+    """
+    cause = exc.orig.__cause__ if exc.orig is not None else None
+    constraint = getattr(cause, "constraint_name", None)
+    if isinstance(cause, UniqueViolationError) and constraint in _EMAIL_CONSTRAINTS:
+        return DuplicateEmailError("El email ya está en uso por otro usuario")
+    if isinstance(cause, UniqueViolationError) and constraint == _AUTH_ID_CONSTRAINT:
+        return DuplicateAuthIdError("Ya existe un usuario con este auth_id")
+    if isinstance(cause, ForeignKeyViolationError) and constraint in _REFERENCE_CONSTRAINTS:
+        return InvalidReferenceError(_REFERENCE_CONSTRAINTS[constraint])
+    return None
+
+
+def _raise_domain_error(exc: IntegrityError) -> NoReturn:
+    error = _domain_error(exc)
+    if error is None:
+        raise exc
+    raise error from exc
+
+
+def _escape_like(value: str) -> str:
+    """Escapa los comodines de LIKE para buscar el texto literal."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 # ─────────────────────────── Repositorio ────────────────────────────
 class UserRepository(UserRepositoryInterface):
     """Implementación de UserRepositoryInterface con SQLAlchemy (async)."""
@@ -40,58 +175,267 @@ class UserRepository(UserRepositoryInterface):
     # ──────── Lectura ───────────────────────────────────────────────
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         result = await self.db.execute(
-            select(UserModel).where(UserModel.id == user_id)
+            select(*_USER_COLUMNS).where(UserModel.id == user_id)
         )
-        model = result.scalars().first()
-        return _model_to_entity(model) if model else None
+        row = result.first()
+        return _row_to_entity(row) if row else None
+
+    async def get_detail_by_id(self, user_id: UUID) -> Optional[UserDetail]:
+        result = await self.db.execute(
+            _detail_select().where(UserModel.id == user_id)
+        )
+        row = result.first()
+        return _row_to_detail(row) if row else None
 
     async def get_by_email(self, email: str) -> Optional[User]:
+        # Sin distinguir mayúsculas: usa el índice ix_user_user_email_lower
         result = await self.db.execute(
-            select(UserModel).where(UserModel.email == email)
+            select(*_USER_COLUMNS).where(func.lower(UserModel.email) == User.normalize_email(email))
         )
-        model = result.scalars().first()
-        return _model_to_entity(model) if model else None
+        row = result.first()
+        return _row_to_entity(row) if row else None
 
     async def get_by_auth_id(self, auth_id: UUID) -> Optional[User]:
         result = await self.db.execute(
-            select(UserModel).where(UserModel.auth_id == auth_id)
+            select(*_USER_COLUMNS).where(UserModel.auth_id == auth_id)
+        )
+        row = result.first()
+        return _row_to_entity(row) if row else None
+
+    # Búsquedas por lotes: un único parámetro array con ``= ANY(...)``, sea
+    # cual sea el número de claves (mismo plan por índice que la unitaria)
+    async def get_by_ids(self, user_ids: Iterable[UUID]) -> List[User]:
+        result = await self.db.execute(
+            select(*_USER_COLUMNS).where(
+                UserModel.id == any_(bindparam("user_ids", list(user_ids), type_=ARRAY(UserModel.id.type)))
+            )
+        )
+        return [_row_to_entity(row) for row in result]
+
+    async def get_by_emails(self, emails: Iterable[str]) -> List[User]:
+        normalized = list({User.normalize_email(email) for email in emails})
+        result = await self.db.execute(
+            select(*_USER_COLUMNS).where(
+                func.lower(UserModel.email) == any_(bindparam("emails", normalized, type_=ARRAY(String)))
+            )
         )
-        model = result.scalars().first()
-        return _model_to_entity(model) if model else None
+        return [_row_to_entity(row) for row in result]
+
+    async def get_by_auth_ids(self, auth_ids: Iterable[UUID]) -> List[User]:
+        result = await self.db.execute(
+            select(*_USER_COLUMNS).where(
+                UserModel.auth_id == any_(bindparam("auth_ids", list(auth_ids), type_=ARRAY(UserModel.auth_id.type)))
+            )
+        )
+        return [_row_to_entity(row) for row in result]
 
     # ──────── Escritura ─────────────────────────────────────────────
     async def create(self, user: User) -> User:
-        model = UserModel(**user.__dict__)
-        self.db.add(model)
-        await self.db.commit()
-        await self.db.refresh(model)
-        return _model_to_entity(model)
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING: sin SELECT previo ni refresh
+        try:
+            result = await self.db.execute(
+                pg_insert(UserModel)
+                .values(**_entity_values(user))
+                .on_conflict_do_nothing(index_elements=_EMAIL_CONFLICT_TARGET)
+                .returning(*_USER_COLUMNS)
+            )
+        except IntegrityError as exc:
+            _raise_domain_error(exc)
+        row = result.first()
+        if row is None:
+            raise DuplicateEmailError("Ya existe un usuario con este email")
+        return _row_to_entity(row)
 
-    async def update(self, user: User) -> User:
-        await self.db.execute(
-            update(UserModel)
-            .where(UserModel.id == user.id)
-            .values(**user.__dict__)
+    async def bulk_create(self, users: List[User], chunk_size: int) -> List[Optional[str]]:
+        outcome: List[Optional[str]] = [None] * len(users)
+        for start in range(0, len(users), chunk_size):
+            chunk = users[start:start + chunk_size]
+            try:
+                async with self.db.begin_nested():
+                    inserted = await self._insert_ignoring_duplicates(chunk)
+            except IntegrityError:
+                # Alguna fila del bloque rompe una FK o repite un auth_id: se aísla fila a fila
+                inserted = set()
+                for offset, user in enumerate(chunk):
+                    try:
+                        async with self.db.begin_nested():
+                            inserted |= await self._insert_ignoring_duplicates([user])
+                    except IntegrityError as exc:
+                        error = _domain_error(exc)
+                        if error is None:
+                            raise
+                        outcome[start + offset] = str(error)
+
+            for offset, user in enumerate(chunk):
+                if outcome[start + offset] is None and user.email not in inserted:
+                    outcome[start + offset] = "Ya existe un usuario con este email"
+
+        return outcome
+
+    async def _insert_ignoring_duplicates(self, users: List[User]) -> Set[str]:
+        """INSERT multi-fila; los emails ya registrados se omiten sin error."""
+        result = await self.db.execute(
+            pg_insert(UserModel)
+            .values([_entity_values(user) for user in users])
+            .on_conflict_do_nothing(index_elements=_EMAIL_CONFLICT_TARGET)
+            .returning(UserModel.email)
         )
-        await self.db.commit()
-        return await self.get_by_id(user.id)
+        return set(result.scalars().all())
+
+    async def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        emails = list({User.normalize_email(email) for email in emails})
+        if not emails:
+            return set()
+        # Un único parámetro de tipo array: evita el límite de parámetros de IN (...).
+        # Devuelve los emails normalizados; usa ix_user_user_email_lower
+        result = await self.db.execute(
+            select(func.lower(UserModel.email)).where(
+                func.lower(UserModel.email) == any_(bindparam("emails", emails, type_=ARRAY(String)))
+            )
+        )
+        return set(result.scalars().all())
+
+    async def get_existing_auth_ids(self, auth_ids: Iterable[UUID]) -> Set[UUID]:
+        auth_ids = list(set(auth_ids))
+        if not auth_ids:
+            return set()
+        result = await self.db.execute(
+            select(UserModel.auth_id).where(
+                UserModel.auth_id == any_(bindparam("auth_ids", auth_ids, type_=ARRAY(UserModel.auth_id.type)))
+            )
+        )
+        return set(result.scalars().all())
+
+    async def update(self, user: User) -> User:
+        return await self.update_fields(user.id, _entity_values(user))
+
+    async def update_fields(self, user_id: UUID, changes: Dict[str, Any]) -> Optional[User]:
+        try:
+            result = await self.db.execute(
+                update(UserModel)
+                .where(UserModel.id == user_id)
+                .values(**changes)
+                .returning(*_USER_COLUMNS)
+            )
+        except IntegrityError as exc:
+            _raise_domain_error(exc)
+        row = result.first()
+        return _row_to_entity(row) if row else None
 
     async def delete(self, user_id: UUID) -> bool:
         result = await self.db.execute(
             delete(UserModel).where(UserModel.id == user_id)
         )
-        await self.db.commit()
+        return result.rowcount > 0
+
+    # ──────── Contraseña ────────────────────────────────────────────
+    async def get_password_hash(self, user_id: UUID) -> Optional[str]:
+        result = await self.db.execute(
+            select(UserModel.password_hash).where(UserModel.id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def set_password_hash(
+        self, user_id: UUID, password_hash: str, expected: Optional[str] = None
+    ) -> bool:
+        statement = update(UserModel).where(UserModel.id == user_id)
+        if expected is not None:
+            statement = statement.where(UserModel.password_hash == expected)
+        result = await self.db.execute(statement.values(password_hash=password_hash))
         return result.rowcount > 0
 
     # ──────── Listados ──────────────────────────────────────────────
     async def get_users_by_role(self, role_id: UUID) -> List[User]:
         result = await self.db.execute(
-            select(UserModel).where(UserModel.role_id == role_id)
+            select(*_USER_COLUMNS).where(UserModel.role_id == role_id)
         )
-        return [_model_to_entity(m) for m in result.scalars().all()]
+        return [_row_to_entity(row) for row in result]
 
     async def get_users_by_area(self, area_id: UUID) -> List[User]:
         result = await self.db.execute(
-            select(UserModel).where(UserModel.area_id == area_id)
+            select(*_USER_COLUMNS).where(UserModel.area_id == area_id)
+        )
+        return [_row_to_entity(row) for row in result]
+
+    async def list_users(
+        self,
+        limit: int,
+        after_id: Optional[UUID] = None,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+        email_prefix: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[User]:
+        query = _list_filters(
+            select(*_USER_COLUMNS), after_id, role_id, area_id, email_prefix, search
+        )
+        result = await self.db.execute(query.order_by(UserModel.id).limit(limit))
+        return [_row_to_entity(row) for row in result]
+
+    async def list_user_details(
+        self,
+        limit: int,
+        after_id: Optional[UUID] = None,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+        email_prefix: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[UserDetail]:
+        query = _list_filters(
+            _detail_select(), after_id, role_id, area_id, email_prefix, search
+        )
+        result = await self.db.execute(query.order_by(UserModel.id).limit(limit))
+        return [_row_to_detail(row) for row in result]
+
+    # ──────── Búsqueda ──────────────────────────────────────────────
+    async def search(
+        self,
+        text_query: str,
+        limit: int,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[Tuple[User, float]]:
+        query_param = bindparam("search_query", text_query, type_=String)
+        # 1 - word_similarity: 0 si el texto aparece tal cual en el documento
+        distance = _SEARCH_DOCUMENT.op("<->>", return_type=REAL)(query_param)
+        if after is not None:
+            after_key = tuple_(
+                bindparam("after_distance", after[0], type_=REAL),
+                bindparam("after_id", after[1], type_=UserModel.id.type),
+            )
+
+        def ranked(condition):
+            # Cada rama es un recorrido del índice GiST ya ordenado por distancia
+            query = select(*_USER_COLUMNS, distance.label("distance")).where(condition)
+            if after is not None:
+                query = query.where(tuple_(distance, UserModel.id) > after_key)
+            return query.order_by(distance, UserModel.id).limit(limit)
+
+        candidates = union(
+            # Subcadena exacta sin distinguir mayúsculas
+            ranked(_SEARCH_DOCUMENT.ilike(f"%{_escape_like(text_query)}%", escape="\\")),
+            # Tolerante a erratas: word_similarity por encima del umbral de pg_trgm
+            ranked(_SEARCH_DOCUMENT.op("%>", return_type=Boolean)(query_param)),
+        ).subquery()
+        result = await self.db.execute(
+            select(candidates).order_by(candidates.c.distance, candidates.c.id).limit(limit)
+        )
+        return [(_row_to_entity(row[:7]), row.distance) for row in result]
+
+    # ──────── Exportación ───────────────────────────────────────────
+    async def stream_rows(
+        self,
+        chunk_size: int,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+    ) -> AsyncIterator[List[Tuple[Any, ...]]]:
+        query = select(*(getattr(UserModel, name) for name in EXPORT_FIELDS))
+        if role_id is not None:
+            query = query.where(UserModel.role_id == role_id)
+        if area_id is not None:
+            query = query.where(UserModel.area_id == area_id)
+
+        result = await self.db.stream(
+            query.order_by(UserModel.id).execution_options(yield_per=chunk_size)
         )
-        return [_model_to_entity(m) for m in result.scalars().all()]
+        async for partition in result.partitions():
+            yield partition
@@ -1,23 +1,114 @@
 # app/modules/users/router.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 from uuid import UUID
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_db
-from app.modules.users.interfaces.schemas import UserCreate, UserUpdate, UserResponse
+from app.core.executors import ExecutorSaturatedError
+from app.core.internal_access import require_internal_access
+from app.core.settings import Settings, get_settings
+from app.db.base import get_db, get_sessionmaker
+from app.db.replicas import get_read_db, get_replica_set
+from app.db.unit_of_work import UnitOfWork
+from app.modules.users.domain.exceptions import UserNotFoundError
+from app.modules.users.interfaces.schemas import (
+    BulkUserCreateResponse,
+    BulkUserError,
+    CredentialsVerify,
+    PasswordSet,
+    UserBatchResponse,
+    UserCreate,
+    UserDetailPageResponse,
+    UserDetailResponse,
+    UserPageResponse,
+    UserUpdate,
+    UserResponse,
+    UserSearchPageResponse,
+)
+from app.modules.users.infrastructure.cached_repository import CachedUserRepository, get_user_cache
+from app.modules.users.infrastructure.email_notifier import EmailUserNotifier
+from app.modules.users.infrastructure.exporters import csv_chunks, ndjson_chunks
+from app.modules.users.infrastructure.password_hasher import SecurityPasswordHasher
+from app.modules.users.infrastructure.reference_cache import get_reference_cache
 from app.modules.users.infrastructure.repository import UserRepository
+from app.modules.users.infrastructure.serializers import (
+    user_batch_serializer,
+    user_detail_page_serializer,
+    user_detail_serializer,
+    user_list_serializer,
+    user_page_serializer,
+    user_search_page_serializer,
+    user_serializer,
+)
+from app.modules.users.infrastructure.singleflight_repository import (
+    SingleFlightUserRepository,
+    get_user_flights,
+)
 from app.modules.users.application.user_service import UserService
+from app.services.email_service import get_email_service
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-# Dependencia para obtener repositorio
-def get_user_repository(db: AsyncSession = Depends(get_db)):
-    return UserRepository(db)
+# Dependencia para obtener la unidad de trabajo (misma sesión que el repositorio)
+def get_unit_of_work(db: AsyncSession = Depends(get_db)):
+    return UnitOfWork(db)
+
+def _decorate_repository(
+    repository: UserRepository,
+    db: AsyncSession,
+    session_factory,
+    uow: Optional[UnitOfWork],
+    settings: Settings,
+    target: str,
+):
+    if settings.USER_SINGLE_FLIGHT_ENABLED:
+        repository = SingleFlightUserRepository(
+            repository, db, get_user_flights(), session_factory, target
+        )
+    if settings.USER_CACHE_ENABLED:
+        replicated = bool(settings.DB_READ_REPLICA_URLS)
+        stale_window = settings.DB_READ_REPLICA_MAX_LAG if replicated else 0.0
+        # Con réplicas la caché se llena desde ellas y puede ir por detrás:
+        # las lecturas del primario (leer lo propio) no la consultan
+        serve_reads = target == "replica" or not replicated
+        return CachedUserRepository(repository, get_user_cache(), uow, stale_window, serve_reads)
+    return repository
+
+# Dependencia para obtener repositorio (primario: escrituras y lecturas que las preceden)
+def get_user_repository(
+    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    settings: Settings = Depends(get_settings),
+):
+    return _decorate_repository(UserRepository(db), db, get_sessionmaker(), uow, settings, "primary")
+
+# Repositorio de los casos de uso de solo lectura: una réplica si hay alguna sana
+def get_user_read_repository(
+    read_db: AsyncSession = Depends(get_read_db),
+    db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
+    settings: Settings = Depends(get_settings),
+):
+    if read_db is db:
+        return user_repo
+    return _decorate_repository(
+        UserRepository(read_db), read_db, get_replica_set().session, None, settings, "replica"
+    )
 
 # Dependencia para obtener servicio, inyectando repositorio
-def get_user_service(user_repo: UserRepository = Depends(get_user_repository)):
-    return UserService(user_repo)
+def get_user_service(
+    user_repo: UserRepository = Depends(get_user_repository),
+    read_repo: UserRepository = Depends(get_user_read_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    settings: Settings = Depends(get_settings),
+):
+    references = get_reference_cache() if settings.REFERENCE_CACHE_ENABLED else None
+    notifier = EmailUserNotifier(get_email_service()) if settings.EMAIL_ENABLED else None
+    passwords = SecurityPasswordHasher()
+    return UserService(user_repo, uow, references, notifier, read_repo, passwords)
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
@@ -27,7 +118,7 @@ async def create_user(
     # El servicio maneja la lógica
     try:
         user = await user_service.create_user(user_data)
-        return user
+        return user_serializer.response(user, status_code=status.HTTP_201_CREATED)
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
@@ -36,15 +127,235 @@ async def create_user(
         print("ERROR:", traceback.format_exc())
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/{user_id}", response_model=UserResponse)
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+
+def _parse_bulk_rows(body: bytes, content_type: str) -> List[Any]:
+    """Decodifica un array JSON o NDJSON (una fila por línea no vacía)."""
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        rows: List[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(None)  # se reporta como error de la fila
+        return rows
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError("El cuerpo no es JSON válido")
+    if not isinstance(payload, list):
+        raise ValueError("Se esperaba un array JSON de usuarios")
+    return payload
+
+
+def _validate_bulk_rows(raw_rows: List[Any]) -> Tuple[Dict[int, UserCreate], Dict[int, str]]:
+    valid: Dict[int, UserCreate] = {}
+    errors: Dict[int, str] = {}
+    for row, raw in enumerate(raw_rows):
+        if raw is None:
+            errors[row] = "Línea NDJSON inválida"
+            continue
+        try:
+            valid[row] = UserCreate.model_validate(raw)
+        except ValidationError as ve:
+            errors[row] = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                for err in ve.errors()
+            )
+    return valid, errors
+
+
+@router.post("/bulk", response_model=BulkUserCreateResponse)
+async def bulk_create_users(
+    request: Request,
+    user_service: UserService = Depends(get_user_service),
+    settings: Settings = Depends(get_settings),
+):
+    """Importa usuarios desde un array JSON o NDJSON (application/x-ndjson)."""
+    try:
+        raw_rows = _parse_bulk_rows(
+            await request.body(), request.headers.get("content-type", "")
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    if len(raw_rows) > settings.USERS_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.USERS_BULK_MAX_ROWS} usuarios por importación",
+        )
+
+    rows, errors = _validate_bulk_rows(raw_rows)
+    result = await user_service.bulk_create_users(
+        rows, chunk_size=settings.USERS_BULK_CHUNK_SIZE
+    )
+    errors.update(result.errors)
+
+    return BulkUserCreateResponse(
+        received=len(raw_rows),
+        created=result.created,
+        failed=len(errors),
+        errors=[
+            BulkUserError(
+                row=row,
+                email=rows[row].email if row in rows else None,
+                detail=detail,
+            )
+            for row, detail in sorted(errors.items())
+        ],
+    )
+
+@router.get("/export")
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    role_id: Optional[UUID] = None,
+    area_id: Optional[UUID] = None,
+    settings: Settings = Depends(get_settings),
+):
+    """Exporta usuarios en streaming (NDJSON o CSV) con memoria constante."""
+
+    async def body():
+        # Sesión propia: la de get_db se cierra antes de que termine el streaming.
+        # La exportación es solo lectura: va a una réplica si hay alguna sana
+        replicas = get_replica_set()
+        open_session = replicas.session if replicas is not None else get_sessionmaker()
+        async with open_session() as session:
+            user_service = UserService(UserRepository(session), UnitOfWork(session))
+            partitions = user_service.export_users(
+                settings.USERS_EXPORT_CHUNK_SIZE, role_id=role_id, area_id=area_id
+            )
+            serialize = csv_chunks if format == "csv" else ndjson_chunks
+            async for chunk in serialize(partitions):
+                yield chunk
+
+    if format == "csv":
+        return StreamingResponse(
+            body(),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="users.csv"'},
+        )
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+@router.get("/batch", response_model=UserBatchResponse)
+async def read_users_batch(
+    ids: List[UUID] = Query(..., description="IDs a resolver (?ids=...&ids=...)"),
+    user_service: UserService = Depends(get_user_service),
+    settings: Settings = Depends(get_settings),
+):
+    """Varios usuarios por ID en una sola consulta; los inexistentes van en ``missing``."""
+    if len(ids) > settings.USERS_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"No se pueden pedir más de {settings.USERS_BATCH_MAX_IDS} IDs",
+        )
+    return user_batch_serializer.response(await user_service.get_users_by_ids(ids))
+
+@router.get("/search", response_model=UserSearchPageResponse)
+async def search_users(
+    q: str = Query(..., min_length=3, description="Nombre, apellidos o email; admite erratas"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    limit: Optional[int] = Query(None, ge=1, description="Por defecto USERS_SEARCH_PAGE_SIZE; máximo USERS_PAGE_SIZE_MAX"),
+    user_service: UserService = Depends(get_user_service),
+    settings: Settings = Depends(get_settings),
+):
+    """Usuarios más parecidos a ``q``, del más al menos parecido."""
+    if limit is None:
+        limit = settings.USERS_SEARCH_PAGE_SIZE
+    elif limit > settings.USERS_PAGE_SIZE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"limit no puede superar {settings.USERS_PAGE_SIZE_MAX}",
+        )
+    try:
+        page = await user_service.search_users(q, limit=limit, cursor=cursor)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    return user_search_page_serializer.response(page)
+
+EXPAND_QUERY = Query(False, description="Incluye el rol y el área de cada usuario")
+
+@router.get("/", response_model=List[UserResponse], deprecated=True)
+async def read_users_by_role(
+    role_id: UUID,
+    user_service: UserService = Depends(get_user_service),
+):
+    """Todos los usuarios de un rol, sin paginar. Usa GET /users/page?role_id=..."""
+    return user_list_serializer.response(await user_service.get_users_by_role(role_id))
+
+# Verificar credenciales es un oráculo para fuerza bruta: solo para servicios
+# internos (p. ej. el de autenticación), con la clave interna
+@router.post(
+    "/credentials/verify",
+    response_model=UserResponse,
+    dependencies=[Depends(require_internal_access)],
+)
+async def verify_credentials(
+    credentials: CredentialsVerify,
+    user_service: UserService = Depends(get_user_service),
+):
+    try:
+        user = await user_service.verify_password(credentials.email, credentials.password)
+    except ExecutorSaturatedError:
+        raise HTTPException(status_code=503, detail="Password hashing busy")
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return user_serializer.response(user)
+
+@router.get("/page", response_model=Union[UserDetailPageResponse, UserPageResponse])
+async def list_users(
+    role_id: Optional[UUID] = None,
+    area_id: Optional[UUID] = None,
+    email_prefix: Optional[str] = Query(None, min_length=1),
+    q: Optional[str] = Query(None, min_length=1, description="Busca en nombres, apellidos y email"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    limit: Optional[int] = Query(None, ge=1, description="Por defecto USERS_PAGE_SIZE; máximo USERS_PAGE_SIZE_MAX"),
+    expand: bool = EXPAND_QUERY,
+    user_service: UserService = Depends(get_user_service),
+    settings: Settings = Depends(get_settings),
+):
+    """Página de usuarios con filtros combinables; ``next_cursor`` pide la siguiente."""
+    if limit is None:
+        limit = settings.USERS_PAGE_SIZE
+    elif limit > settings.USERS_PAGE_SIZE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"limit no puede superar {settings.USERS_PAGE_SIZE_MAX}",
+        )
+    try:
+        page = await user_service.list_users(
+            limit=limit,
+            cursor=cursor,
+            role_id=role_id,
+            area_id=area_id,
+            email_prefix=email_prefix,
+            search=q,
+            expand=expand,
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    if expand:
+        return user_detail_page_serializer.response(page)
+    return user_page_serializer.response(page)
+
+@router.get("/{user_id}", response_model=Union[UserDetailResponse, UserResponse])
 async def read_user(
     user_id: UUID,
+    expand: bool = EXPAND_QUERY,
     user_service: UserService = Depends(get_user_service),
 ):
-    user = await user_service.get_user_by_id(user_id)
+    if expand:
+        user = await user_service.get_user_detail(user_id)
+        serializer = user_detail_serializer
+    else:
+        user = await user_service.get_user_by_id(user_id)
+        serializer = user_serializer
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return serializer.response(user)
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
@@ -52,24 +363,37 @@ async def update_user(
     user_data: UserUpdate,
     user_service: UserService = Depends(get_user_service),
 ):
-    updated_user = await user_service.update_user(user_id, user_data)
-    if not updated_user:
+    try:
+        user = await user_service.update_user(user_id, user_data)
+    except UserNotFoundError:
         raise HTTPException(status_code=404, detail="User not found")
-    return updated_user
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    return user_serializer.response(user)
 
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(
+@router.put(
+    "/{user_id}/password",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_internal_access)],
+)
+async def set_user_password(
     user_id: UUID,
+    password_data: PasswordSet,
     user_service: UserService = Depends(get_user_service),
 ):
-    deleted = await user_service.delete_user(user_id)
-    if not deleted:
+    try:
+        await user_service.set_password(user_id, password_data.password)
+    except UserNotFoundError:
         raise HTTPException(status_code=404, detail="User not found")
+    except ExecutorSaturatedError:
+        raise HTTPException(status_code=503, detail="Password hashing busy")
 
-@router.get("/", response_model=List[UserResponse])
-async def read_users_by_role(
-    role_id: UUID,
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(
+    user_id: UUID,
     user_service: UserService = Depends(get_user_service),
 ):
-    users = await user_service.get_users_by_role(role_id)
-    return users
\ No newline at end of file
+    try:
+        await user_service.delete_user(user_id)
+    except UserNotFoundError:
+        raise HTTPException(status_code=404, detail="User not found")
@@ -0,0 +1,49 @@
+"""
+Serializadores precompilados de las respuestas de usuarios.
+
+Convierten las entidades de dominio (y ``UserPage``) directamente a bytes
+JSON con la misma forma que ``UserResponse`` / ``UserPageResponse``, que
+siguen documentando el contrato en OpenAPI y se validan solo en DEBUG.
+"""
+
+from typing import List
+
+from app.core.responses import JsonSerializer
+from app.modules.users.application.user_service import (
+    UserBatch,
+    UserDetailPage,
+    UserPage,
+    UserSearchPage,
+)
+from app.modules.users.domain.user import User, UserDetail
+from app.modules.users.interfaces.schemas import (
+    UserBatchResponse,
+    UserDetailPageResponse,
+    UserDetailResponse,
+    UserPageResponse,
+    UserResponse,
+    UserSearchPageResponse,
+)
+
+user_serializer = JsonSerializer(User, UserResponse)
+# Lista sin envoltorio (GET /users/, obsoleto): no hay modelo que validar en DEBUG
+user_list_serializer = JsonSerializer(List[User])
+user_page_serializer = JsonSerializer(UserPage, UserPageResponse)
+user_detail_serializer = JsonSerializer(UserDetail, UserDetailResponse)
+user_detail_page_serializer = JsonSerializer(UserDetailPage, UserDetailPageResponse)
+user_batch_serializer = JsonSerializer(UserBatch, UserBatchResponse)
+user_search_page_serializer = JsonSerializer(UserSearchPage, UserSearchPageResponse)
+
+
+def warm_up_serializers() -> None:
+    """Compila los serializadores antes de recibir tráfico."""
+    for serializer in (
+        user_serializer,
+        user_list_serializer,
+        user_page_serializer,
+        user_detail_serializer,
+        user_detail_page_serializer,
+        user_batch_serializer,
+        user_search_page_serializer,
+    ):
+        serializer.warm_up()
@@ -0,0 +1,132 @@
+"""
+Decorador single-flight para las búsquedas unitarias de usuarios.
+
+Cuando muchas solicitudes piden a la vez el mismo usuario, todas esperan una
+única consulta en curso (ver ``app.shared.singleflight``). Esa consulta se
+ejecuta en una sesión propia y breve, no en la de quien llegó primero: si
+esa solicitud termina o se cancela, las demás siguen esperando un resultado
+válido. Las sesiones de las solicitudes deduplicadas no llegan a pedir
+conexión al pool, así que una avalancha sobre un mismo usuario ocupa una
+conexión en lugar de una por solicitud.
+
+Si la sesión de la solicitud ya tiene una transacción abierta, la lectura se
+hace en ella: podría depender de escrituras aún sin confirmar.
+
+La clave incluye el destino (``primary`` o ``replica``): una lectura que
+debe ver el primario nunca se une a una búsqueda en curso en una réplica.
+"""
+
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.users.domain.user import User, UserDetail
+from app.modules.users.infrastructure.repository import UserRepository
+from app.modules.users.interfaces.user_repository import UserRepositoryInterface
+from app.shared.singleflight import SingleFlight
+
+
+@lru_cache()
+def get_user_flights() -> SingleFlight:
+    """Búsquedas de usuarios en curso del proceso."""
+    return SingleFlight()
+
+
+class SingleFlightUserRepository(UserRepositoryInterface):
+    """Envuelve el repositorio de la solicitud y comparte las búsquedas en curso."""
+
+    def __init__(
+        self,
+        inner: UserRepositoryInterface,
+        db: AsyncSession,
+        flights: SingleFlight,
+        session_factory: Callable[[], AsyncSession],
+        target: str = "primary",
+    ) -> None:
+        self.inner = inner
+        self.db = db
+        self.flights = flights
+        self.session_factory = session_factory
+        self.target = target
+
+    # ──────── Lectura compartida ────────────────────────────────────
+    async def _shared(self, method: str, value: Any) -> Any:
+        if self.db.in_transaction():
+            return await getattr(self.inner, method)(value)
+        key: Hashable = (self.target, method, value)
+        return await self.flights.do(key, lambda: self._load(method, value))
+
+    async def _load(self, method: str, value: Any) -> Any:
+        async with self.session_factory() as session:
+            return await getattr(UserRepository(session), method)(value)
+
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        return await self._shared("get_by_id", user_id)
+
+    async def get_detail_by_id(self, user_id: UUID) -> Optional[UserDetail]:
+        return await self._shared("get_detail_by_id", user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._shared("get_by_email", User.normalize_email(email))
+
+    async def get_by_auth_id(self, auth_id: UUID) -> Optional[User]:
+        return await self._shared("get_by_auth_id", auth_id)
+
+    # ──────── Sin deduplicar ────────────────────────────────────────
+    async def get_by_ids(self, user_ids: Iterable[UUID]) -> List[User]:
+        return await self.inner.get_by_ids(user_ids)
+
+    async def get_by_emails(self, emails: Iterable[str]) -> List[User]:
+        return await self.inner.get_by_emails(emails)
+
+    async def get_by_auth_ids(self, auth_ids: Iterable[UUID]) -> List[User]:
+        return await self.inner.get_by_auth_ids(auth_ids)
+
+    async def create(self, user: User) -> User:
+        return await self.inner.create(user)
+
+    async def bulk_create(self, users: List[User], chunk_size: int) -> List[Optional[str]]:
+        return await self.inner.bulk_create(users, chunk_size)
+
+    async def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        return await self.inner.get_existing_emails(emails)
+
+    async def get_existing_auth_ids(self, auth_ids: Iterable[UUID]) -> Set[UUID]:
+        return await self.inner.get_existing_auth_ids(auth_ids)
+
+    async def update(self, user: User) -> User:
+        return await self.inner.update(user)
+
+    async def update_fields(self, user_id: UUID, changes: Dict[str, Any]) -> Optional[User]:
+        return await self.inner.update_fields(user_id, changes)
+
+    async def delete(self, user_id: UUID) -> bool:
+        return await self.inner.delete(user_id)
+
+    async def get_password_hash(self, user_id: UUID) -> Optional[str]:
+        return await self.inner.get_password_hash(user_id)
+
+    async def set_password_hash(
+        self, user_id: UUID, password_hash: str, expected: Optional[str] = None
+    ) -> bool:
+        return await self.inner.set_password_hash(user_id, password_hash, expected)
+
+    async def get_users_by_role(self, role_id: UUID) -> List[User]:
+        return await self.inner.get_users_by_role(role_id)
+
+    async def get_users_by_area(self, area_id: UUID) -> List[User]:
+        return await self.inner.get_users_by_area(area_id)
+
+    async def list_users(self, limit: int, **filters: Any) -> List[User]:
+        return await self.inner.list_users(limit, **filters)
+
+    async def list_user_details(self, limit: int, **filters: Any) -> List[UserDetail]:
+        return await self.inner.list_user_details(limit, **filters)
+
+    async def search(self, text_query: str, limit: int, **kwargs: Any) -> List[Tuple[User, float]]:
+        return await self.inner.search(text_query, limit, **kwargs)
+
+    def stream_rows(self, chunk_size: int, **filters: Any) -> AsyncIterator[List[Tuple[Any, ...]]]:
+        return self.inner.stream_rows(chunk_size, **filters)
@@ -0,0 +1,24 @@
+# app/modules/users/interfaces/password_hasher.py
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+
+class PasswordHasher(ABC):
+    """
+    Hash de contraseñas para los casos de uso. Las implementaciones no
+    bloquean el event loop (el hash es CPU pura y tarda ~100 ms a propósito).
+    """
+
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        """Hash con el esquema y el coste activos"""
+        pass
+
+    @abstractmethod
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        (contraseña correcta, hash nuevo). El hash nuevo solo viene si la
+        contraseña es correcta y ``password_hash`` usa un esquema o un coste
+        anticuados; quien llama debe guardarlo.
+        """
+        pass
@@ -0,0 +1,38 @@
+# app/modules/users/interfaces/reference_lookup.py
+from abc import ABC, abstractmethod
+from typing import FrozenSet, Optional
+from uuid import UUID
+
+from app.modules.users.domain.area import Area
+from app.modules.users.domain.role import Role
+
+
+class ReferenceLookup(ABC):
+    """
+    Consulta de roles y áreas sin acceso a la base.
+    ``ready`` es False hasta la primera carga; mientras tanto los casos de
+    uso deben resolver rol y área por su cuenta.
+    """
+
+    @property
+    @abstractmethod
+    def ready(self) -> bool:
+        pass
+
+    @abstractmethod
+    def get_role(self, role_id: Optional[UUID]) -> Optional[Role]:
+        """Rol por ID, o None si no existe"""
+        pass
+
+    @abstractmethod
+    def get_area(self, area_id: Optional[UUID]) -> Optional[Area]:
+        """Área por ID, o None si no existe"""
+        pass
+
+    @abstractmethod
+    def permissions_for(self, role_id: Optional[UUID]) -> FrozenSet[str]:
+        """Permisos del rol (vacío si el rol no existe)"""
+        pass
+
+    def has_permission(self, role_id: Optional[UUID], permission: str) -> bool:
+        return permission in self.permissions_for(role_id)
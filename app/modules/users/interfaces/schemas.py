@@ -27,6 +27,15 @@ class UserUpdate(UserBase):
     pass
 
 
+class PasswordSet(BaseModel):
+    password: str
+
+
+class CredentialsVerify(BaseModel):
+    email: EmailStr
+    password: str
+
+
 class UserResponse(BaseModel):
     id: UUID
     names: str
@@ -40,6 +49,48 @@ class UserResponse(BaseModel):
         from_attributes = True  # ← permite .model_validate_from_orm
 
 
+class UserPageResponse(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+
+class UserBatchResponse(BaseModel):
+    items: List[UserResponse]
+    missing: List[UUID]
+
+
+class UserMatchResponse(UserResponse):
+    score: float
+
+
+class UserSearchPageResponse(BaseModel):
+    items: List[UserMatchResponse]
+    next_cursor: Optional[str] = None
+
+
+class UserDetailResponse(UserResponse):
+    role: Optional["RoleResponse"] = None
+    area: Optional["AreaResponse"] = None
+
+
+class UserDetailPageResponse(BaseModel):
+    items: List[UserDetailResponse]
+    next_cursor: Optional[str] = None
+
+
+class BulkUserError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    detail: str
+
+
+class BulkUserCreateResponse(BaseModel):
+    received: int
+    created: int
+    failed: int
+    errors: List[BulkUserError]
+
+
 class UserSchema(BaseModel):
     id: str
     names: str
@@ -92,3 +143,7 @@ class AreaResponse(AreaBase):
 
     class Config:
         from_attributes = True
+
+
+UserDetailResponse.model_rebuild()
+UserDetailPageResponse.model_rebuild()
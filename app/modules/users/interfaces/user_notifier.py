@@ -0,0 +1,20 @@
+# app/modules/users/interfaces/user_notifier.py
+from abc import ABC, abstractmethod
+
+from app.modules.users.domain.user import User
+
+
+class UserNotifier(ABC):
+    """
+    Avisos a los usuarios. Las implementaciones solo encolan: el caso de uso
+    no espera a la entrega ni falla si el aviso no se puede enviar.
+    """
+
+    @abstractmethod
+    def user_created(self, user: User) -> None:
+        pass
+
+    @abstractmethod
+    def recovery_code(self, user: User, code: str) -> None:
+        """Código de recuperación de contraseña (SecurityUtils.generate_recovery_code)"""
+        pass
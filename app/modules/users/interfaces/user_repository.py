@@ -1,9 +1,9 @@
 # app/modules/users/interfaces/user_repository.py
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, List, Set, Tuple
 from uuid import UUID
 
-from app.modules.users.domain.user import User
+from app.modules.users.domain.user import User, UserDetail
 
 class UserRepositoryInterface(ABC):
     """
@@ -17,6 +17,11 @@ class UserRepositoryInterface(ABC):
         """Obtiene un usuario por su ID"""
         pass
     
+    @abstractmethod
+    async def get_detail_by_id(self, user_id: UUID) -> Optional[UserDetail]:
+        """Obtiene un usuario con su rol y su área en una sola consulta"""
+        pass
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[User]:
         """Obtiene un usuario por su correo electrónico"""
@@ -27,19 +32,76 @@ class UserRepositoryInterface(ABC):
         """Obtiene un usuario por el ID de autenticación asociado"""
         pass
     
+    @abstractmethod
+    async def get_by_ids(self, user_ids: Iterable[UUID]) -> List[User]:
+        """Obtiene en una sola consulta los usuarios de ``user_ids`` que existan, sin orden"""
+        pass
+
+    @abstractmethod
+    async def get_by_emails(self, emails: Iterable[str]) -> List[User]:
+        """Como ``get_by_email`` para varios emails, en una sola consulta"""
+        pass
+
+    @abstractmethod
+    async def get_by_auth_ids(self, auth_ids: Iterable[UUID]) -> List[User]:
+        """Como ``get_by_auth_id`` para varios IDs de autenticación, en una sola consulta"""
+        pass
+
     @abstractmethod
     async def create(self, user: User) -> User:
-        """Crea un nuevo usuario"""
+        """Crea un nuevo usuario; lanza DuplicateEmailError si el email existe"""
+        pass
+    
+    @abstractmethod
+    async def bulk_create(self, users: List[User], chunk_size: int) -> List[Optional[str]]:
+        """
+        Inserta usuarios en bloques. Devuelve, alineado con ``users``,
+        None si la fila se insertó o el motivo por el que se descartó.
+        """
+        pass
+
+    @abstractmethod
+    async def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Devuelve cuáles de los emails indicados ya están registrados (normalizados, sin distinguir mayúsculas)"""
+        pass
+
+    @abstractmethod
+    async def get_existing_auth_ids(self, auth_ids: Iterable[UUID]) -> Set[UUID]:
+        """Devuelve cuáles de los auth_id indicados ya están registrados"""
         pass
     
     @abstractmethod
     async def update(self, user: User) -> User:
         """Actualiza un usuario existente"""
         pass
+
+    @abstractmethod
+    async def update_fields(self, user_id: UUID, changes: Dict[str, Any]) -> Optional[User]:
+        """
+        Aplica ``changes`` en una sola sentencia y devuelve el usuario
+        actualizado, o None si no existe. Lanza DuplicateEmailError si el
+        nuevo email ya pertenece a otro usuario.
+        """
+        pass
     
     @abstractmethod
     async def delete(self, user_id: UUID) -> bool:
-        """Elimina un usuario por su ID"""
+        """Elimina un usuario por su ID; devuelve False si no existía"""
+        pass
+
+    @abstractmethod
+    async def get_password_hash(self, user_id: UUID) -> Optional[str]:
+        """Hash de la contraseña del usuario, o None si no existe o no tiene"""
+        pass
+
+    @abstractmethod
+    async def set_password_hash(
+        self, user_id: UUID, password_hash: str, expected: Optional[str] = None
+    ) -> bool:
+        """
+        Guarda ``password_hash``; con ``expected`` solo si el hash actual es
+        ese (no pisa un cambio de contraseña concurrente). Devuelve si se guardó.
+        """
         pass
     
     @abstractmethod
@@ -50,4 +112,64 @@ class UserRepositoryInterface(ABC):
     @abstractmethod
     async def get_users_by_area(self, area_id: UUID) -> List[User]:
         """Lista usuarios que pertenecen a un área específica"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def list_users(
+        self,
+        limit: int,
+        after_id: Optional[UUID] = None,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+        email_prefix: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[User]:
+        """
+        Lista usuarios ordenados por ID con paginación keyset: devuelve
+        hasta ``limit`` usuarios con ID mayor que ``after_id``.
+        """
+        pass
+
+    @abstractmethod
+    async def list_user_details(
+        self,
+        limit: int,
+        after_id: Optional[UUID] = None,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+        email_prefix: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[UserDetail]:
+        """
+        Igual que ``list_users`` pero con el rol y el área de cada usuario,
+        en una sola consulta sea cual sea ``limit``.
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        text_query: str,
+        limit: int,
+        after: Optional[Tuple[float, UUID]] = None,
+    ) -> List[Tuple[User, float]]:
+        """
+        Búsqueda aproximada en nombres, apellidos y email: coincidencias por
+        subcadena (sin distinguir mayúsculas) o por similitud de trigramas.
+        Devuelve ``(usuario, distancia)`` ordenados por distancia e ID; 0 es
+        la mejor. ``after`` es la última ``(distancia, id)`` ya servida.
+        """
+        pass
+
+    @abstractmethod
+    def stream_rows(
+        self,
+        chunk_size: int,
+        role_id: Optional[UUID] = None,
+        area_id: Optional[UUID] = None,
+    ) -> AsyncIterator[List[Tuple[Any, ...]]]:
+        """
+        Recorre la tabla con un cursor de servidor y entrega lotes de tuplas
+        en el orden de ``EXPORT_FIELDS``, sin construir entidades.
+        """
+        pass
@@ -0,0 +1,318 @@
+# app/services/email_service.py
+"""
+Envío de correo en segundo plano.
+
+Los handlers llaman a ``EmailService.enqueue()``, que renderiza la plantilla
+y deja el mensaje en una cola acotada sin tocar la red. ``EMAIL_WORKERS``
+tareas sacan de la cola lotes de hasta ``EMAIL_BATCH_SIZE`` mensajes y los
+envían por una conexión del pool SMTP (con PIPELINING si el servidor lo
+anuncia, ver ``app.adapters.smtp.client``).
+
+Los fallos transitorios (4xx o conexión perdida) se reintentan con backoff
+exponencial y jitter hasta ``EMAIL_MAX_ATTEMPTS`` intentos; los permanentes
+(5xx) se descartan y se registran. Con la cola llena ``enqueue()`` lanza
+``EmailQueueFullError`` en lugar de acumular memoria sin límite.
+"""
+
+import asyncio
+import binascii
+import logging
+import random
+from dataclasses import dataclass
+from email.header import Header
+from email.utils import formatdate, make_msgid
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.adapters.smtp.client import Envelope, SmtpConnection, SmtpConnectionPool, SmtpError
+from app.adapters.smtp.sink import SmtpSink
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmailQueueFullError(RuntimeError):
+    """La cola de correo está llena; el mensaje no se ha encolado."""
+
+
+# ──────── Plantillas ────────────────────────────────────────────────
+# nombre -> (asunto, cuerpo en texto plano) con campos {campo}
+TEMPLATES: Dict[str, Tuple[str, str]] = {
+    "user_created": (
+        "Bienvenido/a, {names}",
+        "Hola {names}:\n\n"
+        "Se ha creado tu cuenta con el email {email}.\n\n"
+        "Si no has sido tú, responde a este mensaje.\n",
+    ),
+    "password_recovery": (
+        "Código para restablecer tu contraseña",
+        "Hola {names}:\n\n"
+        "Tu código para restablecer la contraseña es: {code}\n\n"
+        "Si no lo has pedido, ignora este mensaje.\n",
+    ),
+}
+
+
+class CompiledTemplate:
+    """Plantilla troceada una sola vez en literales y campos."""
+
+    __slots__ = ("parts", "fields")
+
+    def __init__(self, source: str) -> None:
+        self.parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if field is not None and (not field.isidentifier() or spec or conversion):
+                raise ValueError(f"Campo de plantilla no soportado: {{{field}}}")
+            self.parts.append((literal, field))
+        self.fields = frozenset(field for _, field in self.parts if field)
+
+    def render(self, context: Dict[str, Any]) -> str:
+        missing = self.fields - context.keys()
+        if missing:
+            raise ValueError(f"Faltan campos de la plantilla: {', '.join(sorted(missing))}")
+        return "".join(
+            literal + (str(context[field]) if field else "") for literal, field in self.parts
+        )
+
+
+class TemplateCache:
+    """Compila todas las plantillas al crearse; renderizar solo une trozos."""
+
+    def __init__(self, templates: Dict[str, Tuple[str, str]] = TEMPLATES) -> None:
+        self._compiled = {
+            name: (CompiledTemplate(subject), CompiledTemplate(body))
+            for name, (subject, body) in templates.items()
+        }
+
+    def render(self, name: str, context: Dict[str, Any]) -> Tuple[str, str]:
+        try:
+            subject, body = self._compiled[name]
+        except KeyError:
+            raise ValueError(f"Plantilla de correo desconocida: {name}")
+        return subject.render(context), body.render(context)
+
+
+# ──────── Mensajes ──────────────────────────────────────────────────
+def build_message(sender: str, to: str, subject: str, body: str) -> bytes:
+    """
+    Mensaje de texto plano UTF-8 listo para DATA. Se arma a mano en lugar de
+    con ``email.message.EmailMessage``, unas diez veces más lento, porque
+    corre en el event loop por cada mensaje.
+    """
+    # Los campos de las plantillas vienen del usuario: sin saltos de línea en cabeceras
+    subject = " ".join(subject.split())
+    if not subject.isascii():
+        subject = Header(subject, "utf-8").encode()
+    headers = (
+        f"From: {sender}\r\n"
+        f"To: {to}\r\n"
+        f"Subject: {subject}\r\n"
+        f"Date: {formatdate(usegmt=True)}\r\n"
+        f"Message-ID: {make_msgid(domain=sender.rpartition('@')[2] or 'localhost')}\r\n"
+        "MIME-Version: 1.0\r\n"
+        'Content-Type: text/plain; charset="utf-8"\r\n'
+        "Content-Transfer-Encoding: quoted-printable\r\n\r\n"
+    )
+    text = "".join(line + "\n" for line in body.splitlines())  # \r, \r\n y \n por igual
+    content = binascii.b2a_qp(text.encode("utf-8"), istext=True).replace(b"\n", b"\r\n")
+    return headers.encode("ascii", "replace") + content
+
+
+# ──────── Servicio ──────────────────────────────────────────────────
+@dataclass(slots=True)
+class OutgoingEmail:
+    to: str
+    template: str
+    subject: str
+    body: str
+    attempts: int = 0
+    data: Optional[bytes] = None  # MIME ya construido; se conserva entre reintentos
+
+
+class EmailService:
+    def __init__(
+        self,
+        pool: SmtpConnectionPool,
+        sender: str,
+        templates: Optional[TemplateCache] = None,
+        workers: int = 2,
+        queue_size: int = 1000,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        retry_base_delay: float = 2.0,
+        retry_max_delay: float = 300.0,
+    ) -> None:
+        self.pool = pool
+        self.sender = sender
+        self.templates = templates or TemplateCache()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.queue: "asyncio.Queue[OutgoingEmail]" = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Set[asyncio.Task] = set()
+
+        self.enqueued = 0
+        self.rejected = 0  # cola llena
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.batches = 0
+        self.batched = 0  # mensajes enviados en lotes, reintentos incluidos
+
+    def enqueue(self, to: str, template: str, **context: Any) -> None:
+        """Renderiza ``template`` y encola el mensaje; no espera al envío."""
+        subject, body = self.templates.render(template, context)
+        try:
+            self.queue.put_nowait(OutgoingEmail(to=to, template=template, subject=subject, body=body))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise EmailQueueFullError("La cola de correo está llena")
+        self.enqueued += 1
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._run_worker(), name=f"email-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float) -> None:
+        """Espera hasta ``timeout`` a que se vacíe la cola y cierra las conexiones."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Se paran los envíos con %d correos en cola", self.queue.qsize())
+        if self._retries:
+            logger.warning("Se abandonan %d correos pendientes de reintento", len(self._retries))
+        tasks, self._tasks = self._tasks + list(self._retries), []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.pool.close()
+
+    # ──────── Workers ───────────────────────────────────────────────
+    async def _run_worker(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._send_batch(batch)
+            except Exception:
+                logger.exception("Error inesperado enviando un lote de %d correos", len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _send_batch(self, batch: List[OutgoingEmail]) -> None:
+        self.batches += 1
+        self.batched += len(batch)
+        envelopes = [Envelope(self.sender, email.to, self._message_bytes(email)) for email in batch]
+        try:
+            async with self.pool.acquire() as connection:
+                results = await connection.send_many(envelopes)
+        except SmtpError as exc:
+            # No se pudo abrir la conexión: todo el lote corre la misma suerte
+            results = [exc] * len(batch)
+        for email, error in zip(batch, results):
+            if error is None:
+                self.sent += 1
+            else:
+                self._handle_failure(email, error)
+
+    def _message_bytes(self, email: OutgoingEmail) -> bytes:
+        if email.data is None:
+            email.data = build_message(self.sender, email.to, email.subject, email.body)
+        return email.data
+
+    def _handle_failure(self, email: OutgoingEmail, error: SmtpError) -> None:
+        email.attempts += 1
+        if not error.transient or email.attempts >= self.max_attempts:
+            self.failed += 1
+            logger.error(
+                "Correo %s a %s descartado tras %d intentos: %s",
+                email.template, email.to, email.attempts, error,
+            )
+            return
+
+        delay = min(self.retry_base_delay * 2 ** (email.attempts - 1), self.retry_max_delay)
+        delay *= random.uniform(0.5, 1.0)  # jitter: los reintentos de un lote no llegan juntos
+        self.retried += 1
+        logger.info(
+            "Reintento %d del correo %s a %s en %.1fs: %s",
+            email.attempts, email.template, email.to, delay, error,
+        )
+        task = asyncio.get_running_loop().create_task(self._retry_later(email, delay))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _retry_later(self, email: OutgoingEmail, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            self.queue.put_nowait(email)
+        except asyncio.QueueFull:
+            self.failed += 1
+            logger.error("Correo %s a %s descartado: cola llena al reintentar", email.template, email.to)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "workers": len(self._tasks),
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "pending_retries": len(self._retries),
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched / self.batches, 2) if self.batches else 0.0,
+            "pool": self.pool.stats(),
+        }
+
+
+@lru_cache()
+def get_smtp_sink() -> SmtpSink:
+    """Sumidero SMTP del proceso (EMAIL_SMTP_SINK); se arranca en el lifespan."""
+    return SmtpSink()
+
+
+@lru_cache()
+def get_email_service() -> EmailService:
+    """Servicio de correo del proceso; sus workers se arrancan en el lifespan."""
+    settings = get_settings()
+
+    async def connect() -> SmtpConnection:
+        if settings.EMAIL_SMTP_SINK:
+            host, port = get_smtp_sink().address
+            return await SmtpConnection.open(host, port, timeout=settings.EMAIL_SMTP_TIMEOUT)
+        return await SmtpConnection.open(
+            settings.EMAIL_SMTP_HOST,
+            settings.EMAIL_SMTP_PORT,
+            timeout=settings.EMAIL_SMTP_TIMEOUT,
+            starttls=settings.EMAIL_SMTP_STARTTLS,
+            username=settings.EMAIL_SMTP_USERNAME,
+            password=settings.EMAIL_SMTP_PASSWORD,
+        )
+
+    return EmailService(
+        SmtpConnectionPool(connect, size=settings.EMAIL_POOL_SIZE, max_idle=settings.EMAIL_POOL_MAX_IDLE),
+        sender=settings.EMAIL_FROM,
+        workers=settings.EMAIL_WORKERS,
+        queue_size=settings.EMAIL_QUEUE_SIZE,
+        batch_size=settings.EMAIL_BATCH_SIZE,
+        max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+        retry_base_delay=settings.EMAIL_RETRY_BASE_DELAY,
+        retry_max_delay=settings.EMAIL_RETRY_MAX_DELAY,
+    )
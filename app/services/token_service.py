@@ -0,0 +1,91 @@
+# app/services/token_service.py
+"""
+Emisión y verificación de tokens de acceso JWT autocontenidos.
+
+Los tokens llevan ``sub``, ``iat`` y ``exp`` y se firman con la clave activa
+(``TOKEN_ACTIVE_KID``); el ``kid`` viaja en la cabecera para poder rotar
+claves sin invalidar los tokens emitidos con las anteriores. Las
+verificaciones correctas se guardan en una LRU hasta que el token caduca,
+así un token repetido no vuelve a pagar la comprobación de firma.
+"""
+
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import jwt
+
+from app.core.settings import Settings, get_settings
+from app.shared.cache import TTLCache
+
+
+class TokenConfigurationError(RuntimeError):
+    """No hay una clave de firma utilizable en Settings."""
+
+
+class TokenService:
+    def __init__(self, settings: Settings) -> None:
+        self.keys: Dict[str, str] = dict(settings.TOKEN_SIGNING_KEYS)
+        self.active_kid = settings.TOKEN_ACTIVE_KID or next(iter(self.keys), None)
+        self.algorithm = settings.TOKEN_ALGORITHM
+        self.expires_in = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        self._verified = TTLCache(max_entries=settings.TOKEN_VERIFY_CACHE_SIZE, default_ttl=0)
+
+    def issue(
+        self,
+        subject: str,
+        claims: Optional[Dict[str, Any]] = None,
+        expires_in: Optional[timedelta] = None,
+    ) -> str:
+        """Firma un token para ``subject`` con la clave activa."""
+        if self.active_kid is None or self.active_kid not in self.keys:
+            raise TokenConfigurationError("TOKEN_ACTIVE_KID no corresponde a ninguna clave")
+
+        now = int(time.time())
+        payload = {
+            **(claims or {}),
+            "sub": str(subject),
+            "iat": now,
+            "exp": now + int((expires_in or self.expires_in).total_seconds()),
+        }
+        return jwt.encode(
+            payload,
+            self.keys[self.active_kid],
+            algorithm=self.algorithm,
+            headers={"kid": self.active_kid},
+        )
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Devuelve el payload si el token es válido y no ha caducado; si no, None."""
+        cached = self._verified.get(token)
+        if cached is not None:
+            return dict(cached)
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = self.keys.get(kid)
+            if key is None:
+                return None
+            payload = jwt.decode(
+                token,
+                key,
+                algorithms=[self.algorithm],
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.PyJWTError:
+            return None
+
+        ttl = payload["exp"] - time.time()
+        if ttl > 0:
+            self._verified.set(token, dict(payload), ttl)
+        return payload
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {**self._verified.stats.as_dict(), "entries": len(self._verified)}
+
+
+@lru_cache()
+def get_token_service() -> TokenService:
+    """Servicio de tokens del proceso (comparte la caché de verificaciones)."""
+    return TokenService(get_settings())
@@ -0,0 +1,130 @@
+# app/shared/cache.py
+"""
+Piezas de caché reutilizables.
+
+- ``TTLCache``: caché en proceso con expiración por entrada y desalojo LRU.
+- ``SharedCache``: contrato de un nivel compartido entre procesos (Redis,
+  memcached...). ``InMemorySharedCache`` lo implementa en memoria para
+  desarrollo y pruebas.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class CacheStats:
+    """Contadores de un nivel de caché."""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations", "invalidations")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class TTLCache:
+    """
+    Caché LRU acotada a ``max_entries`` con TTL por entrada.
+    No es segura entre hilos: está pensada para el event loop de un worker.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: float) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        """Lee sin tocar contadores ni el orden LRU."""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.default_ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SharedCache(ABC):
+    """Nivel de caché compartido entre workers."""
+
+    @abstractmethod
+    async def get(self, key: Hashable) -> Any:
+        """Devuelve el valor o None si no está"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Guarda un valor con expiración en segundos"""
+        pass
+
+    @abstractmethod
+    async def delete(self, keys: Iterable[Hashable]) -> None:
+        """Elimina las claves indicadas"""
+        pass
+
+
+class InMemorySharedCache(SharedCache):
+    """Sustituto local de un nivel compartido, para desarrollo y pruebas."""
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self._cache = TTLCache(max_entries=max_entries, default_ttl=0)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    async def get(self, key: Hashable) -> Any:
+        return self._cache.get(key)
+
+    async def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, keys: Iterable[Hashable]) -> None:
+        self._cache.delete(*keys)
@@ -0,0 +1,56 @@
+# app/shared/singleflight.py
+"""
+Deduplicación de llamadas concurrentes idénticas ("single-flight").
+
+``SingleFlight.do(key, fn)`` ejecuta ``fn()`` una sola vez por clave mientras
+esté en curso: las llamadas con la misma clave que llegan entretanto esperan
+ese mismo resultado (o excepción). No es una caché: en cuanto la llamada
+termina, la siguiente vuelve a ejecutar ``fn``.
+
+La llamada compartida corre en su propia tarea. Cancelar a quien la inició
+(p. ej. el cliente se desconecta) no la cancela para los demás, y cada
+llamador puede cancelarse por separado.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0  # llamadas servidas por una ejecución ajena
+        self.failures = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._flights.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.get_running_loop().create_task(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Marca la excepción como recuperada aunque todos los llamadores se cancelaran
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "dedup_ratio": round(self.deduplicated / self.calls, 4) if self.calls else 0.0,
+            "failures": self.failures,
+            "in_flight": len(self._flights),
+        }
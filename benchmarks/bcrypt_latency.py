@@ -0,0 +1,98 @@
+# benchmarks/bcrypt_latency.py
+"""
+Latencia de un endpoint ajeno (/ping) mientras hay tráfico de login.
+
+Compara dos variantes del mismo login dentro de un handler async:
+- ``sync``: SecurityUtils.verify_password en el event loop (bloquea).
+- ``async``: SecurityUtils.verify_password_async en el pool acotado.
+
+    python -m benchmarks.bcrypt_latency --logins 200 --login-concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("POSTGRES_DB", "bench")
+os.environ.setdefault("POSTGRES_USER", "bench")
+os.environ.setdefault("POSTGRES_PASSWORD", "bench")
+os.environ.setdefault("POSTGRES_HOST", "localhost")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.core.security import SecurityUtils  # noqa: E402
+from app.core.settings import get_settings  # noqa: E402
+
+
+def build_app(security: SecurityUtils, hashed: str) -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @bench_app.post("/login/sync")
+    async def login_sync():
+        return {"ok": security.verify_password("S3cret!pass", hashed)}
+
+    @bench_app.post("/login/async")
+    async def login_async():
+        return {"ok": await security.verify_password_async("S3cret!pass", hashed)}
+
+    return bench_app
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+
+async def run_mode(client: httpx.AsyncClient, mode: str, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+    latencies = []
+
+    async def login():
+        async with semaphore:
+            await client.post(f"/login/{mode}")
+
+    async def pinger():
+        # La latencia se mide desde que el ping debía salir: incluye el tiempo
+        # que el event loop tardó en volver a atenderlo
+        while not done.is_set():
+            scheduled = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            await client.get("/ping")
+            latencies.append(time.perf_counter() - scheduled)
+
+    ping_task = asyncio.create_task(pinger())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ping_task
+
+    print(f"{mode:>5}: {logins / elapsed:7.1f} logins/s  /ping n={len(latencies):5d} "
+          f"p50={statistics.median(latencies) * 1000:8.2f}ms p99={percentile(latencies, 0.99):8.2f}ms "
+          f"max={max(latencies) * 1000:8.2f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    security = SecurityUtils(get_settings())
+    hashed = security.hash_password("S3cret!pass")
+    transport = httpx.ASGITransport(app=build_app(security, hashed))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in ("sync", "async"):
+            await run_mode(client, mode, args.logins, args.login_concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+# benchmarks/bulk_import.py
+"""
+Compara el throughput de POST /users/bulk contra N POST /users/ individuales.
+
+Requiere la API levantada contra una base de pruebas y un rol/área existentes:
+
+    python -m benchmarks.bulk_import --base-url http://localhost:8000 \\
+        --role-id <uuid> --area-id <uuid> -n 5000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import httpx
+
+
+def build_users(n: int, role_id: str, area_id: str, tag: str):
+    return [
+        {
+            "names": f"Nombre {i}",
+            "lastnames": f"Apellido {i}",
+            "email": f"bench-{tag}-{i}@example.com",
+            "role_id": role_id,
+            "area_id": area_id,
+            "auth_id": str(uuid4()),
+        }
+        for i in range(n)
+    ]
+
+
+async def run_single(client: httpx.AsyncClient, users, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post(user):
+        async with semaphore:
+            response = await client.post("/users/", json=user)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(post(user) for user in users))
+    return time.perf_counter() - start
+
+
+async def run_bulk(client: httpx.AsyncClient, users) -> float:
+    body = "\n".join(json.dumps(user) for user in users)
+    start = time.perf_counter()
+    response = await client.post(
+        "/users/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    summary = response.json()
+    if summary["failed"]:
+        print(f"  bulk: {summary['failed']} filas con error, primera: {summary['errors'][0]}")
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--role-id", required=True)
+    parser.add_argument("--area-id", required=True)
+    parser.add_argument("-n", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    tag = uuid4().hex[:8]
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=600) as client:
+        single = await run_single(
+            client, build_users(args.n, args.role_id, args.area_id, f"{tag}s"), args.concurrency
+        )
+        bulk = await run_bulk(client, build_users(args.n, args.role_id, args.area_id, f"{tag}b"))
+
+    print(f"{args.n} usuarios")
+    print(f"  POST /users/ x{args.n}: {single:8.2f}s  {args.n / single:10.1f} usuarios/s")
+    print(f"  POST /users/bulk     : {bulk:8.2f}s  {args.n / bulk:10.1f} usuarios/s")
+    print(f"  speedup              : {single / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+# benchmarks/entity_memory.py
+"""
+Memoria y tiempo de construcción por usuario en listados grandes.
+
+Sin base compara la dataclass anterior (con ``__dict__``) con la actual
+(``slots=True``). Con ``--db`` compara además, contra la base configurada en
+.env, ``select(UserModel)`` + conversión con la consulta por columnas que
+usa el repositorio:
+
+    python -m benchmarks.entity_memory --users 100000
+    python -m benchmarks.entity_memory --db --limit 10000
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import gc
+import time
+import tracemalloc
+import uuid
+from typing import Callable, List, Tuple
+
+from app.modules.users.domain.user import User
+
+DictUser = dataclasses.make_dataclass(
+    "DictUser", [(f.name, f.type, f) for f in dataclasses.fields(User)]
+)
+
+
+def measure(build: Callable[[], List]) -> Tuple[float, float, int]:
+    """(bytes por objeto, µs por objeto, objetos) de construir la lista."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(items), elapsed / len(items) * 1e6, len(items)
+
+
+def in_memory(n: int) -> None:
+    role_id, area_id = uuid.uuid4(), uuid.uuid4()
+    rows = [
+        (uuid.uuid4(), f"Nombre{i}", f"Apellido{i}", f"user{i}@example.com", role_id, area_id, None)
+        for i in range(n)
+    ]
+    # Solo cuenta el objeto entidad: los valores de la fila ya existían
+    for name, cls in (("dataclass con __dict__", DictUser), ("dataclass slots=True", User)):
+        per_obj, per_us, _ = measure(lambda: [cls(*row) for row in rows])
+        print(f"{name:<28} {per_obj:8.1f} B/usuario  {per_us:6.3f} µs/usuario")
+
+
+async def from_database(limit: int) -> None:
+    from sqlalchemy import select
+
+    from app.db.base import get_sessionmaker
+    from app.modules.users.infrastructure.models import User as UserModel
+    from app.modules.users.infrastructure.repository import _USER_COLUMNS, _row_to_entity
+
+    async def orm_query():
+        async with get_sessionmaker()() as session:
+            result = await session.execute(select(UserModel).order_by(UserModel.id).limit(limit))
+            models = result.scalars().all()
+            return [
+                User(m.id, m.names, m.lastnames, m.email, m.role_id, m.area_id, m.auth_id)
+                for m in models
+            ], models
+
+    async def column_query():
+        async with get_sessionmaker()() as session:
+            result = await session.execute(select(*_USER_COLUMNS).order_by(UserModel.id).limit(limit))
+            return [_row_to_entity(row) for row in result], None
+
+    for name, query in (("select(UserModel)", orm_query), ("select(*columnas)", column_query)):
+        await query()  # calentamiento (conexión y caché de sentencias)
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        users, _ = await query()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        count = max(len(users), 1)
+        print(f"{name:<28} {peak / count:8.1f} B/usuario (pico)  "
+              f"{elapsed / count * 1e6:6.2f} µs/usuario  ({len(users)} filas)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--db", action="store_true", help="medir también contra la base")
+    parser.add_argument("--limit", type=int, default=10000)
+    args = parser.parse_args()
+
+    in_memory(args.users)
+    if args.db:
+        asyncio.run(from_database(args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/import_time.py
+"""
+Tiempo de importar un módulo en frío (``python -X importtime``).
+
+Lanza un intérprete nuevo por repetición, sin las variables POSTGRES_* del
+entorno (importar ``app.main`` no debe necesitarlas), y se queda con la
+repetición más rápida. Muestra los módulos más caros (tiempo acumulado) y
+el total:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module app.main --runs 5 --budget-ms 150
+
+Sale con código 1 si el total supera ``--budget-ms`` o si la importación falla.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# import time: self [us] | cumulative | imported package
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def run_once(module: str) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    """(acumulado de ``module`` en µs, {módulo: (propio, acumulado)})."""
+    env = {key: value for key, value in os.environ.items() if not key.startswith("POSTGRES_")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match is not None:
+            modules[match[3]] = (int(match[1]), int(match[2]))
+    # El arranque del intérprete (site, encodings) no cuenta: solo lo que cuelga de module
+    return modules[module][1], modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    try:
+        runs: List[Tuple[int, Dict[str, Tuple[int, int]]]] = [
+            run_once(args.module) for _ in range(args.runs)
+        ]
+    except RuntimeError as exc:
+        print(f"ERR importando {args.module}: {exc}")
+        return 1
+
+    total, modules = min(runs, key=lambda run: run[0])
+    ranked = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    print(f"{'módulo':<48} {'propio ms':>10} {'acum. ms':>10}")
+    for name, (own, cumulative) in ranked[: args.top]:
+        print(f"{name:<48} {own / 1000:10.1f} {cumulative / 1000:10.1f}")
+    total_ms = total / 1000
+    print(f"\n{args.module}: {total_ms:.1f} ms (mejor de {args.runs}, {len(modules)} módulos)")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"ERR supera el presupuesto de {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
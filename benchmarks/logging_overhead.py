@@ -0,0 +1,87 @@
+# benchmarks/logging_overhead.py
+"""
+Sobrecoste por solicitud de RequestLoggingMiddleware frente a no tener
+middleware. Llama a la app ASGI directamente (sin red ni cliente HTTP) y
+con el logging configurado como en producción (cola + listener):
+
+    python -m benchmarks.logging_overhead -n 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+os.environ.setdefault("POSTGRES_DB", "bench")
+os.environ.setdefault("POSTGRES_USER", "bench")
+os.environ.setdefault("POSTGRES_PASSWORD", "bench")
+os.environ.setdefault("POSTGRES_HOST", "localhost")
+
+from app.core.logging_config import configure_logging  # noqa: E402
+from app.core.settings import Settings  # noqa: E402
+from app.middlewares.logging import RequestLoggingMiddleware  # noqa: E402
+
+SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "query_string": b"",
+    "headers": [],
+}
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def per_request_us(app, n: int) -> float:
+    for _ in range(min(n, 1000)):  # calentamiento
+        await app(dict(SCOPE), receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=20000)
+    args = parser.parse_args()
+
+    listener = configure_logging(Settings(LOG_FORMAT="json"))
+    # El listener escribe a stdout; para medir el coste del handler lo
+    # redirigimos a un sumidero nulo
+    for handler in listener.handlers:
+        handler.setStream(open(os.devnull, "w"))
+
+    variants = {
+        "sin middleware": endpoint,
+        "middleware, 100% registrado": RequestLoggingMiddleware(endpoint, sample_rate=1.0),
+        "middleware, 10% muestreado": RequestLoggingMiddleware(endpoint, sample_rate=0.1),
+        "middleware, INFO desactivado": RequestLoggingMiddleware(
+            endpoint, logger=logging.getLogger("bench.silent")
+        ),
+    }
+    logging.getLogger("bench.silent").setLevel(logging.WARNING)
+
+    baseline = None
+    for name, app in variants.items():
+        cost = await per_request_us(app, args.n)
+        baseline = cost if baseline is None else baseline
+        print(f"{name:<30} {cost:8.2f} µs/solicitud  (+{cost - baseline:6.2f} µs)")
+    listener.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
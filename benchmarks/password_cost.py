@@ -0,0 +1,32 @@
+# benchmarks/password_cost.py
+"""
+Calibra el coste de hash para un tiempo objetivo en esta máquina y muestra
+el valor para PASSWORD_SCHEME_COSTS:
+
+    python -m benchmarks.password_cost --scheme bcrypt --target-ms 250
+"""
+
+import argparse
+import json
+import os
+
+os.environ.setdefault("POSTGRES_DB", "bench")
+os.environ.setdefault("POSTGRES_USER", "bench")
+os.environ.setdefault("POSTGRES_PASSWORD", "bench")
+os.environ.setdefault("POSTGRES_HOST", "localhost")
+
+from app.core.security import calibrate_rounds  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scheme", default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    rounds = calibrate_rounds(args.scheme, args.target_ms)
+    print(f"PASSWORD_SCHEME_COSTS='{json.dumps({args.scheme: {'rounds': rounds}})}'")
+
+
+if __name__ == "__main__":
+    main()
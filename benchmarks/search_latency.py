@@ -0,0 +1,135 @@
+# benchmarks/search_latency.py
+"""
+Latencia de GET /users/search sobre una tabla grande.
+
+Siembra ``--users`` usuarios con nombres realistas (la misma siembra
+incremental que users_load.py) y lanza contra la app en proceso (ASGI, sin
+red) tres tipos de búsqueda:
+
+- ``prefix``: lo que se lleva tecleado de «Nombre Apellido» (typeahead).
+- ``typo``: un apellido con una letra cambiada, quitada o duplicada.
+- ``email``: un fragmento del email, p. ej. ``load-1234``.
+
+    python -m benchmarks.search_latency --users 1M
+    python -m benchmarks.search_latency --temp-postgres --users 1M --budget-ms 20
+
+Muestra p50/p99 por tipo y en total. Sale con código 1 si el p99 total supera
+``--budget-ms`` o alguna búsqueda falla.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, List
+
+import httpx
+
+from app.main import create_app
+from tests._postgres import temp_postgres
+from benchmarks.users_load import FIRST_NAMES, LAST_NAMES, SIZES, parse_size, percentile, seed
+
+
+def prefix_term(rng: random.Random, users: int) -> str:
+    term = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return term[:rng.randint(3, len(term))]
+
+
+def typo_term(rng: random.Random, users: int) -> str:
+    word = list(rng.choice(LAST_NAMES).lower())
+    position = rng.randrange(1, len(word))
+    edit = rng.choice(("replace", "drop", "double"))
+    if edit == "replace":
+        word[position] = rng.choice(string.ascii_lowercase)
+    elif edit == "drop":
+        del word[position]
+    else:
+        word.insert(position, word[position])
+    return "".join(word)
+
+
+def email_term(rng: random.Random, users: int) -> str:
+    return f"load-{rng.randint(1, users)}"
+
+
+TERMS: Dict[str, Callable[[random.Random, int], str]] = {
+    "prefix": prefix_term,
+    "typo": typo_term,
+    "email": email_term,
+}
+
+
+async def measure(args: argparse.Namespace) -> int:
+    if not args.skip_seed:
+        await seed(args.users, args.roles, args.areas, args.batch)
+
+    rng = random.Random(args.seed)
+    latencies: Dict[str, List[float]] = {kind: [] for kind in TERMS}
+    errors = 0
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+
+            async def search(kind: str, q: str, record: bool) -> None:
+                nonlocal errors
+                start = time.perf_counter()
+                response = await client.get("/users/search", params={"q": q, "limit": args.limit})
+                elapsed = time.perf_counter() - start
+                if response.status_code != 200:
+                    errors += 1
+                elif record:
+                    latencies[kind].append(elapsed)
+
+            async def worker(count: int, record: bool) -> None:
+                for _ in range(count):
+                    kind = rng.choice(list(TERMS))
+                    await search(kind, TERMS[kind](rng, args.users), record)
+
+            per_worker = max(1, args.requests // args.concurrency)
+            # Calentamiento: caché de páginas del índice y conexiones del pool
+            await asyncio.gather(*(worker(max(1, per_worker // 10), False) for _ in range(args.concurrency)))
+            await asyncio.gather(*(worker(per_worker, True) for _ in range(args.concurrency)))
+
+    every = sorted(latency for values in latencies.values() for latency in values)
+    for kind, values in [*latencies.items(), ("total", every)]:
+        values.sort()
+        print(
+            f"{kind:<7} n={len(values):<6} p50 {percentile(values, 0.50) * 1000:7.2f} ms  "
+            f"p99 {percentile(values, 0.99) * 1000:7.2f} ms"
+        )
+    p99_ms = percentile(every, 0.99) * 1000
+    if errors:
+        print(f"ERR {errors} búsquedas fallidas")
+    if p99_ms > args.budget_ms:
+        print(f"ERR p99 {p99_ms:.2f} ms supera el presupuesto de {args.budget_ms} ms")
+    return 1 if errors or p99_ms > args.budget_ms else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=parse_size, default=SIZES["1m"], help="10k, 1M, 10M o un número")
+    parser.add_argument("--roles", type=int, default=100)
+    parser.add_argument("--areas", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=500_000, help="usuarios por INSERT de la siembra")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--temp-postgres", action="store_true", help="Postgres desechable en lugar de .env")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="p99 máximo admitido")
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        if args.temp_postgres:
+            os.environ.update(stack.enter_context(temp_postgres()))
+        return asyncio.run(measure(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
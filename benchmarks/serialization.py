@@ -0,0 +1,108 @@
+# benchmarks/serialization.py
+"""
+Coste de servir un listado de 10k usuarios por la app ASGI (sin red ni base):
+
+- ``orm + response_model``: instancias UserModel -> entidad User ->
+  validación en UserPageResponse -> ``json.dumps`` (el camino anterior).
+- ``filas + serializador``: tuplas -> User -> ``user_page_serializer``
+  (bytes directos desde pydantic-core, sin validar el modelo de respuesta).
+
+    python -m benchmarks.serialization --users 10000 -n 20
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+os.environ.setdefault("POSTGRES_DB", "bench")
+os.environ.setdefault("POSTGRES_USER", "bench")
+os.environ.setdefault("POSTGRES_PASSWORD", "bench")
+os.environ.setdefault("POSTGRES_HOST", "localhost")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.modules.users.application.user_service import UserPage  # noqa: E402
+from app.modules.users.domain.user import User  # noqa: E402
+from app.modules.users.infrastructure.models import User as UserModel  # noqa: E402
+from app.modules.users.infrastructure.serializers import user_page_serializer  # noqa: E402
+from app.modules.users.interfaces.schemas import UserPageResponse  # noqa: E402
+
+
+def make_rows(n: int):
+    role_id, area_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        (uuid.uuid4(), f"Nombre{i}", f"Apellido{i}", f"user{i}@example.com", role_id, area_id, uuid.uuid4())
+        for i in range(n)
+    ]
+
+
+def build_app(rows) -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/orm", response_model=UserPageResponse)
+    async def orm_path():
+        models = [
+            UserModel(id=r[0], names=r[1], lastnames=r[2], email=r[3], role_id=r[4], area_id=r[5], auth_id=r[6])
+            for r in rows
+        ]
+        items = [
+            User(
+                id=m.id, names=m.names, lastnames=m.lastnames, email=m.email,
+                role_id=m.role_id, area_id=m.area_id, auth_id=m.auth_id,
+            )
+            for m in models
+        ]
+        return UserPage(items=items, next_cursor=None)
+
+    @app.get("/rows")
+    async def rows_path():
+        return user_page_serializer.response(UserPage(items=[User(*r) for r in rows]))
+
+    return app
+
+
+async def per_request_ms(app, path: str, n: int) -> float:
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "headers": [],
+    }
+    body_size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal body_size
+        if message["type"] == "http.response.body":
+            body_size += len(message.get("body", b""))
+
+    await app(dict(scope), receive, send)  # calentamiento
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    elapsed = (time.perf_counter() - start) / n * 1000
+    print(f"  cuerpo: {body_size // (n + 1)} bytes")
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("-n", type=int, default=20)
+    args = parser.parse_args()
+
+    app = build_app(make_rows(args.users))
+    results = {}
+    for name, path in (("orm + response_model", "/orm"), ("filas + serializador", "/rows")):
+        print(name)
+        results[name] = await per_request_ms(app, path, args.n)
+    baseline = results["orm + response_model"]
+    for name, ms in results.items():
+        print(f"{name:<24} {ms:9.2f} ms/respuesta  (x{baseline / ms:4.1f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
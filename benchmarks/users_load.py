@@ -0,0 +1,569 @@
+# benchmarks/users_load.py
+"""
+Prueba de carga de los endpoints de /users contra un Postgres local.
+
+1. Siembra la base con ``--users`` usuarios (10k, 1M, 10M o un número)
+   repartidos entre ``--roles`` roles y ``--areas`` áreas. La siembra se
+   hace en el servidor (generate_series) por lotes y es incremental: volver
+   a ejecutar con el mismo tamaño no inserta nada.
+2. Recorre cada escenario (lecturas, listados con filtros y cursor, vista
+   ampliada, exportación y escrituras) con ``--concurrency`` clientes durante
+   ``--duration`` segundos, en proceso (ASGI, sin red) y/o contra workers
+   reales de uvicorn (``--workers``).
+3. Guarda throughput, p50/p99 y sentencias SQL por solicitud en ``--output``
+   (JSON) y, con ``--baseline``, lo compara con una ejecución anterior.
+
+    python -m benchmarks.users_load --users 10k --mode both
+    python -m benchmarks.users_load --users 1M --skip-seed --baseline base.json
+    python -m benchmarks.users_load --temp-postgres --users 10k --save-baseline base.json
+
+``--temp-postgres`` levanta un Postgres desechable (ver tests/_postgres.py) en
+lugar de usar la base de .env. Las sentencias por solicitud se cuentan en
+proceso con QueryCounter (una llamada tras otra de calentamiento), así que
+reflejan las cachés tal y como están configuradas.
+
+Sale con código 1 si, frente a la línea base, algún escenario pierde más de
+``--tolerance`` de throughput, sube su p99 en esa proporción o ejecuta más
+sentencias SQL.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import ExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import httpx
+from sqlalchemy import text
+
+from app.db.base import get_engine, get_sessionmaker
+from app.db.query_counter import QueryCounter
+from app.main import create_app
+from tests._postgres import free_port, temp_postgres
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# Usuarios sembrados: load-<g>@load.example.com con g = 1..N; los que crean
+# los escenarios de escritura usan otro dominio y se borran al terminar
+SEED_EMAIL_LIKE = "load-%@load.example.com"
+RUN_EMAIL_LIKE = "%@loadrun.example.com"
+
+# Nombres sembrados: combinaciones de estas listas (nombre y dos apellidos)
+# para que la búsqueda aproximada trabaje sobre texto parecido al real
+FIRST_NAMES = [
+    "Alejandro", "Ana", "Andrés", "Beatriz", "Carlos", "Carmen", "Daniel", "Diana",
+    "Eduardo", "Elena", "Fernando", "Francisca", "Gabriel", "Gloria", "Hugo", "Isabel",
+    "Javier", "Josefina", "Jorge", "Laura", "Lucía", "Manuel", "María", "Martín",
+    "Natalia", "Nicolás", "Óscar", "Patricia", "Pablo", "Raquel", "Ricardo", "Rosa",
+    "Santiago", "Sofía", "Teresa", "Tomás", "Valentina", "Verónica", "Víctor", "Ximena",
+]
+LAST_NAMES = [
+    "Álvarez", "Castillo", "Castro", "Cruz", "Delgado", "Díaz", "Domínguez", "Fernández",
+    "Flores", "García", "Gómez", "González", "Gutiérrez", "Hernández", "Herrera", "Jiménez",
+    "López", "Martín", "Martínez", "Medina", "Méndez", "Morales", "Moreno", "Muñoz",
+    "Navarro", "Núñez", "Ortega", "Ortiz", "Pérez", "Ramírez", "Ramos", "Reyes",
+    "Rodríguez", "Romero", "Rubio", "Ruiz", "Sánchez", "Suárez", "Torres", "Vargas",
+]
+
+# (método, ruta, kwargs de httpx) o None cuando el escenario se queda sin datos
+Request = Optional[Tuple[str, str, Dict[str, Any]]]
+
+
+def parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value.replace("_", ""))
+
+
+# ── Siembra ──────────────────────────────────────────────────────────────────
+
+
+async def seed_references(session, table: str, prefix: str, count: int) -> List[UUID]:
+    """Ids de ``count`` filas ``<prefix>-<n>`` de ``table``, creando las que falten."""
+    rows = await session.execute(
+        text(f"SELECT id FROM {table} WHERE nombre LIKE :like ORDER BY nombre"), {"like": f"{prefix}-%"}
+    )
+    ids = [row.id for row in rows]
+    if len(ids) < count:
+        missing = [uuid4() for _ in range(count - len(ids))]
+        names = [f"{prefix}-{n}" for n in range(len(ids), count)]
+        await session.execute(
+            text(f"INSERT INTO {table} (id, nombre) "
+                 "SELECT unnest(CAST(:ids AS uuid[])), unnest(CAST(:names AS text[]))"),
+            {"ids": missing, "names": names},
+        )
+        ids += missing
+    return ids[:count]
+
+
+async def seed(users: int, roles: int, areas: int, batch: int) -> None:
+    """Completa hasta ``users`` usuarios sembrados; no toca los existentes."""
+    async with get_sessionmaker()() as session:
+        role_ids = await seed_references(session, "user_role", "load-role", roles)
+        area_ids = await seed_references(session, "user_area", "load-area", areas)
+        await session.commit()
+        existing = (await session.execute(
+            text("SELECT count(*) FROM user_user WHERE email LIKE :like"), {"like": SEED_EMAIL_LIKE}
+        )).scalar_one()
+
+    if existing >= users:
+        print(f"siembra: {existing} usuarios ya presentes")
+        return
+
+    started = time.perf_counter()
+    for start in range(existing + 1, users + 1, batch):
+        stop = min(start + batch - 1, users)
+        async with get_sessionmaker()() as session:
+            await session.execute(
+                text("""
+                    INSERT INTO user_user (id, auth_id, names, lastnames, email, role_id, area_id)
+                    SELECT gen_random_uuid(), gen_random_uuid(),
+                           (CAST(:first AS text[]))[1 + g % CAST(:n_first AS int)],
+                           (CAST(:last AS text[]))[1 + g / CAST(:n_first AS int) % CAST(:n_last AS int)]
+                           || ' ' ||
+                           (CAST(:last AS text[]))[1 + g / CAST(:n_pairs AS int) % CAST(:n_last AS int)],
+                           'load-' || g || '@load.example.com',
+                           (CAST(:roles AS uuid[]))[1 + g % CAST(:n_roles AS int)],
+                           (CAST(:areas AS uuid[]))[1 + g % CAST(:n_areas AS int)]
+                    FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g
+                """),
+                {
+                    "roles": role_ids, "areas": area_ids, "n_roles": len(role_ids),
+                    "n_areas": len(area_ids), "start": start, "stop": stop,
+                    "first": FIRST_NAMES, "last": LAST_NAMES,
+                    "n_first": len(FIRST_NAMES), "n_last": len(LAST_NAMES),
+                    "n_pairs": len(FIRST_NAMES) * len(LAST_NAMES),
+                },
+            )
+            await session.commit()
+        print(f"siembra: {stop}/{users} ({time.perf_counter() - started:.0f}s)")
+
+    async with get_sessionmaker()() as session:
+        await session.execute(text("ANALYZE user_user"))
+        await session.commit()
+
+
+# ── Datos de los escenarios ──────────────────────────────────────────────────
+
+
+@dataclass
+class Fixtures:
+    users: int
+    ids: List[str]
+    role_ids: List[str]
+    area_ids: List[str]
+    cursors: List[str] = field(default_factory=list)
+    created: List[str] = field(default_factory=list)  # ids creados por POST, para PUT y DELETE
+    tag: str = field(default_factory=lambda: uuid4().hex[:8])
+
+
+async def load_fixtures(users: int, sample: int, rng: random.Random) -> Fixtures:
+    emails = [f"load-{rng.randint(1, users)}@load.example.com" for _ in range(sample)]
+    async with get_sessionmaker()() as session:
+        rows = (await session.execute(
+            text("SELECT id, role_id, area_id FROM user_user WHERE email = ANY(CAST(:emails AS text[]))"),
+            {"emails": emails},
+        )).all()
+    if not rows:
+        raise RuntimeError("No hay usuarios sembrados: ejecuta sin --skip-seed")
+    return Fixtures(
+        users=users,
+        ids=[str(row.id) for row in rows],
+        role_ids=sorted({str(row.role_id) for row in rows}),
+        area_ids=sorted({str(row.area_id) for row in rows}),
+    )
+
+
+async def collect_cursors(client: httpx.AsyncClient, fixtures: Fixtures, pages: int) -> None:
+    cursor = None
+    for _ in range(pages):
+        params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/users/page", params=params)
+        response.raise_for_status()
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+        fixtures.cursors.append(cursor)
+
+
+def user_payload(fixtures: Fixtures, rng: random.Random, n: str) -> Dict[str, Any]:
+    return {
+        "names": f"Carga {n}",
+        "lastnames": f"Apellido {n}",
+        "email": f"run-{fixtures.tag}-{n}@loadrun.example.com",
+        "role_id": rng.choice(fixtures.role_ids),
+        "area_id": rng.choice(fixtures.area_ids),
+        "auth_id": str(uuid4()),
+    }
+
+
+def search_term(rng: random.Random) -> str:
+    """Lo que teclea alguien en un buscador: nombre y un apellido, quizá a medias."""
+    term = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return term[:rng.randint(3, len(term))]
+
+
+# ── Escenarios ───────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[Fixtures, random.Random, int], Request]
+    status: int = 200
+    after: Optional[Callable[[Fixtures, httpx.Response], None]] = None
+    max_requests: Optional[int] = None
+    concurrency: Optional[int] = None  # tope propio (p. ej. la exportación)
+
+
+def _get(path: str, **params: Any) -> Request:
+    return "GET", path, {"params": params}
+
+
+def _record_created(fixtures: Fixtures, response: httpx.Response) -> None:
+    fixtures.created.append(response.json()["id"])
+
+
+def _bulk(fixtures: Fixtures, rng: random.Random, i: int) -> Request:
+    rows = (json.dumps(user_payload(fixtures, rng, f"b{i}-{n}")) for n in range(100))
+    return "POST", "/users/bulk", {
+        "content": "\n".join(rows),
+        "headers": {"Content-Type": "application/x-ndjson"},
+    }
+
+
+def _update(fixtures: Fixtures, rng: random.Random, i: int) -> Request:
+    if not fixtures.created:
+        return None
+    return "PUT", f"/users/{fixtures.created[i % len(fixtures.created)]}", {
+        "json": {k: v for k, v in user_payload(fixtures, rng, f"u{i}").items() if k != "auth_id"}
+    }
+
+
+def _delete(fixtures: Fixtures, rng: random.Random, i: int) -> Request:
+    if not fixtures.created:
+        return None
+    return "DELETE", f"/users/{fixtures.created.pop()}", {}
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("get_by_id", lambda f, r, i: _get(f"/users/{r.choice(f.ids)}")),
+    Scenario("get_by_id_expand", lambda f, r, i: _get(f"/users/{r.choice(f.ids)}", expand="true")),
+    Scenario("get_batch_50", lambda f, r, i: _get("/users/batch", ids=r.sample(f.ids, min(50, len(f.ids))))),
+    Scenario("get_missing", lambda f, r, i: _get(f"/users/{uuid4()}"), status=404),
+    Scenario("list_first_page", lambda f, r, i: _get("/users/page")),
+    Scenario("list_cursor", lambda f, r, i: _get("/users/page", cursor=r.choice(f.cursors)) if f.cursors else None),
+    Scenario("list_role", lambda f, r, i: _get("/users/page", role_id=r.choice(f.role_ids))),
+    Scenario("list_area_expand", lambda f, r, i: _get("/users/page", area_id=r.choice(f.area_ids), expand="true")),
+    Scenario("list_email_prefix", lambda f, r, i: _get("/users/page", email_prefix=f"load-{r.randint(100, 999)}")),
+    Scenario("list_search", lambda f, r, i: _get("/users/page", q=r.choice(LAST_NAMES))),
+    Scenario("search", lambda f, r, i: _get("/users/search", q=search_term(r))),
+    Scenario("list_max_page", lambda f, r, i: _get("/users/page", limit=200)),
+    Scenario(
+        "export_role",
+        lambda f, r, i: _get("/users/export", role_id=r.choice(f.role_ids)),
+        max_requests=20,
+        concurrency=2,
+    ),
+    Scenario(
+        "create",
+        lambda f, r, i: ("POST", "/users/", {"json": user_payload(f, r, f"c{i}")}),
+        status=201,
+        after=_record_created,
+    ),
+    Scenario("update", _update),
+    Scenario("delete", _delete, status=204),
+    Scenario("bulk_100", _bulk, max_requests=200),
+]
+
+
+# ── Ejecución ────────────────────────────────────────────────────────────────
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    fixtures: Fixtures,
+    rng: random.Random,
+    concurrency: int,
+    duration: float,
+    indexes: "itertools.count[int]",
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    remaining = [scenario.max_requests]
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            request = scenario.build(fixtures, rng, next(indexes))
+            if request is None:
+                return
+            method, url, kwargs = request
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except Exception:
+                # En proceso, una excepción del handler llega hasta aquí
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != scenario.status:
+                errors += 1
+            elif scenario.after is not None:
+                scenario.after(fixtures, response)
+
+    workers = min(concurrency, scenario.concurrency or concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": workers,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def count_queries(
+    client: httpx.AsyncClient, scenario: Scenario, fixtures: Fixtures, rng: random.Random, indexes
+) -> Optional[int]:
+    """Sentencias SQL de una solicitud en proceso, tras otra de calentamiento."""
+    counted = None
+    for _ in range(2):
+        request = scenario.build(fixtures, rng, next(indexes))
+        if request is None:
+            return None
+        method, url, kwargs = request
+        with QueryCounter(get_engine()) as counter:
+            response = await client.request(method, url, **kwargs)
+        if response.status_code == scenario.status and scenario.after is not None:
+            scenario.after(fixtures, response)
+        counted = counter.statements
+    return counted
+
+
+@asynccontextmanager
+async def uvicorn_server(workers: int) -> AsyncIterator[str]:
+    """Lanza ``uvicorn --factory app.main:create_app`` y espera a que responda."""
+    port = free_port()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "--factory", "app.main:create_app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--log-level", "warning", "--no-access-log",
+        cwd=ROOT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            for _ in range(600):
+                if process.returncode is not None:
+                    raise RuntimeError(f"uvicorn terminó con código {process.returncode}")
+                try:
+                    if (await client.get("/")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn no respondió en 60s")
+        yield base_url
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+
+
+async def cleanup() -> None:
+    async with get_sessionmaker()() as session:
+        await session.execute(text("DELETE FROM user_user WHERE email LIKE :like"), {"like": RUN_EMAIL_LIKE})
+        await session.commit()
+
+
+async def run(args: argparse.Namespace, scenarios: List[Scenario]) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    if not args.skip_seed:
+        await seed(args.users, args.roles, args.areas, args.batch)
+    fixtures = await load_fixtures(args.users, args.sample, rng)
+
+    app = create_app()
+    results: Dict[str, Dict[str, Any]] = {}
+    # El lifespan real: engine, pool precalentado y caché de referencia
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as local:
+            await collect_cursors(local, fixtures, pages=20)
+            queries = {}
+            for scenario in scenarios:
+                indexes = itertools.count()
+                queries[scenario.name] = await count_queries(local, scenario, fixtures, rng, indexes)
+
+            modes = ["inprocess", "uvicorn"] if args.mode == "both" else [args.mode]
+            try:
+                for mode in modes:
+                    if mode == "inprocess":
+                        results[mode] = await run_mode(local, scenarios, fixtures, rng, queries, args)
+                    else:
+                        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+                        async with uvicorn_server(args.workers) as base_url:
+                            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as remote:
+                                results[mode] = await run_mode(remote, scenarios, fixtures, rng, queries, args)
+            finally:
+                await cleanup()
+    return results
+
+
+async def run_mode(
+    client: httpx.AsyncClient,
+    scenarios: List[Scenario],
+    fixtures: Fixtures,
+    rng: random.Random,
+    queries: Dict[str, Optional[int]],
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    results = {}
+    for scenario in scenarios:
+        result = await drive(
+            client, scenario, fixtures, rng, args.concurrency, args.duration, itertools.count(1000)
+        )
+        result["queries"] = queries[scenario.name]
+        results[scenario.name] = result
+        print(
+            f"{scenario.name:<20} {result['throughput_rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f} ms  "
+            f"p99 {result['p99_ms']:8.2f} ms  sql {result['queries'] if result['queries'] is not None else '-':>2}  "
+            f"({result['requests']} sol., {result['errors']} errores)"
+        )
+    return results
+
+
+# ── Línea base ───────────────────────────────────────────────────────────────
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regresiones de ``current`` frente a ``baseline`` (mismos modos y escenarios)."""
+    regressions = []
+    for mode, scenarios in current["runs"].items():
+        for name, now in scenarios.items():
+            before = baseline.get("runs", {}).get(mode, {}).get(name)
+            if before is None:
+                continue
+            label = f"{mode}/{name}"
+            if now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{label}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s"
+                )
+            if now["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+                regressions.append(f"{label}: p99 {before['p99_ms']} -> {now['p99_ms']} ms")
+            if None not in (now["queries"], before["queries"]) and now["queries"] > before["queries"]:
+                regressions.append(f"{label}: sentencias SQL {before['queries']} -> {now['queries']}")
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=parse_size, default=SIZES["10k"], help="10k, 1M, 10M o un número")
+    parser.add_argument("--roles", type=int, default=100)
+    parser.add_argument("--areas", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=500_000, help="usuarios por INSERT de la siembra")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--seed-only", action="store_true")
+    parser.add_argument("--temp-postgres", action="store_true", help="Postgres desechable con initdb")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=4, help="workers de uvicorn")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="segundos por escenario")
+    parser.add_argument("--scenarios", default=None, help="lista separada por comas (por defecto, todos)")
+    parser.add_argument("--sample", type=int, default=2000, help="usuarios sembrados usados como objetivo")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-user-cache", action="store_true", help="USER_CACHE_ENABLED=false")
+    parser.add_argument("--output", default="users_load.json")
+    parser.add_argument("--baseline", default=None, help="JSON de una ejecución anterior")
+    parser.add_argument("--save-baseline", default=None, help="guarda también el resultado aquí")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.scenarios:
+        wanted = set(args.scenarios.split(","))
+        unknown = wanted - {scenario.name for scenario in SCENARIOS}
+        if unknown:
+            parser.error(f"escenarios desconocidos: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in SCENARIOS if scenario.name in wanted]
+
+    with ExitStack() as stack:
+        # Antes del primer get_settings(): también lo heredan los workers de uvicorn
+        if args.temp_postgres:
+            os.environ.update(stack.enter_context(temp_postgres()))
+        if args.no_user_cache:
+            os.environ["USER_CACHE_ENABLED"] = "false"
+
+        if args.seed_only:
+            asyncio.run(seed(args.users, args.roles, args.areas, args.batch))
+            return 0
+        runs = asyncio.run(run(args, scenarios))
+
+    result = {
+        "meta": {
+            "users": args.users,
+            "roles": args.roles,
+            "areas": args.areas,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "user_cache": not args.no_user_cache,
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "runs": runs,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as fh:
+            json.dump(result, fh, indent=2)
+    print(f"\nresultados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if baseline.get("meta", {}).get("users") != args.users:
+            print(f"aviso: la línea base se tomó con {baseline['meta'].get('users')} usuarios")
+        regressions = compare(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"ERR {regression}")
+        if regressions:
+            return 1
+        print(f"sin regresiones frente a {args.baseline} (tolerancia {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
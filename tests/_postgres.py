@@ -0,0 +1,99 @@
+# tests/_postgres.py
+"""
+Postgres desechable para las pruebas y los benchmarks, sin contenedores.
+
+Crea un clúster con ``initdb`` en un directorio temporal, lo arranca con
+``pg_ctl`` en un puerto libre de 127.0.0.1, aplica las migraciones con
+Alembic y lo borra al salir. Necesita los binarios de PostgreSQL en el PATH
+(o en /usr/lib/postgresql/<versión>/bin). Arranca sin fsync ni
+synchronous_commit: sirve para comparar versiones del código entre sí, no
+para medir la durabilidad de las escrituras.
+
+    with temp_postgres() as env:   # {"POSTGRES_HOST": ..., "POSTGRES_PORT": ...}
+        ...
+"""
+
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+USER = "bench"
+DATABASE = "bench"
+
+
+def find_binary(name: str) -> str:
+    path = shutil.which(name)
+    if path is None:
+        candidates = sorted(glob.glob(f"/usr/lib/postgresql/*/bin/{name}"))
+        path = candidates[-1] if candidates else None
+    if path is None:
+        raise RuntimeError(f"No se encontró {name}: instala PostgreSQL o usa una base existente")
+    return path
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def migrate(env: Dict[str, str]) -> None:
+    """``alembic upgrade head`` contra la base de ``env``."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=root,
+        env={**os.environ, **env},
+        check=True,
+        capture_output=True,
+    )
+
+
+@contextmanager
+def temp_postgres() -> Iterator[Dict[str, str]]:
+    """Variables POSTGRES_* de un clúster temporal ya migrado."""
+    directory = tempfile.mkdtemp(prefix="bench-pg-")
+    data = os.path.join(directory, "data")
+    port = free_port()
+    pg_ctl = find_binary("pg_ctl")
+    started = False
+    try:
+        subprocess.run(
+            [find_binary("initdb"), "-D", data, "-U", USER, "--auth=trust", "-E", "UTF8"],
+            check=True,
+            capture_output=True,
+        )
+        options = (
+            f"-p {port} -k {directory} -c listen_addresses=127.0.0.1 -c max_connections=300 "
+            "-c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+        )
+        subprocess.run(
+            [pg_ctl, "-D", data, "-o", options, "-l", os.path.join(directory, "postgres.log"), "-w", "start"],
+            check=True,
+            capture_output=True,
+        )
+        started = True
+        subprocess.run(
+            [find_binary("createdb"), "-h", "127.0.0.1", "-p", str(port), "-U", USER, DATABASE],
+            check=True,
+            capture_output=True,
+        )
+        env = {
+            "POSTGRES_HOST": "127.0.0.1",
+            "POSTGRES_PORT": str(port),
+            "POSTGRES_USER": USER,
+            "POSTGRES_PASSWORD": USER,  # auth=trust: no se comprueba
+            "POSTGRES_DB": DATABASE,
+        }
+        migrate(env)
+        yield env
+    finally:
+        if started:
+            subprocess.run([pg_ctl, "-D", data, "-m", "fast", "-w", "stop"], capture_output=True)
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,44 @@
+# tests/conftest.py
+"""
+Fixtures compartidas.
+
+Las pruebas que necesitan Postgres piden ``database``: un clúster desechable
+ya migrado (ver tests/_postgres.py), uno por sesión de pytest;
+``replica_postgres`` levanta otro para las lecturas en réplica. Sin
+binarios de PostgreSQL en la máquina esas pruebas se saltan.
+"""
+
+from typing import Dict, Iterator
+
+import pytest
+
+from tests._postgres import find_binary, temp_postgres
+
+
+@pytest.fixture(scope="session")
+def postgres() -> Iterator[Dict[str, str]]:
+    try:
+        find_binary("pg_ctl")
+    except RuntimeError as exc:
+        pytest.skip(str(exc))
+    with temp_postgres() as env:
+        yield env
+
+
+@pytest.fixture(scope="session")
+def replica_postgres(postgres: Dict[str, str]) -> Iterator[Dict[str, str]]:
+    """Segundo clúster, sin replicación: hace de réplica de lectura."""
+    with temp_postgres() as env:
+        yield env
+
+
+@pytest.fixture
+def database(postgres: Dict[str, str], monkeypatch: pytest.MonkeyPatch) -> Iterator[Dict[str, str]]:
+    """Settings apuntando al clúster de pruebas, con la caché de usuarios desactivada."""
+    from app.core.settings import get_settings
+
+    for key, value in {**postgres, "USER_CACHE_ENABLED": "false"}.items():
+        monkeypatch.setenv(key, value)
+    get_settings.cache_clear()
+    yield postgres
+    get_settings.cache_clear()
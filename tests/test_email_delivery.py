@@ -0,0 +1,145 @@
+# tests/test_email_delivery.py
+"""
+Entrega de correo de EmailService contra el sumidero SMTP en proceso.
+
+Sin base de datos ni red: cada prueba arranca un SmtpSink local.
+"""
+
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from app.adapters.smtp.client import Envelope, SmtpConnection, SmtpConnectionPool
+from app.adapters.smtp.sink import SmtpSink
+from app.services.email_service import EmailService
+
+POOL_SIZE = 2
+
+
+def build_service(sink: SmtpSink, **options) -> EmailService:
+    async def connect() -> SmtpConnection:
+        return await SmtpConnection.open(*sink.address)
+
+    return EmailService(
+        SmtpConnectionPool(connect, size=POOL_SIZE),
+        sender="no-reply@example.com",
+        workers=2,
+        batch_size=50,
+        **options,
+    )
+
+
+async def drain(service: EmailService, timeout: float = 5.0) -> None:
+    """Espera a que se vacíen la cola y los reintentos pendientes."""
+    deadline = time.monotonic() + timeout
+    while True:
+        # Un lote en curso puede programar reintentos justo antes de terminar
+        await asyncio.wait_for(service.queue.join(), deadline - time.monotonic())
+        if not service.stats()["pending_retries"]:
+            return
+        assert time.monotonic() < deadline, "los correos no salieron a tiempo"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("pipelining", [True, False], ids=["pipelining", "sin-pipelining"])
+def test_delivers_every_message_within_the_pool(pipelining: bool) -> None:
+    total = 500
+
+    async def scenario() -> None:
+        async with SmtpSink(pipelining=pipelining) as sink:
+            service = build_service(sink)
+            await service.start()
+            for n in range(total):
+                service.enqueue(
+                    f"user{n}@example.com", "user_created", names=f"Usuario {n}", email=f"user{n}@example.com"
+                )
+            await drain(service)
+            stats = service.stats()
+            await service.stop(timeout=5)
+
+        assert stats["sent"] == total
+        assert stats["failed"] == 0
+        assert sorted(message.recipients[0] for message in sink.messages) == sorted(
+            f"user{n}@example.com" for n in range(total)
+        )
+        assert sink.connections <= POOL_SIZE
+        assert stats["avg_batch_size"] > 1  # se envía en lotes, no de uno en uno
+
+    asyncio.run(scenario())
+
+
+def test_retries_transient_rejections_and_drops_permanent_ones() -> None:
+    async def scenario() -> None:
+        async with SmtpSink() as sink:
+            sink.reject("transient@example.com", code=451, times=2)
+            sink.reject("permanent@example.com", code=550)
+            service = build_service(sink, retry_base_delay=0.01, retry_max_delay=0.05)
+            await service.start()
+            for to in ("transient@example.com", "permanent@example.com", "ok@example.com"):
+                service.enqueue(to, "password_recovery", names="Prueba", code="AbC123xYz9")
+            await drain(service)
+            stats = service.stats()
+            await service.stop(timeout=5)
+
+        delivered = sorted(message.recipients[0] for message in sink.messages)
+        assert delivered == ["ok@example.com", "transient@example.com"]
+        assert stats["retried"] == 2  # el 451 dos veces; el 550 nunca
+        assert stats["failed"] == 1
+        assert stats["sent"] == 2
+
+    asyncio.run(scenario())
+
+
+class RoundTrips:
+    """Cuenta idas y vueltas de una conexión: lecturas tras alguna escritura."""
+
+    def __init__(self, connection: SmtpConnection, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.count = 0
+        self._wrote = False
+        write, readline = connection.writer.write, connection.reader.readline
+
+        def counted_write(data: bytes) -> None:
+            self._wrote = True
+            write(data)
+
+        async def counted_readline() -> bytes:
+            if self._wrote:
+                self.count += 1
+                self._wrote = False
+            return await readline()
+
+        monkeypatch.setattr(connection.writer, "write", counted_write)
+        monkeypatch.setattr(connection.reader, "readline", counted_readline)
+
+
+@pytest.mark.parametrize(
+    "pipelining, expected",
+    [(True, lambda n: n + 1), (False, lambda n: 4 * n)],
+    ids=["pipelining", "sin-pipelining"],
+)
+def test_pipelining_round_trips(pipelining: bool, expected, monkeypatch: pytest.MonkeyPatch) -> None:
+    total = 10
+
+    async def scenario() -> None:
+        async with SmtpSink(pipelining=pipelining) as sink:
+            connection = await SmtpConnection.open(*sink.address)
+            assert connection.pipelining is pipelining
+            round_trips = RoundTrips(connection, monkeypatch)
+            envelopes: List[Envelope] = [
+                Envelope("no-reply@example.com", f"user{n}@example.com", f"Subject: {n}\r\n\r\n.{n}\r\n".encode())
+                for n in range(total)
+            ]
+            results = await connection.send_many(envelopes)
+            count = round_trips.count
+            await connection.close()
+
+        assert results == [None] * total
+        assert count == expected(total)
+        # El dot-stuffing no altera el cuerpo que llega al servidor
+        assert [message.data for message in sink.messages] == [
+            f"Subject: {n}\r\n\r\n.{n}\r\n".encode() for n in range(total)
+        ]
+
+    asyncio.run(scenario())
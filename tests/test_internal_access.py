@@ -0,0 +1,42 @@
+# tests/test_internal_access.py
+"""
+Las rutas internas usan los Settings que recibe ``create_app``, no los
+globales de ``get_settings()``.
+"""
+
+import asyncio
+from typing import Tuple
+
+import httpx
+import pytest
+
+from app.core.settings import Settings, get_settings
+from app.main import create_app
+
+DATABASE_ENV = {"POSTGRES_DB": "x", "POSTGRES_USER": "x", "POSTGRES_PASSWORD": "x", "POSTGRES_HOST": "x"}
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch: pytest.MonkeyPatch):
+    # Los globales no tienen clave interna ni DEBUG: ahí lo interno da 404
+    for key, value in {**DATABASE_ENV, "DEBUG": "false"}.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.delenv("INTERNAL_API_KEY", raising=False)
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_internal_routes_use_the_app_settings() -> None:
+    app = create_app(Settings(**DATABASE_ENV, DEBUG=False, INTERNAL_API_KEY="clave-interna"))
+
+    async def scenario() -> Tuple[int, int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            anonymous = await client.get("/diagnostics/profiles")
+            authorized = await client.get(
+                "/diagnostics/profiles", headers={"Authorization": "Bearer clave-interna"}
+            )
+        return anonymous.status_code, authorized.status_code
+
+    assert asyncio.run(scenario()) == (401, 200)
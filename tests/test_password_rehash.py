@@ -0,0 +1,114 @@
+# tests/test_password_rehash.py
+"""
+UserService.verify_password migra los hashes anticuados al perfil activo.
+
+Sin base de datos: repositorio y unidad de trabajo falsos; el hash es el de
+SecurityUtils con costes bajos para que la prueba sea rápida.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.security import SecurityUtils
+from app.core.settings import Settings, get_settings
+from app.modules.users.application.user_service import UserService
+from app.modules.users.domain.user import User
+from app.modules.users.infrastructure.password_hasher import SecurityPasswordHasher
+
+OLD_ROUNDS = 4
+NEW_ROUNDS = 5
+PASSWORD = "S3cret!pass"
+DATABASE_ENV = {"POSTGRES_DB": "x", "POSTGRES_USER": "x", "POSTGRES_PASSWORD": "x", "POSTGRES_HOST": "x"}
+
+
+class FakeUnitOfWork:
+    def __init__(self) -> None:
+        self.active = False
+        self.commits = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.active = True
+        try:
+            yield self
+            self.commits += 1
+        finally:
+            self.active = False
+
+
+class FakeRepository:
+    def __init__(self, user: User, password_hash: str, uow: FakeUnitOfWork) -> None:
+        self.user = user
+        self.hashes: Dict[UUID, str] = {user.id: password_hash}
+        self.uow = uow
+        self.writes: List[Tuple[str, bool]] = []  # (hash guardado, dentro de la transacción)
+
+    # UserLoader los referencia al crearse; estas pruebas no los usan
+    get_by_id = get_by_ids = get_by_emails = get_by_auth_id = get_by_auth_ids = None
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return self.user if User.normalize_email(email) == self.user.email else None
+
+    async def get_password_hash(self, user_id: UUID) -> Optional[str]:
+        return self.hashes.get(user_id)
+
+    async def set_password_hash(self, user_id: UUID, password_hash: str, expected: Optional[str] = None) -> bool:
+        if user_id not in self.hashes or (expected is not None and self.hashes[user_id] != expected):
+            return False
+        self.hashes[user_id] = password_hash
+        self.writes.append((password_hash, self.uow.active))
+        return True
+
+
+def security(rounds: int) -> SecurityUtils:
+    return SecurityUtils(Settings(**DATABASE_ENV, PASSWORD_SCHEME_COSTS={"bcrypt": {"rounds": rounds}}))
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch: pytest.MonkeyPatch):
+    # El pool de hashing lee Settings del entorno
+    for key, value in DATABASE_ENV.items():
+        monkeypatch.setenv(key, value)
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def build(password_hash: str) -> Tuple[UserService, FakeRepository, FakeUnitOfWork]:
+    user = User(uuid4(), "Ana", "Pérez", "ana@example.com", uuid4(), uuid4(), uuid4())
+    uow = FakeUnitOfWork()
+    repository = FakeRepository(user, password_hash, uow)
+    current = security(NEW_ROUNDS)
+    service = UserService(repository, uow, passwords=SecurityPasswordHasher(lambda: current))
+    return service, repository, uow
+
+
+def test_outdated_hash_is_upgraded_after_verification() -> None:
+    old_hash = security(OLD_ROUNDS).hash_password(PASSWORD)
+    service, repository, uow = build(old_hash)
+
+    user = asyncio.run(service.verify_password("ANA@example.com", PASSWORD))
+
+    assert user is repository.user
+    [(new_hash, in_transaction)] = repository.writes
+    assert in_transaction and uow.commits == 1
+    assert new_hash != old_hash
+    current = security(NEW_ROUNDS)
+    assert current.verify_password(PASSWORD, new_hash)
+    assert not current.pwd_context.needs_update(new_hash)
+
+
+def test_wrong_password_or_current_hash_is_not_rewritten() -> None:
+    current_hash = security(NEW_ROUNDS).hash_password(PASSWORD)
+    service, repository, _ = build(current_hash)
+    assert asyncio.run(service.verify_password("ana@example.com", PASSWORD)) is repository.user
+    assert repository.writes == []
+
+    old_hash = security(OLD_ROUNDS).hash_password(PASSWORD)
+    service, repository, _ = build(old_hash)
+    assert asyncio.run(service.verify_password("ana@example.com", "otra")) is None
+    assert repository.hashes[repository.user.id] == old_hash
@@ -0,0 +1,43 @@
+# tests/test_profiling.py
+"""
+Las muestras tomadas mientras corre una tarea hija (create_task desde la
+solicitud, como el despacho de UserLoader o SingleFlight) van al perfil de
+la solicitud que la creó.
+"""
+
+import asyncio
+import time
+
+from app.core.metrics import RequestDbStats
+from app.core.profiling import SamplingProfiler
+
+
+def busy_in_child(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_samples_from_a_spawned_task_belong_to_the_request() -> None:
+    profiler = SamplingProfiler(interval=0.001, max_profiles=10)
+
+    async def scenario() -> None:
+        profile = profiler.begin("req-1", "GET", "/users/x", RequestDbStats())
+        try:
+            # Solo la hija ocupa el loop: la tarea de la solicitud está esperando
+            await asyncio.create_task(spawned())
+        finally:
+            profiler.end(profile)
+
+    async def spawned() -> None:
+        busy_in_child(0.2)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        profiler.stop()
+
+    profile = profiler.get("req-1")
+    child_samples = sum(count for stack, count in profile.stacks.items() if "busy_in_child" in stack)
+    assert child_samples > 0
+    assert profile.python_time > 0
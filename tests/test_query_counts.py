@@ -0,0 +1,91 @@
+# tests/test_query_counts.py
+"""
+Cuántas sentencias SQL y cuántos COMMIT ejecuta cada endpoint de /users.
+
+Corre la app en proceso (ASGI) contra Postgres con la caché de usuarios
+desactivada, para medir el acceso real a la base. Las lecturas no hacen
+COMMIT.
+"""
+
+import asyncio
+from typing import List
+from uuid import uuid4
+
+import httpx
+
+from app.db.base import dispose_engine, get_engine, get_sessionmaker
+from app.db.query_counter import QueryCounter
+from app.main import create_app
+from app.modules.users.infrastructure.models import Area, Role
+
+
+async def measure(label: str, expected: int, commits: int, call, failures: List[str]) -> httpx.Response:
+    with QueryCounter(get_engine()) as counter:
+        response = await call()
+    if counter.statements > expected or counter.commits != commits:
+        queries = "; ".join(query.splitlines()[0] for query in counter.queries)
+        failures.append(
+            f"{label}: {counter.statements} sentencias (máx. {expected}), "
+            f"{counter.commits} COMMIT (esperados {commits}): {queries}"
+        )
+    return response
+
+
+async def check_endpoints() -> List[str]:
+    async with get_sessionmaker()() as session:
+        role = Role(nombre="query-count-role", permissions=[])
+        area = Area(nombre="query-count-area", color="#000000")
+        session.add_all([role, area])
+        await session.commit()
+
+    failures: List[str] = []
+    payload = {
+        "names": "Query",
+        "lastnames": "Count",
+        "email": f"query-count-{uuid4().hex[:8]}@example.com",
+        "role_id": str(role.id),
+        "area_id": str(area.id),
+        "auth_id": str(uuid4()),
+    }
+    missing = uuid4()
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await measure("POST /users/", 1, 1, lambda: client.post("/users/", json=payload), failures)
+        assert created.status_code == 201, created.text
+        user_id = created.json()["id"]
+        await measure("POST /users/ (duplicado)", 1, 0, lambda: client.post("/users/", json=payload), failures)
+        await measure("GET /users/{id}", 1, 0, lambda: client.get(f"/users/{user_id}"), failures)
+        # Un lote de IDs es una sola consulta (= ANY), sin importar cuántos
+        batch = [user_id] + [str(uuid4()) for _ in range(99)]
+        await measure("GET /users/batch (100 ids)", 1, 0,
+                      lambda: client.get("/users/batch", params={"ids": batch}), failures)
+        await measure("GET /users/?role_id", 1, 0, lambda: client.get("/users/", params={"role_id": str(role.id)}), failures)
+        await measure("GET /users/page?role_id", 1, 0,
+                      lambda: client.get("/users/page", params={"role_id": str(role.id)}), failures)
+        await measure("GET /users/{id}?expand", 1, 0, lambda: client.get(f"/users/{user_id}", params={"expand": "true"}), failures)
+        # La vista ampliada no depende del tamaño de página (sin N+1)
+        for limit in (1, 50, 200):
+            await measure(f"GET /users/page?expand&limit={limit}", 1, 0,
+                          lambda: client.get("/users/page", params={"expand": "true", "limit": limit}), failures)
+        update = {**payload, "names": "Updated"}
+        await measure("PUT /users/{id}", 1, 1, lambda: client.put(f"/users/{user_id}", json=update), failures)
+        await measure("PUT /users/{id} (inexistente)", 1, 0, lambda: client.put(f"/users/{missing}", json=update), failures)
+        await measure("DELETE /users/{id}", 1, 1, lambda: client.delete(f"/users/{user_id}"), failures)
+        await measure("DELETE /users/{id} (inexistente)", 1, 0, lambda: client.delete(f"/users/{missing}"), failures)
+
+    async with get_sessionmaker()() as session:
+        await session.delete(await session.get(Role, role.id))
+        await session.delete(await session.get(Area, area.id))
+        await session.commit()
+    return failures
+
+
+def test_users_endpoints_query_counts(database) -> None:
+    async def scenario() -> List[str]:
+        try:
+            return await check_endpoints()
+        finally:
+            await dispose_engine()
+
+    assert asyncio.run(scenario()) == []
@@ -0,0 +1,135 @@
+# tests/test_query_plans.py
+"""
+Las consultas de UserRepository usan índices: ninguna recorre user_user con
+un Seq Scan, y los filtros de texto usan el índice hecho para ellos.
+
+Siembra ``ROWS`` usuarios dentro de una transacción, ejecuta ANALYZE,
+captura las sentencias reales de cada método y pide su plan con EXPLAIN.
+Al final hace ROLLBACK.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import dispose_engine, get_engine
+from app.db.query_counter import QueryCounter
+from app.modules.users.infrastructure.repository import UserRepository
+
+ROWS = 100000
+ROLES = 100
+AREAS = 50
+
+# Consultas que deben pasar por un índice concreto (no basta con evitar el Seq
+# Scan: un recorrido de la clave primaria filtrando fila a fila también lo evita)
+EXPECTED_INDEXES = {
+    "list_users(email_prefix)": "ix_user_user_email_lower_pattern",
+    "list_users(q)": "ix_user_user_search_trgm",
+}
+
+
+def walk(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from walk(child)
+
+
+async def seed(session: AsyncSession, rows: int) -> Dict[str, Any]:
+    role_ids = [uuid.uuid4() for _ in range(ROLES)]
+    area_ids = [uuid.uuid4() for _ in range(AREAS)]
+    await session.execute(
+        text("INSERT INTO user_role (id, nombre) SELECT unnest(CAST(:ids AS uuid[])), 'explain-role'"),
+        {"ids": role_ids},
+    )
+    await session.execute(
+        text("INSERT INTO user_area (id, nombre) SELECT unnest(CAST(:ids AS uuid[])), 'explain-area'"),
+        {"ids": area_ids},
+    )
+    await session.execute(
+        text("""
+            INSERT INTO user_user (id, auth_id, names, lastnames, email, role_id, area_id)
+            SELECT gen_random_uuid(), gen_random_uuid(), 'Nombre ' || g, 'Apellido ' || g,
+                   'explain-' || g || '@example.com',
+                   (CAST(:roles AS uuid[]))[1 + g % :n_roles],
+                   (CAST(:areas AS uuid[]))[1 + g % :n_areas]
+            FROM generate_series(1, :rows) AS g
+        """),
+        {"roles": role_ids, "areas": area_ids, "n_roles": ROLES, "n_areas": AREAS, "rows": rows},
+    )
+    await session.execute(text("ANALYZE user_user"))
+    sample = (await session.execute(
+        text("SELECT id, auth_id, email, role_id, area_id FROM user_user WHERE email = 'explain-1@example.com'")
+    )).one()
+    return dict(sample._mapping)
+
+
+async def seq_scans() -> List[str]:
+    """
+    Métodos con algún Seq Scan sobre user_user, o sin el índice que esperan
+    (EXPECTED_INDEXES), con los nodos de su plan.
+    """
+    failures: List[str] = []
+    async with get_engine().connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(bind=conn)
+        try:
+            sample = await seed(session, ROWS)
+            repository = UserRepository(session)
+            calls = {
+                "get_by_id": lambda: repository.get_by_id(sample["id"]),
+                "get_detail_by_id": lambda: repository.get_detail_by_id(sample["id"]),
+                "get_by_email": lambda: repository.get_by_email(sample["email"].upper()),
+                "get_by_auth_id": lambda: repository.get_by_auth_id(sample["auth_id"]),
+                "get_users_by_role": lambda: repository.get_users_by_role(sample["role_id"]),
+                "get_users_by_area": lambda: repository.get_users_by_area(sample["area_id"]),
+                "list_users": lambda: repository.list_users(limit=51),
+                "list_users(role_id)": lambda: repository.list_users(limit=51, role_id=sample["role_id"]),
+                "list_users(area_id)": lambda: repository.list_users(limit=51, area_id=sample["area_id"]),
+                "list_user_details(area_id)": lambda: repository.list_user_details(
+                    limit=51, area_id=sample["area_id"]
+                ),
+                "list_users(email_prefix)": lambda: repository.list_users(
+                    limit=51, email_prefix="EXPLAIN-1234"
+                ),
+                "list_users(q)": lambda: repository.list_users(limit=51, search="apellido 12345"),
+                "search": lambda: repository.search("Nombre 1234", limit=11),
+            }
+            for name, call in calls.items():
+                with QueryCounter(get_engine()) as counter:
+                    await call()
+                for statement, parameters in zip(counter.queries, counter.parameters):
+                    result = await conn.exec_driver_sql(
+                        "EXPLAIN (FORMAT JSON) " + statement, tuple(parameters)
+                    )
+                    nodes = list(walk(result.scalar()[0]["Plan"]))
+                    seq_scan = any(
+                        node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "user_user"
+                        for node in nodes
+                    )
+                    missing_index = name in EXPECTED_INDEXES and not any(
+                        node.get("Index Name") == EXPECTED_INDEXES[name] for node in nodes
+                    )
+                    if seq_scan or missing_index:
+                        scans = ", ".join(
+                            f"{node['Node Type']} {node.get('Index Name', node['Relation Name'])}"
+                            for node in nodes
+                            if "Relation Name" in node
+                        )
+                        failures.append(f"{name}: {scans}")
+        finally:
+            await session.close()
+            await transaction.rollback()
+    return failures
+
+
+def test_repository_queries_use_indexes(database) -> None:
+    async def scenario() -> List[str]:
+        try:
+            return await seq_scans()
+        finally:
+            await dispose_engine()
+
+    assert asyncio.run(scenario()) == []
@@ -0,0 +1,82 @@
+# tests/test_read_your_writes.py
+"""
+Las lecturas enrutadas al primario no ven lo que una réplica dejó en la
+caché de usuarios ni se unen a una búsqueda single-flight en una réplica.
+
+Sin base de datos: cada "base" es un repositorio falso que devuelve el
+usuario con su propio nombre.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Iterable, List
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.modules.users.domain.user import User
+from app.modules.users.infrastructure import singleflight_repository
+from app.modules.users.infrastructure.cached_repository import CachedUserRepository, UserCache
+from app.modules.users.infrastructure.singleflight_repository import SingleFlightUserRepository
+from app.shared.cache import TTLCache
+from app.shared.singleflight import SingleFlight
+
+USER_ID = uuid4()
+
+
+class FakeRepository:
+    """``UserRepository(session)`` donde la sesión es el nombre de la base."""
+
+    def __init__(self, session: str) -> None:
+        self.session = session
+
+    async def get_by_id(self, user_id: UUID) -> User:
+        await asyncio.sleep(0.05)  # la búsqueda sigue en curso mientras llegan otras
+        return User(user_id, self.session, "Apellido", "user@example.com", uuid4(), uuid4())
+
+    async def get_by_ids(self, user_ids: Iterable[UUID]) -> List[User]:
+        return [await self.get_by_id(user_id) for user_id in user_ids]
+
+
+class FakeSession:
+    def in_transaction(self) -> bool:
+        return False
+
+
+def session_factory(name: str):
+    @asynccontextmanager
+    async def factory():
+        yield name
+
+    return factory
+
+
+def decorated(name: str, target: str, cache: UserCache, flights: SingleFlight, serve_reads: bool) -> CachedUserRepository:
+    repository = SingleFlightUserRepository(
+        FakeRepository(name), FakeSession(), flights, session_factory(name), target
+    )
+    return CachedUserRepository(repository, cache, stale_window=5.0, serve_reads=serve_reads)
+
+
+def test_primary_reads_skip_replica_cache_and_flights(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(singleflight_repository, "UserRepository", FakeRepository)
+    cache = UserCache(TTLCache(max_entries=100, default_ttl=30))
+    flights = SingleFlight()
+    replica = decorated("Replica", "replica", cache, flights, serve_reads=True)
+    primary = decorated("Primario", "primary", cache, flights, serve_reads=False)
+
+    async def scenario() -> None:
+        # La búsqueda de la réplica está en curso cuando llega la del primario
+        from_replica, from_primary = await asyncio.gather(
+            replica.get_by_id(USER_ID), primary.get_by_id(USER_ID)
+        )
+        assert from_replica.names == "Replica"
+        assert from_primary.names == "Primario"
+        assert flights.stats()["executions"] == 2
+
+        # La réplica dejó su versión en la caché: el primario no la usa
+        assert (await replica.get_by_id(USER_ID)).names == "Replica"
+        assert (await primary.get_by_id(USER_ID)).names == "Primario"
+        assert [user.names for user in await primary.get_by_ids([USER_ID])] == ["Primario"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,110 @@
+# tests/test_replica_routing.py
+"""
+Enrutado de lecturas a una réplica y vuelta al primario.
+
+Dos clústeres desechables: el de ``database`` hace de primario y el de
+``replica_postgres`` de réplica (DB_READ_REPLICA_URLS). No hay replicación
+entre ellos: se siembra el mismo usuario con un nombre distinto en cada uno,
+así cada respuesta dice de qué base salió.
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Tuple
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.settings import get_settings
+from app.db.base import dispose_engine
+from app.db.replicas import CONSISTENCY_HEADER, dispose_replicas, get_replica_set
+from app.main import create_app
+from app.modules.users.infrastructure.models import Area, Role, User
+
+
+def database_url(env: Dict[str, str]) -> str:
+    return (
+        f"postgresql+asyncpg://{env['POSTGRES_USER']}:{env['POSTGRES_PASSWORD']}"
+        f"@{env['POSTGRES_HOST']}:{env['POSTGRES_PORT']}/{env['POSTGRES_DB']}"
+    )
+
+
+async def seed(url: str, ids: Dict[str, UUID], names: str) -> None:
+    """El mismo rol, área y usuario (mismos ids) con ``names`` distinto por base."""
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(
+                Role.__table__.insert().values(id=ids["role"], nombre="replica-role", permissions=[])
+            )
+            await connection.execute(
+                Area.__table__.insert().values(id=ids["area"], nombre="replica-area", color="#000000")
+            )
+            await connection.execute(
+                User.__table__.insert().values(
+                    id=ids["user"], names=names, lastnames="Replica",
+                    email=f"replica-{ids['user'].hex[:8]}@example.com",
+                    role_id=ids["role"], area_id=ids["area"], auth_id=uuid4(),
+                )
+            )
+    finally:
+        await engine.dispose()
+
+
+async def route(primary: Dict[str, str], replica: Dict[str, str]) -> List[Tuple[str, object]]:
+    """(comprobación, base de la que salió la lectura) en orden."""
+    ids = {"role": uuid4(), "area": uuid4(), "user": uuid4()}
+    await seed(database_url(primary), ids, "Primario")
+    await seed(database_url(replica), ids, "Replica")
+
+    served: List[Tuple[str, object]] = []
+    path = f"/users/{ids['user']}"
+
+    def record(label: str, response: httpx.Response) -> None:
+        served.append((label, response.json().get("names") if response.status_code == 200 else response.status_code))
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(3):
+            record("lectura", await client.get(path))
+        record("cabecera primary", await client.get(path, headers={CONSISTENCY_HEADER: "primary"}))
+
+        user = (await client.get(path)).json()
+        update = {key: user[key] for key in ("lastnames", "email", "role_id", "area_id")}
+        record("PUT", await client.put(path, json={**update, "names": "Escrito"}))
+        record("lectura tras escribir", await client.get(path))
+        client.cookies.clear()
+        record("otro cliente", await client.get(path))
+
+        replicas = get_replica_set()
+        replicas.mark_down(replicas.replicas[0], ConnectionError("réplica marcada como caída"))
+        record("réplica caída", await client.get(path))
+    return served
+
+
+def test_reads_go_to_the_replica_and_fall_back_to_the_primary(
+    database: Dict[str, str], replica_postgres: Dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("DB_READ_REPLICA_URLS", json.dumps([database_url(replica_postgres)]))
+    get_settings.cache_clear()
+
+    async def scenario() -> List[Tuple[str, object]]:
+        try:
+            return await route(database, replica_postgres)
+        finally:
+            await dispose_replicas()
+            await dispose_engine()
+
+    served = asyncio.run(scenario())
+    assert served == [
+        ("lectura", "Replica"),
+        ("lectura", "Replica"),
+        ("lectura", "Replica"),
+        ("cabecera primary", "Primario"),
+        ("PUT", "Escrito"),  # la escritura va al primario...
+        ("lectura tras escribir", "Escrito"),  # ...y la cookie lleva allí las lecturas del cliente
+        ("otro cliente", "Replica"),
+        ("réplica caída", "Escrito"),
+    ]
@@ -0,0 +1,90 @@
+# tests/test_thundering_herd.py
+"""
+Avalancha de solicitudes sobre un mismo usuario con single-flight.
+
+Lanza ``REQUESTS`` GET /users/{id} simultáneos contra la app en proceso
+(ASGI) con la caché de usuarios desactivada: las búsquedas del mismo
+usuario no se solapan, así que nunca hay más de una conexión en uso.
+"""
+
+import asyncio
+from typing import Tuple
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import event
+
+from app.core.settings import get_settings
+from app.db.base import dispose_engine, get_engine, get_sessionmaker
+from app.main import create_app
+from app.modules.users.infrastructure.models import Area, Role, User
+from app.modules.users.infrastructure.singleflight_repository import get_user_flights
+
+REQUESTS = 200
+
+
+class PoolUsage:
+    """Conexiones sacadas del pool y máximo simultáneo en uso."""
+
+    def __init__(self, engine) -> None:
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak = 0
+        event.listen(engine.sync_engine, "checkout", self._checkout)
+        event.listen(engine.sync_engine, "checkin", self._checkin)
+
+    def _checkout(self, *args) -> None:
+        self.checkouts += 1
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+
+    def _checkin(self, *args) -> None:
+        self.in_use -= 1
+
+
+async def herd() -> Tuple[int, int, int]:
+    """(respuestas distintas de 200, conexiones en uso a la vez, consultas)"""
+    async with get_sessionmaker()() as session:
+        role = Role(nombre="herd-role", permissions=[])
+        area = Area(nombre="herd-area", color="#000000")
+        session.add_all([role, area])
+        await session.flush()
+        user = User(
+            names="Herd", lastnames="User", email=f"herd-{uuid4().hex[:8]}@example.com",
+            role_id=role.id, area_id=area.id, auth_id=uuid4(),
+        )
+        session.add(user)
+        await session.commit()
+
+    app = create_app()
+    settings = get_settings().model_copy(update={"USER_SINGLE_FLIGHT_ENABLED": True})
+    app.dependency_overrides[get_settings] = lambda: settings
+    usage = PoolUsage(get_engine())
+    before = get_user_flights().stats()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+        responses = await asyncio.gather(*(client.get(f"/users/{user.id}") for _ in range(REQUESTS)))
+    executions = get_user_flights().stats()["executions"] - before["executions"]
+
+    async with get_sessionmaker()() as session:
+        await session.delete(await session.get(User, user.id))
+        await session.delete(await session.get(Role, role.id))
+        await session.delete(await session.get(Area, area.id))
+        await session.commit()
+
+    errors = sum(response.status_code != 200 for response in responses)
+    return errors, usage.peak, executions
+
+
+def test_single_flight_uses_one_connection_at_a_time(database) -> None:
+    async def scenario() -> Tuple[int, int, int]:
+        try:
+            return await herd()
+        finally:
+            await dispose_engine()
+
+    errors, peak, executions = asyncio.run(scenario())
+    assert errors == 0
+    assert peak == 1
+    assert 1 <= executions < REQUESTS
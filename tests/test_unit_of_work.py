@@ -0,0 +1,75 @@
+# tests/test_unit_of_work.py
+"""
+Un callback after_commit que falla no deshace ni convierte en error una
+escritura ya confirmada.
+
+Sin base de datos: una sesión falsa que anota COMMIT y ROLLBACK.
+"""
+
+import asyncio
+import logging
+from typing import List
+
+import pytest
+
+from app.db.unit_of_work import _WRITES_KEY, UnitOfWork
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.info: dict = {}
+        self.events: List[str] = []
+
+    def write(self) -> None:
+        # Lo que hacen los eventos do_orm_execute/after_flush con una sesión real
+        self.info[_WRITES_KEY] = True
+
+    async def commit(self) -> None:
+        self.events.append("COMMIT")
+
+    async def rollback(self) -> None:
+        self.events.append("ROLLBACK")
+
+
+def test_failing_after_commit_hook_keeps_the_write(caplog: pytest.LogCaptureFixture) -> None:
+    session = FakeSession()
+    uow = UnitOfWork(session)
+
+    async def failing() -> None:
+        raise RuntimeError("caché caída")
+
+    async def following() -> None:
+        session.events.append("hook")
+
+    async def use_case() -> str:
+        async with uow.transaction():
+            session.write()
+            uow.after_commit(failing)
+            uow.after_commit(following)
+        return "ok"
+
+    with caplog.at_level(logging.ERROR, logger="app.db.unit_of_work"):
+        assert asyncio.run(use_case()) == "ok"
+
+    # Confirmada, sin ROLLBACK, y el resto de callbacks corre igualmente
+    assert session.events == ["COMMIT", "hook"]
+    [record] = caplog.records
+    assert record.exc_info[0] is RuntimeError
+
+
+def test_after_commit_hooks_are_dropped_on_rollback() -> None:
+    session = FakeSession()
+    uow = UnitOfWork(session)
+
+    async def hook() -> None:
+        session.events.append("hook")
+
+    async def use_case() -> None:
+        async with uow.transaction():
+            session.write()
+            uow.after_commit(hook)
+            raise ValueError("dato inválido")
+
+    with pytest.raises(ValueError):
+        asyncio.run(use_case())
+    assert session.events == ["ROLLBACK"]